@@ -0,0 +1,74 @@
+from enum import Enum
+from typing import NamedTuple, Optional, Tuple
+
+
+class GitBackendType(str, Enum):
+    """
+    Selects how commit history is read from the local repository.
+
+    The subprocess backend shells out to the `git` executable.
+
+    The native backend reads objects directly from the `.git` directory and needs no `git` executable.
+    """
+    SUBPROCESS = "subprocess"
+    NATIVE = "native"
+
+
+class GitObjectType(int, Enum):
+    """
+    Object type codes as stored in packfile entry headers.
+
+    See https://git-scm.com/docs/pack-format#_object_types
+    """
+    COMMIT = 1
+    TREE = 2
+    BLOB = 3
+    TAG = 4
+    OFS_DELTA = 6
+    REF_DELTA = 7
+
+
+class GitCommit(NamedTuple):
+    """
+    The parts of a parsed commit object needed for history analysis.
+    """
+    sha: str
+    tree: str
+    parents: Tuple[str, ...]
+    commit_time: int
+    message: str
+
+
+class GitCommitChanges(NamedTuple):
+    """
+    A commit's message and the paths it changed relative to its parent, as listed by `git log --name-only`.
+
+    Moved files are listed under both their old and new paths. Merge commits list no paths.
+    """
+    message: str
+    paths: Tuple[str, ...]
+
+
+class PushEventCommit(NamedTuple):
+    """
+    A commit listed in a GitHub push event, see https://docs.github.com/en/webhooks/webhook-events-and-payloads#push
+
+    The message ends with a newline, like the messages read from the repository, and the paths are the union of the added, removed and modified files.
+    """
+    sha: str
+    message: str
+    paths: Tuple[str, ...]
+
+
+class PushEvent(NamedTuple):
+    """
+    The parts of a GitHub push event needed for history analysis. `commits` lists the pushed commits oldest first.
+    """
+    ref: str
+    before: str
+    after: str
+    created: bool
+    deleted: bool
+    forced: bool
+    commits: Tuple[PushEventCommit, ...]
+    head_commit: Optional[PushEventCommit]
@@ -0,0 +1,138 @@
+from collections import deque
+import subprocess
+from subprocess import Popen, PIPE, DEVNULL
+from typing import Deque, Iterable, Iterator, List, Optional, Tuple
+from src.clients.git.constants import CAT_FILE_PIPELINE_DEPTH
+
+
+class CatFileReader:
+    """
+    Reads objects by name through one long-lived `git cat-file --batch` process, so looking up thousands of commits costs one process spawn.
+
+    Object names are written to the process ahead of the responses being read, up to `pipeline_depth` at a time, so lookups do not wait for a round trip each.
+    The window is small enough that the pending names always fit into the pipe buffer, so writing never blocks while `git` waits for its output to be read.
+    Responses are parsed incrementally from the pipe, one object at a time, so only one lookup may be in progress at a time.
+    See https://git-scm.com/docs/git-cat-file#_batch_output
+
+    Usage:
+
+        with CatFileReader(git_cmd=["git", "cat-file", "--batch"]) as reader:
+            for sha, commit_msg in reader.iter_commit_msgs(shas):
+                ...
+    """
+    def __init__(self, git_cmd: List[str], cwd: Optional[str] = None, pipeline_depth: int = CAT_FILE_PIPELINE_DEPTH):
+        """
+        Arguments:
+
+        git_cmd (List[str]) - The `git cat-file --batch` command line, e.g. from GitClient._get_git_cmd()
+
+        cwd (Optional[str]) - Working directory of the process, i.e. the repository. Defaults to the current working directory
+
+        pipeline_depth (int) - Maximum number of object names written ahead of the responses read
+        """
+        self.git_cmd: List[str] = git_cmd
+        self.cwd: Optional[str] = cwd
+        self.pipeline_depth: int = pipeline_depth
+        self._process: Optional[Popen] = None
+
+    def _get_process(self) -> Popen:
+        if self._process is None or self._process.poll() is not None:
+            self._process = subprocess.Popen(
+                self.git_cmd,
+                shell=False,
+                stdin=PIPE,
+                stdout=PIPE,
+                stderr=DEVNULL,
+                cwd=self.cwd
+            )
+
+        return self._process
+
+    def _read_response(self, process: Popen, requested_name: str) -> Tuple[str, bytes]:
+        header: bytes = process.stdout.readline()
+        if not header:
+            raise ChildProcessError(f"git cat-file exited while reading {requested_name}")
+        fields: List[bytes] = header.split()
+        # Unknown names are answered with "<name> missing", or "<name> ambiguous" for short names matching several objects
+        if len(fields) != 3:
+            raise KeyError(f"Object not found: {requested_name}")
+        object_type, size = fields[1].decode("ascii"), int(fields[2])
+        # The content is followed by a newline
+        content: bytes = process.stdout.read(size + 1)[:size]
+
+        return object_type, content
+
+    def iter_objects(self, names: Iterable[str]) -> Iterator[Tuple[str, str, bytes]]:
+        """
+        Lazily looks up every object name in `names`, e.g. commit SHAs, and yields the name, type and content of each, in the same order.
+
+        Raises KeyError for names that are not in the repository. Closing the generator early leaves the process ready for the next lookup.
+        """
+        process: Popen = self._get_process()
+        pending_names: Deque[str] = deque()
+        name_iterator: Iterator[str] = iter(names)
+        try:
+            while True:
+                # Names are only written while the window has room, and are flushed together
+                written: bool = False
+                while len(pending_names) < self.pipeline_depth:
+                    name: Optional[str] = next(name_iterator, None)
+                    if name is None:
+                        break
+                    if "\n" in name:
+                        raise ValueError(f"Invalid object name: {name!r}")
+                    process.stdin.write(f"{name}\n".encode("utf-8"))
+                    pending_names.append(name)
+                    written = True
+                if written:
+                    process.stdin.flush()
+                if not pending_names:
+                    return
+
+                requested_name: str = pending_names.popleft()
+                object_type, content = self._read_response(process, requested_name)
+                yield requested_name, object_type, content
+        finally:
+            # Responses to names that were written but not consumed would be read by the next lookup
+            if pending_names:
+                self.close()
+
+    def iter_commit_msgs(self, shas: Iterable[str]) -> Iterator[Tuple[str, str]]:
+        """
+        Lazily yields the name and full message of every commit in `shas`, in the same order, like GitRepository.read_commit().message.
+
+        Raises KeyError for commits that are not in the repository and ValueError for objects that are not commits.
+        """
+        for sha, object_type, content in self.iter_objects(shas):
+            if object_type != "commit":
+                raise ValueError(f"Object {sha} is a {object_type}, not a commit")
+            header, _, message = content.partition(b"\n\n")
+            encoding: str = "utf-8"
+            for line in header.split(b"\n"):
+                if line.startswith(b"encoding "):
+                    encoding = line[len(b"encoding "):].decode("ascii")
+            try:
+                yield sha, message.decode(encoding, errors="replace")
+            except LookupError:
+                yield sha, message.decode("utf-8", errors="replace")
+
+    def close(self):
+        if self._process is None:
+            return
+        if self._process.poll() is None:
+            self._process.stdin.close()
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait()
+        else:
+            self._process.stdin.close()
+        self._process.stdout.close()
+        self._process = None
+
+    def __enter__(self) -> "CatFileReader":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,118 @@
+import mmap
+import struct
+from typing import BinaryIO, Dict, List, NamedTuple, Optional, Tuple
+from src.clients.git.constants import COMMIT_GRAPH_SIGNATURE, SHA_LENGTH
+
+# Parent positions with special meanings, see https://git-scm.com/docs/gitformat-commit-graph#_chunk_data
+GRAPH_PARENT_NONE: int = 0x70000000
+GRAPH_EXTRA_EDGES_NEEDED: int = 0x80000000
+GRAPH_LAST_EDGE: int = 0x80000000
+COMMIT_DATA_ENTRY_SIZE: int = SHA_LENGTH + 16
+
+
+class CommitGraphEntry(NamedTuple):
+    """
+    A commit as recorded in the commit-graph file.
+
+    `generation` is the commit's topological level: 1 for root commits, otherwise one more than the highest level among its parents.
+    """
+    generation: int
+    commit_time: int
+    parents: Tuple[str, ...]
+
+
+class CommitGraph:
+    """
+    Reads commit parents, commit times and generation numbers from a memory-mapped `objects/info/commit-graph` file, without inflating commit objects.
+
+    Generation numbers let a walk visit commits in an order where every commit comes before all of its ancestors, whatever the commit times say.
+    Lookups are a binary search between fanout table bounds, like PackIndex. Split commit-graph chains are not read.
+    See https://git-scm.com/docs/gitformat-commit-graph
+    """
+    def __init__(self, graph_path: str):
+        """
+        Arguments:
+
+        graph_path (str) - Path to an `objects/info/commit-graph` file
+        """
+        self.graph_path: str = graph_path
+        self._file: BinaryIO = open(graph_path, "rb")
+        self._mmap: mmap.mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        signature, version, hash_version, chunk_count = struct.unpack(">4sBBB", self._mmap[:7])
+        if signature != COMMIT_GRAPH_SIGNATURE or version != 1 or hash_version != 1:
+            self.close()
+            raise ValueError(f"Unsupported commit-graph file: {graph_path}")
+
+        chunk_offsets: Dict[bytes, int] = {}
+        for i in range(chunk_count):
+            start: int = 8 + 12 * i
+            chunk_id, offset = struct.unpack(">4sQ", self._mmap[start:start + 12])
+            chunk_offsets[chunk_id] = offset
+        if not all(chunk_id in chunk_offsets for chunk_id in (b"OIDF", b"OIDL", b"CDAT")):
+            self.close()
+            raise ValueError(f"Commit-graph file is missing required chunks: {graph_path}")
+
+        self._fanout: Tuple[int, ...] = struct.unpack(">256I", self._mmap[chunk_offsets[b"OIDF"]:chunk_offsets[b"OIDF"] + 1024])
+        self.commit_count: int = self._fanout[255]
+        self._oid_lookup_offset: int = chunk_offsets[b"OIDL"]
+        self._commit_data_offset: int = chunk_offsets[b"CDAT"]
+        self._extra_edges_offset: Optional[int] = chunk_offsets.get(b"EDGE")
+
+    def _sha_at(self, position: int) -> bytes:
+        start: int = self._oid_lookup_offset + SHA_LENGTH * position
+
+        return self._mmap[start:start + SHA_LENGTH]
+
+    def _find_position(self, sha: bytes) -> Optional[int]:
+        low: int = self._fanout[sha[0] - 1] if sha[0] > 0 else 0
+        high: int = self._fanout[sha[0]]
+        while low < high:
+            middle: int = (low + high) // 2
+            if self._sha_at(middle) < sha:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low < self.commit_count and self._sha_at(low) == sha:
+            return low
+
+        return None
+
+    def _get_extra_parent_positions(self, edge_index: int) -> List[int]:
+        positions: List[int] = []
+        while True:
+            start: int = self._extra_edges_offset + 4 * edge_index
+            edge: int = struct.unpack(">I", self._mmap[start:start + 4])[0]
+            positions.append(edge & ~GRAPH_LAST_EDGE)
+            if edge & GRAPH_LAST_EDGE:
+                return positions
+            edge_index += 1
+
+    def read_commit(self, sha: str) -> Optional[CommitGraphEntry]:
+        """
+        Returns the graph entry of the commit with hex name `sha`, or None if it is not in the graph, e.g. because it was made after the graph was written.
+        """
+        position: Optional[int] = self._find_position(bytes.fromhex(sha))
+        if position is None:
+            return None
+
+        start: int = self._commit_data_offset + COMMIT_DATA_ENTRY_SIZE * position + SHA_LENGTH
+        first_parent, second_parent, generation_and_time_high, time_low = struct.unpack(">IIII", self._mmap[start:start + 16])
+        parent_positions: List[int] = []
+        if first_parent != GRAPH_PARENT_NONE:
+            parent_positions.append(first_parent)
+        if second_parent & GRAPH_EXTRA_EDGES_NEEDED:
+            parent_positions.extend(self._get_extra_parent_positions(second_parent & ~GRAPH_EXTRA_EDGES_NEEDED))
+        elif second_parent != GRAPH_PARENT_NONE:
+            parent_positions.append(second_parent)
+
+        return CommitGraphEntry(
+            generation=generation_and_time_high >> 2,
+            commit_time=((generation_and_time_high & 0x3) << 32) | time_low,
+            parents=tuple(self._sha_at(parent_position).hex() for parent_position in parent_positions)
+        )
+
+    def close(self):
+        self._mmap.close()
+        self._file.close()
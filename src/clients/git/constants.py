@@ -0,0 +1,41 @@
+from typing import Tuple
+
+# Number of bytes read from `git log` stdout at a time when streaming a commit range
+GIT_LOG_READ_SIZE: int = 64 * 1024
+
+# Commits fetched by the first `git fetch --deepen` of a shallow clone. Every further fetch doubles the depth
+DEEPEN_INITIAL_DEPTH: int = 64
+# Seconds between logged updates of a `git fetch` progress meter. Completed phases are always logged
+PROGRESS_LOG_INTERVAL: float = 5.0
+# Object names written to `git cat-file --batch` ahead of the responses read. 256 full SHAs take about 10 KiB, well within a pipe buffer
+CAT_FILE_PIPELINE_DEPTH: int = 256
+
+# GitHub lists at most this many commits in a push event. Payloads listing this many may have been truncated
+PUSH_EVENT_MAX_COMMITS: int = 2048
+# Number of characters read from a push event file at a time. Values spanning more are read with geometrically growing reads
+PUSH_EVENT_READ_SIZE: int = 64 * 1024
+
+# See https://git-scm.com/docs/pack-format
+PACK_IDX_V2_MAGIC: bytes = b"\377tOc"
+PACK_SIGNATURE: bytes = b"PACK"
+# See https://git-scm.com/docs/gitformat-commit-graph
+COMMIT_GRAPH_SIGNATURE: bytes = b"CGPH"
+SHA_LENGTH: int = 20
+
+# Number of inflated pack entries kept around as delta bases
+DELTA_BASE_CACHE_SIZE: int = 256
+
+# Symbolic refs are followed at most this many levels deep, mirroring git's own limit
+MAX_SYMREF_DEPTH: int = 5
+
+# Search order for short ref names, see https://git-scm.com/docs/gitrevisions#_specifying_revisions
+REF_SEARCH_PATHS: Tuple[str, ...] = (
+    "{}",
+    "refs/{}",
+    "refs/tags/{}",
+    "refs/heads/{}",
+    "refs/remotes/{}",
+    "refs/remotes/{}/HEAD"
+)
+# is_ancestor() stops walking at commits this many seconds older than the candidate ancestor, allowing for clock skew between committers
+CLOCK_SKEW_SLOP: int = 24 * 60 * 60
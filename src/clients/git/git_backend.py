@@ -0,0 +1,75 @@
+from abc import ABC, abstractmethod
+from typing import Callable, Iterable, Iterator, List, Tuple
+from src.clients.git._types import GitCommitChanges
+
+
+class GitBackend(ABC):
+    """
+    Reads commit history from a local git repository.
+    """
+    @abstractmethod
+    def get_latest_commit_msg(self, revision: str = "HEAD") -> str:
+        """
+        Returns the full message of the commit `revision` refers to.
+        """
+
+    @abstractmethod
+    def iter_commit_msgs(self, revision_range: str) -> Iterator[str]:
+        """
+        Streams the messages of every commit in `revision_range` (e.g. "v1.2.0..HEAD"), newest first.
+
+        Closing the returned generator early releases any resources held by the backend.
+        """
+
+    @abstractmethod
+    def iter_commit_shas(self, revision_range: str) -> Iterator[str]:
+        """
+        Streams the full names of every commit in `revision_range`, newest first, like `git rev-list`.
+        """
+
+    @abstractmethod
+    def iter_commit_msgs_by_sha(self, shas: Iterable[str]) -> Iterator[Tuple[str, str]]:
+        """
+        Lazily looks up the full message of every commit in `shas`, e.g. the commits of a push or a pull request, and yields each SHA with its message, in the same order.
+
+        Raises KeyError for commits that are not in the repository.
+        """
+
+    @abstractmethod
+    def iter_commit_changes(self, revision_range: str) -> Iterator[GitCommitChanges]:
+        """
+        Streams the message and changed paths of every commit in `revision_range`, newest first, like `git log --name-only`.
+        """
+
+    @abstractmethod
+    def rev_parse(self, revision: str) -> str:
+        """
+        Returns the full name of the commit `revision` refers to. Raises ValueError if there is no such commit.
+        """
+
+    @abstractmethod
+    def is_ancestor(self, ancestor: str, descendant: str = "HEAD") -> bool:
+        """
+        Returns whether commit `ancestor` is reachable from `descendant`, like `git merge-base --is-ancestor`.
+
+        A commit counts as its own ancestor. Revisions that do not exist in the repository are never ancestors.
+        """
+
+    @abstractmethod
+    def get_nearest_tags(self, matches: Callable[[str], bool], revision: str = "HEAD") -> List[str]:
+        """
+        Returns the sorted names of the tags accepted by `matches` on every such tagged commit reachable from `revision` without passing through another one, or an empty list if there is none.
+        After a merge, that includes the nearest tagged commit on each merged branch.
+
+        Tag names are given without `refs/tags/`, and annotated tags are peeled to the commits they tag.
+        """
+
+    def refresh(self):
+        """
+        Forgets any cached repository state, so objects and refs added since, e.g. by a fetch, are seen.
+        """
+
+    def close(self):
+        """
+        Releases any files or processes held open by the backend.
+        """
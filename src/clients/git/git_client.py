@@ -0,0 +1,313 @@
+from logging import Logger
+import os
+import re
+from subprocess import CompletedProcess, DEVNULL, Popen, PIPE
+import subprocess
+import tempfile
+import time
+from typing import Callable, Iterable, Iterator, List, Optional, Set, Tuple
+from src.clients.git._types import GitCommitChanges
+from src.clients.git.cat_file_reader import CatFileReader
+from src.clients.git.git_backend import GitBackend
+from src.clients.git.constants import DEEPEN_INITIAL_DEPTH, GIT_LOG_READ_SIZE, PROGRESS_LOG_INTERVAL
+
+# git redraws progress meters in place with carriage returns, and ends each phase with a newline
+PROGRESS_LINE_END_PATTERN: re.Pattern = re.compile(rb"[\r\n]")
+
+
+class GitClient(GitBackend):
+    """
+    Reads commit history by running the `git` executable in a subprocess.
+
+    Shallow clones can also be deepened on demand with deepen_until_complete(), so history is only fetched as far back as an analysis needs.
+    Commits looked up by SHA are read through one long-lived `git cat-file --batch` process, which is kept open until close().
+    """
+    def __init__(self, logger: Optional[Logger] = None, repo_path: Optional[str] = None):
+        """
+        Arguments:
+
+        logger (Optional[Logger]) - An instance of logging.Logger used to log the git commands being run
+
+        repo_path (Optional[str]) - Path to the repository's working tree. Defaults to the current working directory at the time of each call
+        """
+        self.logger: Optional[Logger] = logger
+        self.repo_path: Optional[str] = repo_path
+        self._cat_file_reader: Optional[CatFileReader] = None
+
+    def _get_git_cmd(self, *args: str) -> List[str]:
+        repo_path: str = self.repo_path or os.getcwd()
+        git_cmd: List[str] = [
+            "git",
+            "-c",
+            f"safe.directory={repo_path}",
+            "--no-pager",
+            *args
+        ]
+        if self.logger:
+            self.logger.info(f"Running the following git command: {' '.join(git_cmd)}")
+
+        return git_cmd
+
+    def get_latest_commit_msg(self, revision: str = "HEAD") -> str:
+        git_cmd: List[str] = self._get_git_cmd("log", "-1", "--pretty=%B", revision)
+        git_log: CompletedProcess = subprocess.run(
+            git_cmd,
+            shell=False,
+            capture_output=True,
+            cwd=self.repo_path
+        )
+
+        if git_log.returncode != 0:
+            raise ChildProcessError(bytes(git_log.stderr).decode("utf-8"))
+
+        commit_msg: str = bytes(git_log.stdout).decode("utf-8")
+
+        return commit_msg
+
+    def rev_parse(self, revision: str) -> str:
+        git_cmd: List[str] = self._get_git_cmd("rev-parse", "--verify", "--quiet", f"{revision}^{{commit}}")
+        git_rev_parse: CompletedProcess = subprocess.run(
+            git_cmd,
+            shell=False,
+            capture_output=True,
+            cwd=self.repo_path
+        )
+
+        if git_rev_parse.returncode != 0:
+            raise ValueError(f"Unknown revision: {revision}")
+
+        return bytes(git_rev_parse.stdout).decode("utf-8").strip()
+
+    def is_ancestor(self, ancestor: str, descendant: str = "HEAD") -> bool:
+        git_cmd: List[str] = self._get_git_cmd("merge-base", "--is-ancestor", ancestor, descendant)
+        git_merge_base: CompletedProcess = subprocess.run(
+            git_cmd,
+            shell=False,
+            capture_output=True,
+            cwd=self.repo_path
+        )
+
+        # Exits with 1 if `ancestor` is not an ancestor, and with 128 if either revision is unknown
+        return git_merge_base.returncode == 0
+
+    def get_nearest_tags(self, matches: Callable[[str], bool], revision: str = "HEAD") -> List[str]:
+        """
+        Streams the parents and tag decorations of the commits reachable from `revision`, children before parents, and returns the tags accepted by `matches`
+        on every tagged commit reached without passing through another one.
+
+        Only the commits that can still be reached that way are tracked, and the walk stops as soon as none are left.
+        """
+        git_cmd: List[str] = self._get_git_cmd("log", "-z", "--topo-order", "--format=%H %P%x1f%D", "--decorate-refs=refs/tags/", revision)
+        records: Iterator[bytes] = self._stream_records(git_cmd, b"\0")
+        nearest_tags: List[str] = []
+        try:
+            pending_shas: Set[str] = set()
+            for record in records:
+                shas, _, decorations = record.decode("utf-8").partition("\x1f")
+                sha, *parents = shas.split()
+                # Nothing is pending only before the first record, which is `revision` itself, since the walk stops once nothing is left
+                if pending_shas and sha not in pending_shas:
+                    continue
+                pending_shas.discard(sha)
+                # Decorations look like "tag: v1.2.0, tag: latest"
+                tags: List[str] = [decoration.removeprefix("tag: ") for decoration in decorations.strip().split(", ") if decoration.startswith("tag: ")]
+                matching_tags: List[str] = [tag for tag in tags if matches(tag)]
+                if matching_tags:
+                    nearest_tags.extend(matching_tags)
+                else:
+                    pending_shas.update(parents)
+                if not pending_shas:
+                    break
+        finally:
+            records.close()
+
+        return sorted(nearest_tags)
+
+    def _stream_records(self, git_cmd: List[str], separator: bytes) -> Iterator[bytes]:
+        """
+        Runs `git_cmd` and yields its stdout split on `separator`.
+
+        Output is read in fixed-size chunks, so memory use does not grow with the amount of output.
+        Closing the generator early terminates the `git` process.
+        stderr goes to a temporary file rather than a pipe, since a pipe that is only read after stdout could fill up with warnings and block `git` forever.
+        """
+        with tempfile.TemporaryFile() as stderr_file:
+            git_process: Popen = subprocess.Popen(
+                git_cmd,
+                shell=False,
+                stdout=PIPE,
+                stderr=stderr_file,
+                cwd=self.repo_path
+            )
+
+            try:
+                pending: bytes = b""
+                while chunk := git_process.stdout.read(GIT_LOG_READ_SIZE):
+                    records: List[bytes] = (pending + chunk).split(separator)
+                    # The last record may be incomplete until the next chunk arrives
+                    pending = records.pop()
+                    yield from records
+
+                if pending:
+                    yield pending
+
+                if git_process.wait() != 0:
+                    stderr_file.seek(0)
+                    raise ChildProcessError(stderr_file.read().decode("utf-8", errors="replace"))
+            finally:
+                if git_process.poll() is None:
+                    git_process.kill()
+                git_process.wait()
+                git_process.stdout.close()
+
+    def iter_commit_msgs(self, revision_range: str) -> Iterator[str]:
+        """
+        Streams the messages of every commit in `revision_range`, newest first.
+
+        `git log` output is NUL-delimited, so memory use does not grow with the size of the range.
+        """
+        git_cmd: List[str] = self._get_git_cmd("log", "-z", "--pretty=%B", revision_range)
+        for record in self._stream_records(git_cmd, b"\0"):
+            yield record.decode("utf-8")
+
+    def iter_commit_shas(self, revision_range: str) -> Iterator[str]:
+        git_cmd: List[str] = self._get_git_cmd("rev-list", revision_range)
+        for record in self._stream_records(git_cmd, b"\n"):
+            yield record.decode("ascii")
+
+    def iter_commit_msgs_by_sha(self, shas: Iterable[str]) -> Iterator[Tuple[str, str]]:
+        if self._cat_file_reader is None:
+            self._cat_file_reader = CatFileReader(git_cmd=self._get_git_cmd("cat-file", "--batch"), cwd=self.repo_path)
+
+        return self._cat_file_reader.iter_commit_msgs(shas)
+
+    def iter_commit_changes(self, revision_range: str) -> Iterator[GitCommitChanges]:
+        """
+        Streams the message and changed paths of every commit in `revision_range`, newest first.
+
+        Each record starts with an ASCII record separator and its message ends with an ASCII unit separator, followed by the NUL-delimited output of `--name-only`.
+        Rename detection is disabled, so a moved file is listed under both its old and its new path.
+        """
+        git_cmd: List[str] = self._get_git_cmd("log", "-z", "--name-only", "--no-renames", "--pretty=format:%x1e%B%x1f", revision_range)
+        records: Iterator[bytes] = self._stream_records(git_cmd, b"\x1e")
+        try:
+            for record in records:
+                if not record:
+                    continue
+                message, _, name_only = record.partition(b"\x1f")
+                paths: Tuple[str, ...] = tuple(path.decode("utf-8") for path in name_only.removeprefix(b"\n").split(b"\0") if path)
+                yield GitCommitChanges(message=message.decode("utf-8"), paths=paths)
+        finally:
+            records.close()
+
+    def get_shallow_commits(self) -> Set[str]:
+        """
+        Returns the commits at the boundary of a shallow clone, whose parents have not been fetched. The set is empty if the history is complete.
+        """
+        git_cmd: List[str] = self._get_git_cmd("rev-parse", "--git-path", "shallow")
+        git_rev_parse: CompletedProcess = subprocess.run(
+            git_cmd,
+            shell=False,
+            capture_output=True,
+            cwd=self.repo_path
+        )
+
+        if git_rev_parse.returncode != 0:
+            raise ChildProcessError(bytes(git_rev_parse.stderr).decode("utf-8"))
+
+        shallow_path: str = os.path.join(self.repo_path or os.getcwd(), bytes(git_rev_parse.stdout).decode("utf-8").strip())
+        if not os.path.isfile(shallow_path):
+            return set()
+        with open(file=shallow_path, mode="r") as shallow_file:
+            return {line.strip() for line in shallow_file if line.strip()}
+
+    def is_range_complete(self, revision_range: str) -> bool:
+        """
+        Returns whether every commit in `revision_range` has been fetched along with its parents.
+
+        That is the case if both ends of the range resolve and the range does not run into the boundary of a shallow clone.
+        """
+        shallow_commits: Set[str] = self.get_shallow_commits()
+        git_cmd: List[str] = self._get_git_cmd("rev-list", revision_range)
+        records: Iterator[bytes] = self._stream_records(git_cmd, b"\n")
+        try:
+            for record in records:
+                if record.decode("ascii") in shallow_commits:
+                    return False
+        except ChildProcessError:
+            # One end of the range is not in the fetched history yet
+            return False
+        finally:
+            records.close()
+
+        return True
+
+    def deepen(self, depth: int, remote: str = "origin"):
+        """
+        Fetches `depth` more commits of history beyond the boundary of a shallow clone from `remote`, logging git's progress.
+        """
+        self._fetch(f"--deepen={depth}", remote)
+
+    def fetch(self, remote: str = "origin", *refspecs: str):
+        """
+        Fetches `refspecs`, or the remote's default refspecs, from `remote`, logging git's progress.
+        """
+        self._fetch(remote, *refspecs)
+
+    def _fetch(self, *args: str):
+        git_cmd: List[str] = self._get_git_cmd("fetch", "--progress", *args)
+        git_process: Popen = subprocess.Popen(
+            git_cmd,
+            shell=False,
+            stdout=DEVNULL,
+            stderr=PIPE,
+            cwd=self.repo_path
+        )
+
+        last_line: bytes = b""
+        try:
+            pending: bytes = b""
+            last_logged_time: float = 0.0
+            while chunk := git_process.stderr.read1(GIT_LOG_READ_SIZE):
+                pending += chunk
+                while line_end := PROGRESS_LINE_END_PATTERN.search(pending):
+                    line: bytes = pending[:line_end.start()]
+                    pending = pending[line_end.end():]
+                    if not line:
+                        continue
+                    last_line = line
+                    # Intermediate redraws of a progress meter are throttled
+                    if self.logger and (line_end.group() == b"\n" or time.monotonic() - last_logged_time >= PROGRESS_LOG_INTERVAL):
+                        self.logger.info(line.decode("utf-8", errors="replace").rstrip())
+                        last_logged_time = time.monotonic()
+
+            if git_process.wait() != 0:
+                raise ChildProcessError((pending or last_line).decode("utf-8", errors="replace"))
+        finally:
+            if git_process.poll() is None:
+                git_process.kill()
+            git_process.wait()
+            git_process.stderr.close()
+
+    def deepen_until_complete(self, revision_range: str, remote: str = "origin", initial_depth: int = DEEPEN_INITIAL_DEPTH) -> bool:
+        """
+        Deepens a shallow clone until every commit in `revision_range` has been fetched, e.g. back to the last release tag.
+
+        The first fetch adds `initial_depth` commits and every further one doubles the depth, so a range N commits deep takes about log2(N) fetches.
+        Returns False if the full history has been fetched and the range still does not resolve.
+        """
+        depth: int = initial_depth
+        while not self.is_range_complete(revision_range):
+            if not self.get_shallow_commits():
+                return False
+            if self.logger:
+                self.logger.info(f"Deepening the shallow clone by {depth} commits to reach {revision_range}...")
+            self.deepen(depth, remote)
+            depth *= 2
+
+        return True
+
+    def close(self):
+        if self._cat_file_reader:
+            self._cat_file_reader.close()
+        self._cat_file_reader = None
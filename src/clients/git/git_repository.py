@@ -0,0 +1,557 @@
+from collections import deque
+import glob
+import heapq
+import os
+import re
+import struct
+import zlib
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from src.clients.git._types import GitCommit, GitCommitChanges, GitObjectType
+from src.clients.git.commit_graph import CommitGraph, CommitGraphEntry
+from src.clients.git.constants import CLOCK_SKEW_SLOP, MAX_SYMREF_DEPTH, REF_SEARCH_PATHS, SHA_LENGTH
+from src.clients.git.git_backend import GitBackend
+from src.clients.git.pack import PackFile, PackIndex
+
+OBJECT_TYPE_BY_NAME: Dict[bytes, GitObjectType] = {
+    b"commit": GitObjectType.COMMIT,
+    b"tree": GitObjectType.TREE,
+    b"blob": GitObjectType.BLOB,
+    b"tag": GitObjectType.TAG
+}
+
+FULL_SHA_PATTERN: re.Pattern = re.compile(r"[0-9a-f]{40}")
+ABBREVIATED_SHA_PATTERN: re.Pattern = re.compile(r"[0-9a-f]{4,39}")
+REVISION_SUFFIX_PATTERN: re.Pattern = re.compile(r"([~^])(\d*)")
+TREE_MODE: bytes = b"40000"
+# Generation given to commits that are not in the commit-graph, see https://git-scm.com/docs/commit-graph#_design_details
+GENERATION_NUMBER_INFINITY: int = 0xFFFFFFFF
+
+
+class GitRepository(GitBackend):
+    """
+    Reads commit history directly from a repository's `.git` directory, without running `git`.
+
+    Resolves HEAD, loose refs and `packed-refs`, inflates loose objects, and reads packfiles through their memory-mapped `.idx` files.
+    Supports linked worktrees, `objects/info/alternates` and shallow clones. If the repository has an `objects/info/commit-graph` file, tag lookups walk history by its generation numbers.
+
+    Revisions may be full or abbreviated object names or ref names, optionally followed by `~N` and `^N` suffixes.
+    Ranges have the form `A..B`, where either side defaults to HEAD.
+    """
+    def __init__(self, repo_path: Optional[str] = None):
+        """
+        Arguments:
+
+        repo_path (Optional[str]) - Path to the repository's working tree or any directory inside it. Defaults to the current working directory
+        """
+        self.repo_path: str = os.path.abspath(repo_path or os.getcwd())
+        self.git_dir: str = self._find_git_dir(self.repo_path)
+        self.common_dir: str = self.git_dir
+        commondir_path: str = os.path.join(self.git_dir, "commondir")
+        if os.path.isfile(commondir_path):
+            with open(file=commondir_path, mode="r") as commondir_file:
+                self.common_dir = os.path.normpath(os.path.join(self.git_dir, commondir_file.read().strip()))
+
+        self.object_dirs: List[str] = self._get_object_dirs(os.path.join(self.common_dir, "objects"))
+        self.shallow: Set[str] = self._read_shallow()
+
+        self._packs: Optional[List[PackFile]] = None
+        self._packed_refs: Optional[Dict[str, str]] = None
+        self._commit_graph: Optional[CommitGraph] = None
+        self._commit_graph_loaded: bool = False
+
+    def _find_git_dir(self, path: str) -> str:
+        while True:
+            dot_git: str = os.path.join(path, ".git")
+            if os.path.isdir(dot_git):
+                return dot_git
+            if os.path.isfile(dot_git):
+                # Linked worktrees and submodules point to their git directory from a `.git` file
+                with open(file=dot_git, mode="r") as dot_git_file:
+                    gitdir: str = dot_git_file.read().strip().removeprefix("gitdir:").strip()
+                return os.path.normpath(os.path.join(path, gitdir))
+            if all(os.path.exists(os.path.join(path, name)) for name in ("HEAD", "objects", "refs")):
+                return path
+
+            parent: str = os.path.dirname(path)
+            if parent == path:
+                raise FileNotFoundError(f"Not a git repository: {self.repo_path}")
+            path = parent
+
+    def _read_shallow(self) -> Set[str]:
+        shallow_path: str = os.path.join(self.common_dir, "shallow")
+        if not os.path.isfile(shallow_path):
+            return set()
+        with open(file=shallow_path, mode="r") as shallow_file:
+            return {line.strip() for line in shallow_file if line.strip()}
+
+    def _get_object_dirs(self, objects_dir: str) -> List[str]:
+        object_dirs: List[str] = [objects_dir]
+        alternates_path: str = os.path.join(objects_dir, "info", "alternates")
+        if os.path.isfile(alternates_path):
+            with open(file=alternates_path, mode="r") as alternates_file:
+                for line in alternates_file:
+                    line = line.strip()
+                    if line and not line.startswith("#"):
+                        object_dirs.extend(self._get_object_dirs(os.path.normpath(os.path.join(objects_dir, line))))
+
+        return object_dirs
+
+    def _get_packs(self) -> List[PackFile]:
+        if self._packs is None:
+            self._packs = []
+            for objects_dir in self.object_dirs:
+                for idx_path in sorted(glob.glob(os.path.join(objects_dir, "pack", "pack-*.idx"))):
+                    pack_path: str = idx_path[:-len(".idx")] + ".pack"
+                    if os.path.isfile(pack_path):
+                        self._packs.append(PackFile(pack_path, PackIndex(idx_path), self._read_object))
+
+        return self._packs
+
+    def _get_commit_graph(self) -> Optional[CommitGraph]:
+        if not self._commit_graph_loaded:
+            self._commit_graph_loaded = True
+            graph_path: str = os.path.join(self.common_dir, "objects", "info", "commit-graph")
+            # Generation numbers do not account for the parents hidden in a shallow clone
+            if os.path.isfile(graph_path) and not self.shallow:
+                try:
+                    self._commit_graph = CommitGraph(graph_path)
+                except (OSError, ValueError, struct.error):
+                    # An unreadable graph only makes walks slower, so it is ignored
+                    self._commit_graph = None
+
+        return self._commit_graph
+
+    def close(self):
+        for pack in self._packs or []:
+            pack.close()
+        self._packs = None
+        if self._commit_graph:
+            self._commit_graph.close()
+        self._commit_graph = None
+        self._commit_graph_loaded = False
+
+    def refresh(self):
+        self.close()
+        self._packed_refs = None
+        self.shallow = self._read_shallow()
+
+    def _get_packed_refs(self) -> Dict[str, str]:
+        if self._packed_refs is None:
+            self._packed_refs = {}
+            packed_refs_path: str = os.path.join(self.common_dir, "packed-refs")
+            if os.path.isfile(packed_refs_path):
+                with open(file=packed_refs_path, mode="r") as packed_refs_file:
+                    for line in packed_refs_file:
+                        # Comment lines hold capabilities and `^` lines hold the peeled value of the previous tag
+                        if line.startswith(("#", "^")):
+                            continue
+                        sha, _, refname = line.strip().partition(" ")
+                        self._packed_refs[refname] = sha
+
+        return self._packed_refs
+
+    def resolve_ref(self, refname: str) -> Optional[str]:
+        """
+        Returns the object name a ref points to, following symbolic refs, or None if the ref does not exist.
+        """
+        for _ in range(MAX_SYMREF_DEPTH):
+            if ".." in refname.split("/") or refname.startswith("/"):
+                return None
+
+            content: Optional[str] = None
+            # Pseudo-refs such as HEAD are per-worktree, everything under refs/ is shared
+            for ref_dir in (self.git_dir, self.common_dir):
+                ref_path: str = os.path.join(ref_dir, refname)
+                if os.path.isfile(ref_path):
+                    with open(file=ref_path, mode="r") as ref_file:
+                        content = ref_file.read().strip()
+                    break
+
+            if content is None:
+                return self._get_packed_refs().get(refname)
+            if not content.startswith("ref:"):
+                return content
+            refname = content.removeprefix("ref:").strip()
+
+        raise ValueError(f"Symbolic ref nesting is too deep: {refname}")
+
+    def iter_tags(self) -> Iterator[Tuple[str, str]]:
+        """
+        Streams the name, without `refs/tags/`, and target object name of every tag, from loose refs and `packed-refs`. Loose refs take precedence.
+        """
+        tags_dir: str = os.path.join(self.common_dir, "refs", "tags")
+        loose_tags: Set[str] = set()
+        for dir_path, _, file_names in os.walk(tags_dir):
+            for file_name in file_names:
+                tag: str = os.path.relpath(os.path.join(dir_path, file_name), tags_dir).replace(os.sep, "/")
+                sha: Optional[str] = self.resolve_ref(f"refs/tags/{tag}")
+                if sha:
+                    loose_tags.add(tag)
+                    yield tag, sha
+
+        for refname, sha in self._get_packed_refs().items():
+            if refname.startswith("refs/tags/") and refname[len("refs/tags/"):] not in loose_tags:
+                yield refname[len("refs/tags/"):], sha
+
+    def _read_commit_graph_entry(self, sha: str) -> CommitGraphEntry:
+        """
+        Returns the generation number, commit time and parents of commit `sha`. Commits missing from the commit-graph get the highest possible generation, since the graph is closed under reachability and so cannot contain their descendants.
+        """
+        commit_graph: Optional[CommitGraph] = self._get_commit_graph()
+        entry: Optional[CommitGraphEntry] = commit_graph.read_commit(sha) if commit_graph else None
+        if entry is not None:
+            return entry
+
+        commit: GitCommit = self.read_commit(sha)
+        return CommitGraphEntry(generation=GENERATION_NUMBER_INFINITY, commit_time=commit.commit_time, parents=commit.parents)
+
+    def get_nearest_tags(self, matches: Callable[[str], bool], revision: str = "HEAD") -> List[str]:
+        """
+        Walks history from `revision` and returns the tags accepted by `matches` on every tagged commit reached without passing through another one.
+
+        The walk does not continue past tagged commits, so after a merge it returns the tags of the nearest tagged commit on each merged branch.
+        Commits are visited by descending generation number, and the walk stops once every queued commit has a lower generation than all tagged commits,
+        since none of them can lead to a tag. Without a commit-graph, every commit has the same generation and they are visited by descending commit time.
+        """
+        tags_by_commit: Dict[str, List[str]] = {}
+        for tag, sha in self.iter_tags():
+            if matches(tag):
+                try:
+                    tags_by_commit.setdefault(self.peel_to_commit(sha), []).append(tag)
+                except KeyError:
+                    # Tags of objects missing from a partial or shallow clone cannot be reached anyway
+                    continue
+        if not tags_by_commit:
+            return []
+        min_tag_generation: int = min(self._read_commit_graph_entry(sha).generation for sha in tags_by_commit)
+
+        start_sha: str = self.rev_parse(revision)
+        start_entry: CommitGraphEntry = self._read_commit_graph_entry(start_sha)
+        queue: List[Tuple[int, int, int, str, CommitGraphEntry]] = [(-start_entry.generation, -start_entry.commit_time, 0, start_sha, start_entry)]
+        seen: Set[str] = {start_sha}
+        nearest_tags: List[str] = []
+        while queue and -queue[0][0] >= min_tag_generation:
+            _, _, _, sha, entry = heapq.heappop(queue)
+            if sha in tags_by_commit:
+                nearest_tags.extend(tags_by_commit[sha])
+                continue
+            for parent in entry.parents:
+                if parent not in seen:
+                    seen.add(parent)
+                    try:
+                        parent_entry: CommitGraphEntry = self._read_commit_graph_entry(parent)
+                    except KeyError:
+                        # History beyond a shallow boundary is not present
+                        continue
+                    heapq.heappush(queue, (-parent_entry.generation, -parent_entry.commit_time, len(seen), parent, parent_entry))
+
+        return sorted(nearest_tags)
+
+    def _find_abbreviated_sha(self, hex_prefix: str) -> Optional[str]:
+        matches: Set[str] = set()
+        for objects_dir in self.object_dirs:
+            fanout_dir: str = os.path.join(objects_dir, hex_prefix[:2])
+            if os.path.isdir(fanout_dir):
+                matches.update(hex_prefix[:2] + name for name in os.listdir(fanout_dir) if (hex_prefix[:2] + name).startswith(hex_prefix))
+        for pack in self._get_packs():
+            matches.update(pack.index.find_prefix(hex_prefix))
+
+        if len(matches) > 1:
+            raise ValueError(f"Ambiguous short object name: {hex_prefix}")
+
+        return matches.pop() if matches else None
+
+    def rev_parse(self, revision: str) -> str:
+        """
+        Returns the name of the commit `revision` refers to.
+        """
+        suffix_match: Optional[re.Match] = re.search(r"(?:[~^]\d*)*$", revision)
+        base: str = revision[:suffix_match.start()]
+        suffixes: List[Tuple[str, str]] = REVISION_SUFFIX_PATTERN.findall(suffix_match.group())
+
+        sha: Optional[str] = None
+        if FULL_SHA_PATTERN.fullmatch(base):
+            sha = base
+        else:
+            for ref_search_path in REF_SEARCH_PATHS:
+                sha = self.resolve_ref(ref_search_path.format(base))
+                if sha:
+                    break
+            if sha is None and ABBREVIATED_SHA_PATTERN.fullmatch(base):
+                sha = self._find_abbreviated_sha(base)
+        if sha is None:
+            raise ValueError(f"Unknown revision: {revision}")
+
+        try:
+            sha = self.peel_to_commit(sha)
+            for operator, count in suffixes:
+                parents: Tuple[str, ...] = self.read_commit(sha).parents
+                if operator == "~":
+                    for _ in range(int(count or 1)):
+                        if not parents:
+                            raise ValueError(f"Unknown revision: {revision}")
+                        sha = parents[0]
+                        parents = self.read_commit(sha).parents
+                elif count != "0":
+                    parent_number: int = int(count or 1)
+                    if parent_number > len(parents):
+                        raise ValueError(f"Unknown revision: {revision}")
+                    sha = parents[parent_number - 1]
+        except KeyError as e:
+            # A well-formed name of an object that is not in the repository, e.g. of a commit that was force-pushed away
+            raise ValueError(f"Unknown revision: {revision}") from e
+
+        return sha
+
+    def _read_object(self, sha: bytes) -> Tuple[GitObjectType, bytes]:
+        for pack in self._get_packs():
+            packed_object: Optional[Tuple[GitObjectType, bytes]] = pack.read_object(sha)
+            if packed_object is not None:
+                return packed_object
+
+        hex_sha: str = sha.hex()
+        for objects_dir in self.object_dirs:
+            loose_path: str = os.path.join(objects_dir, hex_sha[:2], hex_sha[2:])
+            if os.path.isfile(loose_path):
+                with open(file=loose_path, mode="rb") as loose_file:
+                    raw_object: bytes = zlib.decompress(loose_file.read())
+                header, _, data = raw_object.partition(b"\0")
+                type_name, _, _ = header.partition(b" ")
+                return OBJECT_TYPE_BY_NAME[type_name], data
+
+        raise KeyError(f"Object not found: {hex_sha}")
+
+    def read_object(self, sha: str) -> Tuple[GitObjectType, bytes]:
+        """
+        Returns the type and content of the object with hex name `sha`.
+        """
+        if len(sha) != SHA_LENGTH * 2:
+            raise ValueError(f"Invalid object name: {sha}")
+
+        return self._read_object(bytes.fromhex(sha))
+
+    def peel_to_commit(self, sha: str) -> str:
+        """
+        Follows annotated tags until reaching a non-tag object, and returns its name.
+        """
+        object_type, data = self.read_object(sha)
+        while object_type == GitObjectType.TAG:
+            sha = data[len(b"object "):data.index(b"\n")].decode("ascii")
+            object_type, data = self.read_object(sha)
+
+        return sha
+
+    def read_commit(self, sha: str) -> GitCommit:
+        object_type, data = self.read_object(sha)
+        if object_type != GitObjectType.COMMIT:
+            raise ValueError(f"Object {sha} is a {object_type.name.lower()}, not a commit")
+
+        header, _, message = data.partition(b"\n\n")
+        tree: str = ""
+        parents: List[str] = []
+        commit_time: int = 0
+        encoding: str = "utf-8"
+        for line in header.split(b"\n"):
+            key, _, value = line.partition(b" ")
+            if key == b"tree":
+                tree = value.decode("ascii")
+            elif key == b"parent":
+                parents.append(value.decode("ascii"))
+            elif key == b"committer":
+                commit_time = int(value.rsplit(b" ", 2)[1])
+            elif key == b"encoding":
+                encoding = value.decode("ascii")
+
+        # Parents of shallow commits are not present in the repository
+        if sha in self.shallow:
+            parents = []
+
+        try:
+            decoded_message: str = message.decode(encoding, errors="replace")
+        except LookupError:
+            decoded_message = message.decode("utf-8", errors="replace")
+
+        return GitCommit(sha=sha, tree=tree, parents=tuple(parents), commit_time=commit_time, message=decoded_message)
+
+    def read_tree(self, sha: str) -> Dict[bytes, Tuple[bytes, str]]:
+        """
+        Returns the entries of a tree object, mapping each name to its mode and object name.
+        """
+        object_type, data = self.read_object(sha)
+        if object_type != GitObjectType.TREE:
+            raise ValueError(f"Object {sha} is a {object_type.name.lower()}, not a tree")
+
+        entries: Dict[bytes, Tuple[bytes, str]] = {}
+        position: int = 0
+        while position < len(data):
+            mode_end: int = data.index(b" ", position)
+            name_end: int = data.index(b"\0", mode_end)
+            entries[data[mode_end + 1:name_end]] = (data[position:mode_end], data[name_end + 1:name_end + 1 + SHA_LENGTH].hex())
+            position = name_end + 1 + SHA_LENGTH
+
+        return entries
+
+    def _diff_trees(self, old_tree: Optional[str], new_tree: Optional[str], prefix: str) -> Iterator[str]:
+        old_entries: Dict[bytes, Tuple[bytes, str]] = self.read_tree(old_tree) if old_tree else {}
+        new_entries: Dict[bytes, Tuple[bytes, str]] = self.read_tree(new_tree) if new_tree else {}
+        for name in sorted(old_entries.keys() | new_entries.keys()):
+            old_entry: Optional[Tuple[bytes, str]] = old_entries.get(name)
+            new_entry: Optional[Tuple[bytes, str]] = new_entries.get(name)
+            # Identical object names mean identical contents, so unchanged subtrees are never read
+            if old_entry == new_entry:
+                continue
+
+            path: str = prefix + name.decode("utf-8", errors="replace")
+            old_subtree: Optional[str] = old_entry[1] if old_entry and old_entry[0] == TREE_MODE else None
+            new_subtree: Optional[str] = new_entry[1] if new_entry and new_entry[0] == TREE_MODE else None
+            if (old_entry and not old_subtree) or (new_entry and not new_subtree):
+                yield path
+            if old_subtree or new_subtree:
+                yield from self._diff_trees(old_subtree, new_subtree, path + "/")
+
+    def iter_commits(self, include: Iterable[str], exclude: Iterable[str] = ()) -> Iterator[GitCommit]:
+        """
+        Streams commits reachable from `include` but not from `exclude`, like `git log`: by descending generation number, and by descending commit time
+        among commits missing from the commit-graph or when there is none.
+
+        A walked commit is yielded as soon as no queued commit can be its descendant, since only a descendant reachable from `exclude` could still exclude it,
+        or as soon as no commit reachable from `exclude` is queued at all. With a commit-graph that is right after it is walked, whatever the commit times.
+        Without one, commits sharing a commit time are held back while commits reachable from `exclude` with that time are queued.
+        The walk stops as soon as only commits reachable from `exclude` remain queued.
+        """
+        commit_graph: Optional[CommitGraph] = self._get_commit_graph()
+        pending: Dict[str, GitCommit] = {}
+        seen: Set[str] = set()
+        uninteresting: Set[str] = set()
+        queue: List[Tuple[int, int, int, str]] = []
+        interesting_count: int = 0
+
+        def _mark_uninteresting(sha: str):
+            nonlocal interesting_count
+            stack: List[str] = [sha]
+            while stack:
+                sha = stack.pop()
+                if sha in uninteresting:
+                    continue
+                uninteresting.add(sha)
+                if sha in pending:
+                    interesting_count -= 1
+                else:
+                    # Already walked, so its parents were queued as interesting and must be corrected too
+                    stack.extend(parent for parent in self.read_commit(sha).parents if parent in seen)
+
+        def _push(sha: str, is_uninteresting: bool):
+            nonlocal interesting_count
+            if sha in seen:
+                if is_uninteresting:
+                    _mark_uninteresting(sha)
+                return
+
+            seen.add(sha)
+            commit: GitCommit = self.read_commit(sha)
+            pending[sha] = commit
+            if is_uninteresting:
+                uninteresting.add(sha)
+            else:
+                interesting_count += 1
+            entry: Optional[CommitGraphEntry] = commit_graph.read_commit(sha) if commit_graph else None
+            generation: int = entry.generation if entry else GENERATION_NUMBER_INFINITY
+            heapq.heappush(queue, (-generation, -commit.commit_time, len(seen), sha))
+
+        def _may_have_queued_descendant(generation: int, commit_time: int) -> bool:
+            # The queue is ordered so that its first commit is the likeliest descendant of any walked commit
+            if not queue or len(pending) == interesting_count:
+                return False
+            queued_generation: int = -queue[0][0]
+            if generation != GENERATION_NUMBER_INFINITY:
+                return queued_generation > generation
+            # Commits missing from the commit-graph cannot be ancestors of commits in it
+            return queued_generation == GENERATION_NUMBER_INFINITY and -queue[0][1] >= commit_time
+
+        for sha in exclude:
+            _push(sha, True)
+        for sha in include:
+            _push(sha, False)
+
+        walked: Deque[Tuple[int, GitCommit]] = deque()
+        while queue and (interesting_count > 0 or walked):
+            negative_generation, _, _, sha = heapq.heappop(queue)
+            commit: GitCommit = pending.pop(sha)
+            is_uninteresting: bool = sha in uninteresting
+            if not is_uninteresting:
+                interesting_count -= 1
+                walked.append((-negative_generation, commit))
+            for parent in commit.parents:
+                _push(parent, is_uninteresting)
+            while walked and not _may_have_queued_descendant(walked[0][0], walked[0][1].commit_time):
+                _, commit = walked.popleft()
+                if commit.sha not in uninteresting:
+                    yield commit
+
+        for _, commit in walked:
+            if commit.sha not in uninteresting:
+                yield commit
+
+    def is_ancestor(self, ancestor: str, descendant: str = "HEAD") -> bool:
+        """
+        Returns whether commit `ancestor` is reachable from `descendant`, like `git merge-base --is-ancestor`.
+
+        History more than CLOCK_SKEW_SLOP seconds older than `ancestor` is not walked, since it cannot lead back to it unless commit times are badly skewed.
+        """
+        try:
+            ancestor_sha: str = self.rev_parse(ancestor)
+            stack: List[str] = [self.rev_parse(descendant)]
+            min_commit_time: int = self.read_commit(ancestor_sha).commit_time - CLOCK_SKEW_SLOP
+            seen: Set[str] = set(stack)
+            while stack:
+                sha: str = stack.pop()
+                if sha == ancestor_sha:
+                    return True
+                commit: GitCommit = self.read_commit(sha)
+                if commit.commit_time < min_commit_time:
+                    continue
+                for parent in commit.parents:
+                    if parent not in seen:
+                        seen.add(parent)
+                        stack.append(parent)
+        except (KeyError, ValueError):
+            # Unknown revisions, e.g. a commit that was force-pushed away, are not ancestors
+            return False
+
+        return False
+
+    def _parse_revision_range(self, revision_range: str) -> Tuple[List[str], List[str]]:
+        if ".." in revision_range:
+            exclude, _, include = revision_range.partition("..")
+            return [self.rev_parse(include or "HEAD")], [self.rev_parse(exclude or "HEAD")]
+
+        return [self.rev_parse(revision_range)], []
+
+    def get_latest_commit_msg(self, revision: str = "HEAD") -> str:
+        # Matches `git log -1 --pretty=%B`, which terminates the entry with a newline
+        return self.read_commit(self.rev_parse(revision)).message + "\n"
+
+    def iter_commit_msgs(self, revision_range: str) -> Iterator[str]:
+        include, exclude = self._parse_revision_range(revision_range)
+        for commit in self.iter_commits(include, exclude):
+            yield commit.message
+
+    def iter_commit_shas(self, revision_range: str) -> Iterator[str]:
+        include, exclude = self._parse_revision_range(revision_range)
+        for commit in self.iter_commits(include, exclude):
+            yield commit.sha
+
+    def iter_commit_msgs_by_sha(self, shas: Iterable[str]) -> Iterator[Tuple[str, str]]:
+        for sha in shas:
+            yield sha, self.read_commit(sha).message
+
+    def iter_commit_changes(self, revision_range: str) -> Iterator[GitCommitChanges]:
+        include, exclude = self._parse_revision_range(revision_range)
+        for commit in self.iter_commits(include, exclude):
+            # Like `git log --name-only`, merges are not diffed
+            if len(commit.parents) > 1:
+                paths: Tuple[str, ...] = ()
+            else:
+                parent_tree: Optional[str] = self.read_commit(commit.parents[0]).tree if commit.parents else None
+                paths = tuple(self._diff_trees(parent_tree, commit.tree, ""))
+            yield GitCommitChanges(message=commit.message, paths=paths)
@@ -0,0 +1,271 @@
+from collections import OrderedDict
+import mmap
+import struct
+import zlib
+from typing import BinaryIO, Callable, List, Optional, Tuple
+from src.clients.git._types import GitObjectType
+from src.clients.git.constants import DELTA_BASE_CACHE_SIZE, PACK_IDX_V2_MAGIC, PACK_SIGNATURE, SHA_LENGTH
+
+
+class PackIndex:
+    """
+    Looks up object offsets in a packfile through its memory-mapped `.idx` file.
+
+    Lookups are a binary search over the sorted object names between the two fanout table bounds for the first byte of the name, so only a handful of pages of the index are ever touched.
+    Supports index versions 1 and 2, see https://git-scm.com/docs/pack-format#_pack_idx_files_have_the_following_format
+    """
+    def __init__(self, idx_path: str):
+        """
+        Arguments:
+
+        idx_path (str) - Path to a `pack-*.idx` file
+        """
+        self.idx_path: str = idx_path
+        self._file: BinaryIO = open(idx_path, "rb")
+        self._mmap: mmap.mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[:4] == PACK_IDX_V2_MAGIC:
+            self.version: int = struct.unpack(">I", self._mmap[4:8])[0]
+            if self.version != 2:
+                raise ValueError(f"Unsupported pack index version {self.version}: {idx_path}")
+            fanout_offset: int = 8
+        else:
+            self.version = 1
+            fanout_offset = 0
+
+        self._fanout: Tuple[int, ...] = struct.unpack(">256I", self._mmap[fanout_offset:fanout_offset + 1024])
+        self.object_count: int = self._fanout[255]
+        self._entries_offset: int = fanout_offset + 1024
+        if self.version == 2:
+            self._crc_offset: int = self._entries_offset + SHA_LENGTH * self.object_count
+            self._offsets_offset: int = self._crc_offset + 4 * self.object_count
+            self._large_offsets_offset: int = self._offsets_offset + 4 * self.object_count
+
+    def _sha_at(self, position: int) -> bytes:
+        if self.version == 2:
+            start: int = self._entries_offset + SHA_LENGTH * position
+        else:
+            start = self._entries_offset + (SHA_LENGTH + 4) * position + 4
+
+        return self._mmap[start:start + SHA_LENGTH]
+
+    def _offset_at(self, position: int) -> int:
+        if self.version == 1:
+            start: int = self._entries_offset + (SHA_LENGTH + 4) * position
+            return struct.unpack(">I", self._mmap[start:start + 4])[0]
+
+        start = self._offsets_offset + 4 * position
+        offset: int = struct.unpack(">I", self._mmap[start:start + 4])[0]
+        # Offsets that do not fit in 31 bits are stored in a separate table of 64-bit values
+        if offset & 0x80000000:
+            start = self._large_offsets_offset + 8 * (offset & 0x7fffffff)
+            offset = struct.unpack(">Q", self._mmap[start:start + 8])[0]
+
+        return offset
+
+    def _lower_bound(self, sha: bytes) -> int:
+        low: int = self._fanout[sha[0] - 1] if sha[0] > 0 else 0
+        high: int = self._fanout[sha[0]]
+        while low < high:
+            middle: int = (low + high) // 2
+            if self._sha_at(middle) < sha:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+    def find_offset(self, sha: bytes) -> Optional[int]:
+        """
+        Returns the packfile offset of the object with binary name `sha`, or None if it is not in this pack.
+        """
+        position: int = self._lower_bound(sha)
+        if position < self.object_count and self._sha_at(position) == sha:
+            return self._offset_at(position)
+
+        return None
+
+    def find_prefix(self, hex_prefix: str, limit: int = 2) -> List[str]:
+        """
+        Returns up to `limit` hex object names in this pack that start with `hex_prefix`.
+        """
+        padded_prefix: bytes = bytes.fromhex(hex_prefix.ljust(SHA_LENGTH * 2, "0"))
+        matches: List[str] = []
+        position: int = self._lower_bound(padded_prefix)
+        while position < self.object_count and len(matches) < limit:
+            sha: str = self._sha_at(position).hex()
+            if not sha.startswith(hex_prefix):
+                break
+            matches.append(sha)
+            position += 1
+
+        return matches
+
+    def close(self):
+        self._mmap.close()
+        self._file.close()
+
+
+class PackFile:
+    """
+    Reads and inflates objects from a memory-mapped `.pack` file, resolving delta chains.
+
+    See https://git-scm.com/docs/pack-format
+    """
+    def __init__(self, pack_path: str, index: PackIndex, read_external_object: Callable[[bytes], Tuple[GitObjectType, bytes]]):
+        """
+        Arguments:
+
+        pack_path (str) - Path to a `pack-*.pack` file
+
+        index (PackIndex) - The index belonging to the pack
+
+        read_external_object (Callable) - Reads an object by binary name from anywhere in the repository. Used for REF_DELTA bases that live outside this pack, as in thin packs completed by `git fetch`
+        """
+        self.pack_path: str = pack_path
+        self.index: PackIndex = index
+        self._read_external_object: Callable[[bytes], Tuple[GitObjectType, bytes]] = read_external_object
+        self._file: BinaryIO = open(pack_path, "rb")
+        self._mmap: mmap.mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:4] != PACK_SIGNATURE:
+            raise ValueError(f"Not a packfile: {pack_path}")
+        self._delta_base_cache: "OrderedDict[int, Tuple[GitObjectType, bytes]]" = OrderedDict()
+
+    def read_object(self, sha: bytes) -> Optional[Tuple[GitObjectType, bytes]]:
+        """
+        Returns the type and inflated content of the object with binary name `sha`, or None if it is not in this pack.
+        """
+        offset: Optional[int] = self.index.find_offset(sha)
+        if offset is None:
+            return None
+
+        return self._read_object_at(offset)
+
+    def _read_entry_header(self, offset: int) -> Tuple[GitObjectType, int, int]:
+        byte: int = self._mmap[offset]
+        offset += 1
+        object_type: GitObjectType = GitObjectType((byte >> 4) & 0x7)
+        size: int = byte & 0x0f
+        shift: int = 4
+        while byte & 0x80:
+            byte = self._mmap[offset]
+            offset += 1
+            size |= (byte & 0x7f) << shift
+            shift += 7
+
+        return object_type, size, offset
+
+    def _inflate(self, offset: int, size: int) -> bytes:
+        decompressor = zlib.decompressobj()
+        # Compressed data is rarely much larger than its inflated size, so one read usually suffices
+        read_size: int = max(size + 64, 4096)
+        chunks: List[bytes] = []
+        while not decompressor.eof:
+            compressed: bytes = self._mmap[offset:offset + read_size]
+            if not compressed:
+                raise ValueError(f"Truncated object data in {self.pack_path}")
+            chunks.append(decompressor.decompress(compressed))
+            offset += len(compressed)
+
+        return b"".join(chunks)
+
+    def _read_object_at(self, offset: int) -> Tuple[GitObjectType, bytes]:
+        # Walks down the delta chain to a full object, then applies the deltas on the way back up
+        delta_chain: List[Tuple[int, bytes]] = []
+        while True:
+            cached: Optional[Tuple[GitObjectType, bytes]] = self._delta_base_cache.get(offset)
+            if cached is not None:
+                self._delta_base_cache.move_to_end(offset)
+                object_type, data = cached
+                break
+
+            object_type, size, data_offset = self._read_entry_header(offset)
+            if object_type == GitObjectType.OFS_DELTA:
+                byte: int = self._mmap[data_offset]
+                data_offset += 1
+                relative_offset: int = byte & 0x7f
+                while byte & 0x80:
+                    byte = self._mmap[data_offset]
+                    data_offset += 1
+                    relative_offset = ((relative_offset + 1) << 7) | (byte & 0x7f)
+                delta_chain.append((offset, self._inflate(data_offset, size)))
+                offset -= relative_offset
+            elif object_type == GitObjectType.REF_DELTA:
+                base_sha: bytes = self._mmap[data_offset:data_offset + SHA_LENGTH]
+                delta_chain.append((offset, self._inflate(data_offset + SHA_LENGTH, size)))
+                base_offset: Optional[int] = self.index.find_offset(base_sha)
+                if base_offset is None:
+                    object_type, data = self._read_external_object(base_sha)
+                    break
+                offset = base_offset
+            else:
+                data = self._inflate(data_offset, size)
+                self._cache_delta_base(offset, object_type, data)
+                break
+
+        for delta_offset, delta in reversed(delta_chain):
+            data = apply_delta(data, delta)
+            self._cache_delta_base(delta_offset, object_type, data)
+
+        return object_type, data
+
+    def _cache_delta_base(self, offset: int, object_type: GitObjectType, data: bytes):
+        self._delta_base_cache[offset] = (object_type, data)
+        if len(self._delta_base_cache) > DELTA_BASE_CACHE_SIZE:
+            self._delta_base_cache.popitem(last=False)
+
+    def close(self):
+        self._mmap.close()
+        self._file.close()
+        self.index.close()
+
+
+def _read_delta_size(delta: bytes, position: int) -> Tuple[int, int]:
+    size: int = 0
+    shift: int = 0
+    while True:
+        byte: int = delta[position]
+        position += 1
+        size |= (byte & 0x7f) << shift
+        shift += 7
+        if not byte & 0x80:
+            return size, position
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    """
+    Reconstructs an object from its delta base and a git delta instruction stream.
+
+    See https://git-scm.com/docs/pack-format#_deltified_representation
+    """
+    base_size, position = _read_delta_size(delta, 0)
+    result_size, position = _read_delta_size(delta, position)
+    if base_size != len(base):
+        raise ValueError(f"Delta base size mismatch: expected {base_size}, got {len(base)}")
+
+    result: bytearray = bytearray()
+    while position < len(delta):
+        instruction: int = delta[position]
+        position += 1
+        if instruction & 0x80:
+            copy_offset: int = 0
+            copy_size: int = 0
+            for i in range(4):
+                if instruction & (1 << i):
+                    copy_offset |= delta[position] << (8 * i)
+                    position += 1
+            for i in range(3):
+                if instruction & (1 << (4 + i)):
+                    copy_size |= delta[position] << (8 * i)
+                    position += 1
+            result += base[copy_offset:copy_offset + (copy_size or 0x10000)]
+        elif instruction:
+            result += delta[position:position + instruction]
+            position += instruction
+        else:
+            raise ValueError("Invalid delta instruction 0")
+
+    if len(result) != result_size:
+        raise ValueError(f"Delta result size mismatch: expected {result_size}, got {len(result)}")
+
+    return bytes(result)
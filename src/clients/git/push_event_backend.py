@@ -0,0 +1,292 @@
+import json
+from logging import Logger
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from src.clients.git._types import GitCommitChanges, PushEvent, PushEventCommit
+from src.clients.git.git_backend import GitBackend
+from src.clients.git.constants import PUSH_EVENT_MAX_COMMITS, PUSH_EVENT_READ_SIZE
+
+JSON_WHITESPACE: str = " \t\r\n"
+
+
+class _JsonStream:
+    """
+    Decodes a JSON document token by token from a file, so that large arrays can be consumed one element at a time.
+    """
+    def __init__(self, stream: TextIO, read_size: int = PUSH_EVENT_READ_SIZE):
+        self.stream: TextIO = stream
+        self.read_size: int = read_size
+        self.decoder: json.JSONDecoder = json.JSONDecoder()
+        self.buffer: str = ""
+        self.pos: int = 0
+
+    def _fill(self) -> bool:
+        # Reads at least as much as is buffered, so a value spanning many reads is decoded a logarithmic number of times
+        chunk: str = self.stream.read(max(self.read_size, len(self.buffer) - self.pos))
+        if not chunk:
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+
+        return True
+
+    def peek(self) -> str:
+        """
+        Returns the next non-whitespace character without consuming it, or an empty string at the end of the document.
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in JSON_WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        """
+        Consumes and returns the next non-whitespace character, which must be one of `chars`.
+        """
+        char: str = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Invalid JSON: expected one of {list(chars)}, found {char!r}")
+        self.pos += 1
+
+        return char
+
+    def decode(self) -> Any:
+        """
+        Consumes and returns the next complete JSON value.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next read
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+
+            return value
+
+
+def _parse_commit(commit: Any) -> PushEventCommit:
+    if not isinstance(commit, dict):
+        raise ValueError(f"Invalid push event commit: {commit!r}")
+    paths: Dict[str, None] = dict.fromkeys(
+        path for key in ("added", "removed", "modified") for path in commit.get(key) or []
+    )
+
+    return PushEventCommit(sha=commit["id"], message=commit.get("message", "").rstrip("\n") + "\n", paths=tuple(paths))
+
+
+def read_push_event(event_file: TextIO, read_size: int = PUSH_EVENT_READ_SIZE) -> PushEvent:
+    """
+    Reads a GitHub push event, e.g. from $GITHUB_EVENT_PATH.
+
+    The `commits` array is decoded one commit at a time and only the parts needed for history analysis are kept, so the file lists and author details
+    of up to PUSH_EVENT_MAX_COMMITS commits are never held in memory at once. Other top-level values are decoded whole.
+    """
+    stream: _JsonStream = _JsonStream(event_file, read_size)
+    fields: Dict[str, Any] = {}
+    commits: List[PushEventCommit] = []
+    stream.expect("{")
+    if stream.peek() == "}":
+        stream.expect("}")
+    else:
+        while True:
+            key: Any = stream.decode()
+            stream.expect(":")
+            if key == "commits" and stream.peek() == "[":
+                stream.expect("[")
+                if stream.peek() == "]":
+                    stream.expect("]")
+                else:
+                    while True:
+                        commits.append(_parse_commit(stream.decode()))
+                        if stream.expect(",]") == "]":
+                            break
+            else:
+                fields[key] = stream.decode()
+            if stream.expect(",}") == "}":
+                break
+
+    head_commit: Any = fields.get("head_commit")
+
+    return PushEvent(
+        ref=fields.get("ref") or "",
+        before=fields.get("before") or "",
+        after=fields.get("after") or "",
+        created=bool(fields.get("created")),
+        deleted=bool(fields.get("deleted")),
+        forced=bool(fields.get("forced")),
+        commits=tuple(commits),
+        head_commit=_parse_commit(head_commit) if head_commit else None
+    )
+
+
+class PushEventBackend(GitBackend):
+    """
+    Reads the pushed commits from the GitHub push event that triggered the run, without running `git` or reading a checkout.
+
+    The event lists the commits in `{before}..{after}`, where HEAD and the pushed ref refer to `after`. Requests the event can answer exactly, e.g. the latest commit,
+    or the range since `before`, are served from it. Everything else, and every request if the event is missing, truncated,
+    or creates, deletes or force-pushes the ref, is passed on to the fallback backend, which is only created when first needed.
+
+    Unlike `git log --name-only`, the paths of merge commits are listed as GitHub reports them.
+    """
+    def __init__(self, event_path: Optional[str], fallback: Callable[[], GitBackend], logger: Optional[Logger] = None):
+        """
+        Arguments:
+
+        event_path (Optional[str]) - Path to the push event, e.g. $GITHUB_EVENT_PATH. If None or missing, every request is passed on to the fallback
+
+        fallback (Callable[[], GitBackend]) - Creates the backend that reads history the event cannot answer from, e.g. GitRepository
+
+        logger (Optional[Logger]) - An instance of logging.Logger used to log why the event cannot be used
+        """
+        self.fallback: Callable[[], GitBackend] = fallback
+        self.logger: Optional[Logger] = logger
+        self._fallback_backend: Optional[GitBackend] = None
+        self.event: Optional[PushEvent] = self._read_event(event_path)
+        # Position of every pushed commit in event.commits, oldest first
+        self._commit_indexes: Dict[str, int] = {commit.sha: i for i, commit in enumerate(self.event.commits)} if self.event else {}
+
+    def _log(self, message: str):
+        if self.logger:
+            self.logger.info(message)
+
+    def _read_event(self, event_path: Optional[str]) -> Optional[PushEvent]:
+        try:
+            with open(file=event_path or "", mode="r", encoding="utf-8") as event_file:
+                event: PushEvent = read_push_event(event_file)
+        except FileNotFoundError:
+            self._log(f"No push event found at '{event_path}', reading commits from the repository")
+            return None
+
+        if event.created or event.deleted or event.forced or not event.after:
+            self._log("The push created, deleted or rewrote the ref, reading commits from the repository")
+            return None
+        if len(event.commits) >= PUSH_EVENT_MAX_COMMITS:
+            self._log(f"The push event lists {len(event.commits)} commits and may be truncated, reading commits from the repository")
+            return None
+
+        return event
+
+    def _get_fallback(self) -> GitBackend:
+        if self._fallback_backend is None:
+            self._fallback_backend = self.fallback()
+
+        return self._fallback_backend
+
+    def _resolve(self, revision: str) -> Optional[str]:
+        """
+        Returns the SHA of `revision` if it is `before`, `after` or one of the pushed commits, otherwise None.
+        """
+        if not self.event:
+            return None
+        if revision in ("HEAD", self.event.after, self.event.ref) or f"refs/heads/{revision}" == self.event.ref:
+            return self.event.after
+        if revision == self.event.before or revision in self._commit_indexes:
+            return revision
+
+        return None
+
+    def _get_commits(self, revision_range: str) -> Optional[List[PushEventCommit]]:
+        """
+        Returns the commits in `revision_range`, newest first, if the event lists all of them, otherwise None.
+        """
+        if not self.event or ".." not in revision_range:
+            return None
+        since, _, until = revision_range.partition("..")
+        since_sha: Optional[str] = self._resolve(since or "HEAD")
+        if self._resolve(until or "HEAD") != self.event.after:
+            return None
+        if since_sha == self.event.after:
+            return []
+        # The pushed commits are not necessarily linear, so the commits after one of them are only known for `before`
+        if since_sha != self.event.before:
+            return None
+
+        return list(reversed(self.event.commits))
+
+    def _get_commit(self, revision: str) -> Optional[PushEventCommit]:
+        sha: Optional[str] = self._resolve(revision)
+        if sha is None or sha == self.event.before:
+            return None
+        if sha in self._commit_indexes:
+            return self.event.commits[self._commit_indexes[sha]]
+        if self.event.head_commit and self.event.head_commit.sha == sha:
+            return self.event.head_commit
+
+        return None
+
+    def get_latest_commit_msg(self, revision: str = "HEAD") -> str:
+        commit: Optional[PushEventCommit] = self._get_commit(revision)
+        if commit is None:
+            return self._get_fallback().get_latest_commit_msg(revision)
+
+        # Matches `git log -1 --pretty=%B`, which terminates the entry with a newline
+        return commit.message + "\n"
+
+    def iter_commit_msgs(self, revision_range: str) -> Iterator[str]:
+        commits: Optional[List[PushEventCommit]] = self._get_commits(revision_range)
+        if commits is None:
+            yield from self._get_fallback().iter_commit_msgs(revision_range)
+            return
+
+        for commit in commits:
+            yield commit.message
+
+    def iter_commit_shas(self, revision_range: str) -> Iterator[str]:
+        commits: Optional[List[PushEventCommit]] = self._get_commits(revision_range)
+        if commits is None:
+            yield from self._get_fallback().iter_commit_shas(revision_range)
+            return
+
+        for commit in commits:
+            yield commit.sha
+
+    def iter_commit_msgs_by_sha(self, shas: Iterable[str]) -> Iterator[Tuple[str, str]]:
+        """
+        Yields the messages of `shas` in order, reading the commits missing from the event from the repository in a single lookup.
+        """
+        commits: List[Tuple[str, Optional[PushEventCommit]]] = [(sha, self._get_commit(sha)) for sha in shas]
+        missing_shas: List[str] = [sha for sha, commit in commits if commit is None]
+        fallback_msgs: Dict[str, str] = dict(self._get_fallback().iter_commit_msgs_by_sha(missing_shas)) if missing_shas else {}
+        for sha, commit in commits:
+            yield sha, commit.message if commit else fallback_msgs[sha]
+
+    def iter_commit_changes(self, revision_range: str) -> Iterator[GitCommitChanges]:
+        commits: Optional[List[PushEventCommit]] = self._get_commits(revision_range)
+        if commits is None:
+            yield from self._get_fallback().iter_commit_changes(revision_range)
+            return
+
+        for commit in commits:
+            yield GitCommitChanges(message=commit.message, paths=commit.paths)
+
+    def rev_parse(self, revision: str) -> str:
+        return self._resolve(revision) or self._get_fallback().rev_parse(revision)
+
+    def is_ancestor(self, ancestor: str, descendant: str = "HEAD") -> bool:
+        ancestor_sha: Optional[str] = self._resolve(ancestor)
+        # Every pushed commit, and `before` itself, is reachable from `after`
+        if ancestor_sha is not None and self._resolve(descendant) in (ancestor_sha, self.event.after):
+            return True
+
+        return self._get_fallback().is_ancestor(ancestor, descendant)
+
+    def get_nearest_tags(self, matches: Callable[[str], bool], revision: str = "HEAD") -> List[str]:
+        return self._get_fallback().get_nearest_tags(matches, revision)
+
+    def refresh(self):
+        if self._fallback_backend:
+            self._fallback_backend.refresh()
+
+    def close(self):
+        if self._fallback_backend:
+            self._fallback_backend.close()
+        self._fallback_backend = None
@@ -0,0 +1,75 @@
+from email.message import Message
+from enum import Enum
+from typing import Dict, NamedTuple, Optional
+
+
+class CachedResponse(NamedTuple):
+    """
+    A response body stored by src.clients.github.response_cache.ResponseCache, with the ETag it was served with.
+    """
+    etag: str
+    content: bytes
+
+
+class HttpTransportType(str, Enum):
+    """
+    Selects the HTTP library GitHubClient sends requests with.
+
+    The requests transport uses the third-party `requests` package.
+
+    The http.client transport uses only the standard library, so `requests` is never imported.
+    """
+    REQUESTS = "requests"
+    HTTP_CLIENT = "http.client"
+
+
+class HttpResponse(NamedTuple):
+    """
+    A fully read HTTP response, independent of the transport that received it.
+
+    `headers` is an email.message.Message, so header lookups are case-insensitive.
+    """
+    status_code: int
+    reason: str
+    headers: Message
+    content: bytes
+    url: str
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+
+class ApiRequest(NamedTuple):
+    """
+    A GitHub API call described independently of how it is sent, so the synchronous and the asynchronous client build and interpret it the same way.
+
+    `operation` names the call in traces. A 304 response to a request with a `cached_response` is answered from the cache.
+    """
+    operation: str
+    method: str
+    url: str
+    headers: Dict[str, str]
+    body: Optional[bytes] = None
+    cached_response: Optional[CachedResponse] = None
+
+
+class GitHubApiError(OSError):
+    """
+    Raised when the GitHub API answers with a status code that is not a success.
+    """
+    def __init__(self, message: str, response: Optional[HttpResponse] = None):
+        super().__init__(message)
+        self.response: Optional[HttpResponse] = response
+
+
+class HTTPError(GitHubApiError):
+    """
+    Raised when the GitHub API answers with a 4xx or 5xx status code.
+    """
+
+
+class TransportError(OSError):
+    """
+    Raised by an HTTP transport when no response was received, e.g. because the connection failed or timed out. These errors are retried.
+    """
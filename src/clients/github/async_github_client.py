@@ -0,0 +1,157 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+from src.clients.github._types import ApiRequest, GitHubApiError, HttpResponse, TransportError
+from src.clients.github.asyncio_transport import AsyncioTransport
+from src.clients.github.github_client_base import GitHubClientBase
+from src.clients.github.http_transport import AsyncHttpTransport
+from src.clients.github.rate_limit_governor import RateLimitGovernor
+from src.clients.github.response_cache import ResponseCache
+from src.tracing.tracer import Tracer
+from src.clients.github.constants import BASE_URI, BACKOFF_FACTOR, CONNECT_TIMEOUT, MAX_BACKOFF, MAX_RETRIES, MAX_RETRY_WAIT, POOL_MAXSIZE, READ_TIMEOUT, VARIABLES_PER_PAGE
+
+
+class AsyncGitHubClient(GitHubClientBase):
+    """
+    The awaitable counterpart of GitHubClient, with the same retries, rate limit handling and response caching, which both take from GitHubClientBase.
+    It is not a GitHubClient, since its API methods have the same names but return coroutines.
+
+    Its API methods are coroutines, so many calls can be driven concurrently from a single event loop:
+
+        async with AsyncGitHubClient(github_token) as github_client:
+            responses = await asyncio.gather(*(github_client.get_repository_variable(owner, repo, "VERSION") for repo in repos))
+    """
+    def __init__(self, github_token: str, connect_timeout: float = CONNECT_TIMEOUT, read_timeout: float = READ_TIMEOUT, max_retries: int = MAX_RETRIES, backoff_factor: float = BACKOFF_FACTOR, max_backoff: float = MAX_BACKOFF, max_retry_wait: float = MAX_RETRY_WAIT, pool_maxsize: int = POOL_MAXSIZE, cache: Optional[ResponseCache] = None, base_uri: str = BASE_URI, transport: Optional[AsyncHttpTransport] = None, tracer: Optional[Tracer] = None, rate_limit_governor: Optional[RateLimitGovernor] = None):
+        """
+        Arguments:
+
+        Same as GitHubClient, except:
+
+        transport (Optional[AsyncHttpTransport]) - Sends the HTTP requests. Defaults to an AsyncioTransport keeping up to `pool_maxsize` idle connections
+        """
+        super().__init__(
+            github_token=github_token,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            max_retries=max_retries,
+            backoff_factor=backoff_factor,
+            max_backoff=max_backoff,
+            max_retry_wait=max_retry_wait,
+            cache=cache,
+            base_uri=base_uri,
+            tracer=tracer,
+            rate_limit_governor=rate_limit_governor
+        )
+        self._sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+        self.transport: AsyncHttpTransport = transport or AsyncioTransport(pool_maxsize=pool_maxsize)
+
+    async def close(self):
+        await self.transport.close()
+
+    async def __aenter__(self) -> "AsyncGitHubClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _wait_for_rate_limit_budget(self) -> float:
+        # Only the lock on the shared state blocks the event loop, never the wait itself
+        waited: float = 0.0
+        while True:
+            delay: float = self.rate_limit_governor.try_acquire()
+            if delay <= 0:
+                break
+            await self._sleep(delay)
+            waited += delay
+
+        return waited
+
+    async def _handle_api_request(self, request: ApiRequest) -> HttpResponse:
+        attempt: int = 0
+        with self.tracer.span("github.request", operation=request.operation) as attributes:
+            rate_limit_wait: float = 0.0
+            while True:
+                if self.rate_limit_governor:
+                    rate_limit_wait += await self._wait_for_rate_limit_budget()
+                    attributes["rate_limit_wait"] = round(rate_limit_wait, 3)
+                try:
+                    response: HttpResponse = self._receive_response(request, await self.transport.request(
+                        method=request.method,
+                        url=request.url,
+                        headers=request.headers,
+                        body=request.body,
+                        timeout=self.timeout
+                    ))
+                except TransportError:
+                    retry_delay: Optional[float] = self._get_next_retry_delay(request, attempt, None)
+                    if retry_delay is None:
+                        attributes["retries"] = attempt
+                        raise
+                    await self._sleep(retry_delay)
+                    attempt += 1
+                    continue
+
+                retry_delay = self._get_next_retry_delay(request, attempt, response)
+                if retry_delay is None:
+                    break
+                await self._sleep(retry_delay)
+                attempt += 1
+            attributes["status_code"] = response.status_code
+            attributes["retries"] = attempt
+
+        return self._check_response(response)
+
+    async def get_repository_variable(self, repo_owner: str, repo_name: str, variable: str, etag: Optional[str] = None) -> HttpResponse:
+        """
+        Awaitable version of GitHubClient.get_repository_variable()
+        """
+        request: ApiRequest = self._get_repository_variable_request(repo_owner, repo_name, variable, etag)
+        try:
+            response: HttpResponse = await self._handle_api_request(request)
+        except GitHubApiError as e:
+            not_modified_response: Optional[HttpResponse] = self._get_not_modified_response(etag, e)
+            if not_modified_response is None:
+                raise
+            return not_modified_response
+        self._cache_repository_variable(repo_owner, repo_name, variable, request, response)
+
+        return response
+
+    async def update_repository_variable(self, repo_owner: str, repo_name: str, variable: str, new_value: str) -> HttpResponse:
+        """
+        Awaitable version of GitHubClient.update_repository_variable()
+        """
+        response: HttpResponse = await self._handle_api_request(
+            self._update_repository_variable_request(repo_owner, repo_name, variable, new_value))
+        self._invalidate_repository_variable(repo_owner, repo_name, variable)
+
+        return response
+
+    async def create_repository_variable(self, repo_owner: str, repo_name: str, variable: str, value: str) -> HttpResponse:
+        """
+        Awaitable version of GitHubClient.create_repository_variable()
+        """
+        response: HttpResponse = await self._handle_api_request(
+            self._create_repository_variable_request(repo_owner, repo_name, variable, value))
+        self._invalidate_repository_variable(repo_owner, repo_name, variable)
+
+        return response
+
+    async def iter_repository_variable_pages(self, repo_owner: str, repo_name: str, per_page: int = VARIABLES_PER_PAGE) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Asynchronous iterator version of GitHubClient.iter_repository_variable_pages()
+        """
+        url: Optional[str] = self._get_variables_url(repo_owner, repo_name, per_page)
+        while url:
+            response: HttpResponse = await self._handle_api_request(self._list_repository_variables_request(url))
+            url = self._get_next_page_url(response)
+
+            yield json.loads(response.content)
+
+    async def list_repository_variables(self, repo_owner: str, repo_name: str, per_page: int = VARIABLES_PER_PAGE) -> AsyncIterator[Dict[str, str]]:
+        """
+        Asynchronous iterator version of GitHubClient.list_repository_variables()
+        """
+        async for page in self.iter_repository_variable_pages(repo_owner, repo_name, per_page):
+            for variable in page["variables"]:
+                yield variable
@@ -0,0 +1,139 @@
+import asyncio
+from asyncio import StreamReader, StreamWriter
+from email.message import Message
+import ssl
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import SplitResult, urlsplit
+from src.clients.github._types import HttpResponse, TransportError
+from src.clients.github.constants import IDEMPOTENT_METHODS
+from src.clients.github.http_transport import AsyncHttpTransport
+
+# Responses to these requests never have a body, whatever their headers say
+BODILESS_STATUS_CODES: Tuple[int, ...] = (204, 304)
+
+
+class AsyncioTransport(AsyncHttpTransport):
+    """
+    Sends HTTP/1.1 requests over asyncio streams, so any number of requests can be in flight on one event loop without threads or third-party packages.
+
+    Idle keep-alive connections are pooled per host. If a reused connection turns out to have been closed by the server, the request is resent once on a new connection if its method is in IDEMPOTENT_METHODS.
+    """
+    def __init__(self, pool_maxsize: int):
+        """
+        Arguments:
+
+        pool_maxsize (int) - Number of idle keep-alive connections kept open per host
+        """
+        self.pool_maxsize: int = pool_maxsize
+        self.ssl_context: ssl.SSLContext = ssl.create_default_context()
+        self._pools: Dict[Tuple[str, str], List[Tuple[StreamReader, StreamWriter]]] = {}
+
+    async def _open_connection(self, url: SplitResult, connect_timeout: float) -> Tuple[StreamReader, StreamWriter]:
+        is_https: bool = url.scheme == "https"
+        port: int = url.port or (443 if is_https else 80)
+
+        return await asyncio.wait_for(
+            asyncio.open_connection(url.hostname, port, ssl=self.ssl_context if is_https else None),
+            timeout=connect_timeout
+        )
+
+    async def _read_body(self, reader: StreamReader, status_code: int, headers: Message) -> Tuple[bytes, bool]:
+        """
+        Returns the response body and whether the connection can be reused afterwards.
+        """
+        keep_alive: bool = headers.get("Connection", "").lower() != "close"
+        if status_code in BODILESS_STATUS_CODES:
+            return b"", keep_alive
+
+        if headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks: List[bytes] = []
+            while True:
+                chunk_size: int = int((await reader.readuntil(b"\r\n")).split(b";", 1)[0], 16)
+                if chunk_size == 0:
+                    # Skips trailers up to the final empty line
+                    while await reader.readuntil(b"\r\n") != b"\r\n":
+                        pass
+                    return b"".join(chunks), keep_alive
+                chunks.append(await reader.readexactly(chunk_size))
+                await reader.readexactly(2)
+
+        content_length: Optional[str] = headers.get("Content-Length")
+        if content_length is not None:
+            return await reader.readexactly(int(content_length)), keep_alive
+
+        # Without a length the body ends when the server closes the connection
+        return await reader.read(), False
+
+    async def _send(self, reader: StreamReader, writer: StreamWriter, method: str, url: SplitResult, headers: Dict[str, str], body: Optional[bytes]) -> Tuple[int, str, Message, bytes, bool]:
+        path: str = url.path or "/"
+        if url.query:
+            path += f"?{url.query}"
+        request_lines: List[str] = [f"{method} {path} HTTP/1.1", f"Host: {url.netloc}", f"Content-Length: {len(body or b'')}"]
+        request_lines.extend(f"{header}: {value}" for header, value in headers.items())
+        writer.write(("\r\n".join(request_lines) + "\r\n\r\n").encode("latin-1") + (body or b""))
+        await writer.drain()
+
+        status_line: bytes = await reader.readuntil(b"\r\n")
+        status_parts: List[str] = status_line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+        status_code: int = int(status_parts[1])
+        reason: str = status_parts[2] if len(status_parts) > 2 else ""
+        response_headers: Message = Message()
+        while True:
+            header_line: bytes = await reader.readuntil(b"\r\n")
+            if header_line == b"\r\n":
+                break
+            header, _, value = header_line.decode("latin-1").partition(":")
+            response_headers[header.strip()] = value.strip()
+        content, keep_alive = await self._read_body(reader, status_code, response_headers)
+
+        return status_code, reason, response_headers, content, keep_alive
+
+    async def request(self, method: str, url: str, headers: Dict[str, str], body: Optional[bytes], timeout: Tuple[float, float]) -> HttpResponse:
+        connect_timeout, read_timeout = timeout
+        split_url: SplitResult = urlsplit(url)
+        if split_url.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme '{split_url.scheme}'")
+        pool: List[Tuple[StreamReader, StreamWriter]] = self._pools.setdefault((split_url.scheme, split_url.netloc), [])
+        writer: Optional[StreamWriter] = None
+
+        try:
+            is_reused: bool = bool(pool)
+            reader, writer = pool.pop() if is_reused else await self._open_connection(split_url, connect_timeout)
+            try:
+                status_code, reason, response_headers, content, keep_alive = await asyncio.wait_for(
+                    self._send(reader, writer, method, split_url, headers, body), timeout=read_timeout)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # The server most likely closed the idle connection before the request reached it. It may also have dropped the connection
+                # after receiving the request, so only requests that can safely be sent twice are resent
+                if not is_reused or method not in IDEMPOTENT_METHODS:
+                    raise
+                writer.close()
+                writer = None
+                reader, writer = await self._open_connection(split_url, connect_timeout)
+                status_code, reason, response_headers, content, keep_alive = await asyncio.wait_for(
+                    self._send(reader, writer, method, split_url, headers, body), timeout=read_timeout)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError) as e:
+            if writer is not None:
+                writer.close()
+            if isinstance(e, asyncio.TimeoutError):
+                raise TransportError(f"{method} {url} timed out") from e
+            raise TransportError(f"{method} {url} failed: {e}") from e
+
+        if keep_alive and len(pool) < self.pool_maxsize:
+            pool.append((reader, writer))
+        else:
+            writer.close()
+
+        return HttpResponse(
+            status_code=status_code,
+            reason=reason,
+            headers=response_headers,
+            content=content,
+            url=url
+        )
+
+    async def close(self):
+        for pool in self._pools.values():
+            while pool:
+                _, writer = pool.pop()
+                writer.close()
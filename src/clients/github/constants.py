@@ -1 +1,36 @@
-BASE_URI: str = "https://api.github.com"
+import os
+from typing import FrozenSet
+
+# GitHub Actions sets GITHUB_API_URL, e.g. for GitHub Enterprise Server. It can also point at a local stand-in such as test/stubs/github_api_stub.py
+BASE_URI: str = os.environ.get("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+
+# Seconds to wait for a connection to be established and for a response to be sent, respectively
+CONNECT_TIMEOUT: float = 5.0
+READ_TIMEOUT: float = 30.0
+
+# Repository variables requested per page when listing them. 30 is the most the API returns per page
+VARIABLES_PER_PAGE: int = 30
+
+# Number of keep-alive connections kept open per host
+POOL_MAXSIZE: int = 10
+
+MAX_RETRIES: int = 5
+# Retry delays without server guidance are drawn uniformly from [0, min(MAX_BACKOFF, BACKOFF_FACTOR * 2 ** attempt)]
+BACKOFF_FACTOR: float = 0.5
+MAX_BACKOFF: float = 30.0
+# Requests are not retried if the server asks to wait longer than this many seconds
+MAX_RETRY_WAIT: float = 120.0
+
+# Requests RateLimitGovernor lets through back to back while the shared budget is full
+RATE_LIMIT_BURST: float = 10.0
+# Part of the rate limit budget RateLimitGovernor never spends, e.g. for other steps using the same token
+RATE_LIMIT_RESERVE: int = 10
+
+RETRYABLE_STATUS_CODES: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+# Methods whose requests can safely be sent again after a transport error or a server error. PATCH only ever sets a variable to a given value
+IDEMPOTENT_METHODS: FrozenSet[str] = frozenset({"GET", "PATCH", "PUT", "DELETE"})
+
+# Maximum number of responses kept by ResponseCache before the least recently used ones are evicted
+RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+# Fraction of its maximum number of entries a ResponseCache may grow past before it evicts back down to the maximum, so most writes do not scan the cache directory
+RESPONSE_CACHE_EVICTION_SLACK: float = 0.125
@@ -1,32 +1,127 @@
-from typing import Callable, Dict
-import requests
-from requests import HTTPError, RequestException, Response
-from src.clients.github.constants import BASE_URI
-
-
-class GitHubClient:
-    def __init__(self, github_token: str):
-        self.github_token: str = github_token
-        self.base_uri: str = BASE_URI
-        self.headers: Dict[str, str] = {
-            "Accept": "application/vnd.github+json",
-            "Authorization": f"Bearer {self.github_token}",
-            "X-GitHub-Api-Version": "2022-11-28"
-        }
-
-    def _handle_api_request(self, api_request_method: Callable) -> Response:
-        response: Response = api_request_method()
-
-        if response.status_code >= 400:
-            raise HTTPError(
-                f"{response.status_code} {response.reason}: {response.text}")
-        elif response.status_code >= 300:
-            raise RequestException(
-                f"{response.status_code} {response.reason}: {response.text}")
+import json
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+from src.clients.github._types import ApiRequest, GitHubApiError, HttpResponse, HttpTransportType, TransportError
+from src.clients.github.github_client_base import GitHubClientBase
+from src.clients.github.http_transport import HttpTransport, create_transport
+from src.clients.github.rate_limit_governor import RateLimitGovernor
+from src.clients.github.response_cache import ResponseCache
+from src.tracing.tracer import Tracer
+from src.clients.github.constants import BASE_URI, BACKOFF_FACTOR, CONNECT_TIMEOUT, MAX_BACKOFF, MAX_RETRIES, MAX_RETRY_WAIT, POOL_MAXSIZE, READ_TIMEOUT, VARIABLES_PER_PAGE
+
+
+class GitHubClient(GitHubClientBase):
+    """
+    Calls the GitHub REST API over a persistent connection pool, so consecutive requests reuse the same keep-alive connection.
+
+    Requests are sent through an HttpTransport, by default the `requests` one. See src.clients.github.http_transport
+
+    Requests that fail with a connection error, a 5xx or a rate limit response are retried with exponential backoff and full jitter.
+    When GitHub says how long to wait, via `Retry-After` or `X-RateLimit-Reset`, that delay is used instead.
+    See https://docs.github.com/en/rest/using-the-rest-api/rate-limits-for-the-rest-api
+    If a RateLimitGovernor is given, every attempt first waits for the shared rate limit budget to allow it, and every response reports the remaining budget back.
+
+    If a ResponseCache is given, repository variable GETs are sent with `If-None-Match` and 304 responses are served from the cache.
+    """
+    def __init__(self, github_token: str, connect_timeout: float = CONNECT_TIMEOUT, read_timeout: float = READ_TIMEOUT, max_retries: int = MAX_RETRIES, backoff_factor: float = BACKOFF_FACTOR, max_backoff: float = MAX_BACKOFF, max_retry_wait: float = MAX_RETRY_WAIT, pool_maxsize: int = POOL_MAXSIZE, cache: Optional[ResponseCache] = None, base_uri: str = BASE_URI, transport: Optional[HttpTransport] = None, tracer: Optional[Tracer] = None, rate_limit_governor: Optional[RateLimitGovernor] = None):
+        """
+        Arguments:
 
-        return response
+        github_token (str) - Token used to authenticate with the GitHub API
+
+        connect_timeout (float) - Seconds to wait for a connection to be established
+
+        read_timeout (float) - Seconds to wait for the server to send a response
+
+        max_retries (int) - Number of times a failed request is retried before giving up
+
+        backoff_factor (float) - Base delay in seconds for exponential backoff between retries
+
+        max_backoff (float) - Upper bound in seconds for a single backoff delay
+
+        max_retry_wait (float) - Requests are not retried if GitHub asks to wait longer than this many seconds
+
+        pool_maxsize (int) - Number of keep-alive connections kept open to the API host, i.e. how many requests can be in flight at once without opening new connections
+
+        cache (Optional[ResponseCache]) - On-disk cache of ETags and bodies used to make GET requests conditional
+
+        base_uri (str) - Root URL of the REST API, without a trailing slash
+
+        transport (Optional[HttpTransport]) - Sends the HTTP requests. Defaults to a RequestsTransport with `pool_maxsize` connections
+
+        tracer (Optional[Tracer]) - Records a `github.request` span per API call, including retries and the seconds spent waiting for rate limit budget
 
-    def get_repository_variable(self, repo_owner: str, repo_name: str, variable: str) -> Response:
+        rate_limit_governor (Optional[RateLimitGovernor]) - Paces requests against a rate limit budget shared with other clients and processes
+        """
+        super().__init__(
+            github_token=github_token,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            max_retries=max_retries,
+            backoff_factor=backoff_factor,
+            max_backoff=max_backoff,
+            max_retry_wait=max_retry_wait,
+            cache=cache,
+            base_uri=base_uri,
+            tracer=tracer,
+            rate_limit_governor=rate_limit_governor
+        )
+        self._sleep: Callable[[float], None] = time.sleep
+        self.transport: HttpTransport = transport or create_transport(HttpTransportType.REQUESTS, pool_maxsize)
+
+    def close(self):
+        self.transport.close()
+
+    def _wait_for_rate_limit_budget(self) -> float:
+        """
+        Waits until the rate limit budget allows a request and returns how many seconds that took.
+        """
+        waited: float = 0.0
+        while True:
+            delay: float = self.rate_limit_governor.try_acquire()
+            if delay <= 0:
+                break
+            self._sleep(delay)
+            waited += delay
+
+        return waited
+
+    def _handle_api_request(self, request: ApiRequest) -> HttpResponse:
+        attempt: int = 0
+        with self.tracer.span("github.request", operation=request.operation) as attributes:
+            rate_limit_wait: float = 0.0
+            while True:
+                if self.rate_limit_governor:
+                    rate_limit_wait += self._wait_for_rate_limit_budget()
+                    attributes["rate_limit_wait"] = round(rate_limit_wait, 3)
+                try:
+                    response: HttpResponse = self._receive_response(request, self.transport.request(
+                        method=request.method,
+                        url=request.url,
+                        headers=request.headers,
+                        body=request.body,
+                        timeout=self.timeout
+                    ))
+                except TransportError:
+                    retry_delay: Optional[float] = self._get_next_retry_delay(request, attempt, None)
+                    if retry_delay is None:
+                        attributes["retries"] = attempt
+                        raise
+                    self._sleep(retry_delay)
+                    attempt += 1
+                    continue
+
+                retry_delay = self._get_next_retry_delay(request, attempt, response)
+                if retry_delay is None:
+                    break
+                self._sleep(retry_delay)
+                attempt += 1
+            attributes["status_code"] = response.status_code
+            attributes["retries"] = attempt
+
+        return self._check_response(response)
+
+    def get_repository_variable(self, repo_owner: str, repo_name: str, variable: str, etag: Optional[str] = None) -> HttpResponse:
         """
         Retrieves the value of a specified GitHub Actions repository variable for a specified repository. See https://docs.github.com/en/rest/actions/variables?apiVersion=2022-11-28#get-a-repository-variable
 
@@ -37,24 +132,25 @@ class GitHubClient:
         
         repo_owner (str) - GitHub username of the account that owns the repo
 
+        etag (Optional[str]) - ETag of a previous response. If the variable has not changed since, the 304 Not Modified response is returned instead of raising. The response cache is bypassed
+
         Returns:
         
-        response (Response) - A requests.Response object containing JSON body in Response.content byte string
+        response (HttpResponse) - A src.clients.github._types.HttpResponse object containing JSON body in HttpResponse.content byte string
         """
-        def _get_repository_variable() -> Response:
-            response: Response = requests.get(
-                url=f"{self.base_uri}/repos/{repo_owner}/{repo_name}/actions/variables/{variable}",
-                headers=self.headers
-            )
-
-            return response
-
-        response: Response = self._handle_api_request(
-            _get_repository_variable)
+        request: ApiRequest = self._get_repository_variable_request(repo_owner, repo_name, variable, etag)
+        try:
+            response: HttpResponse = self._handle_api_request(request)
+        except GitHubApiError as e:
+            not_modified_response: Optional[HttpResponse] = self._get_not_modified_response(etag, e)
+            if not_modified_response is None:
+                raise
+            return not_modified_response
+        self._cache_repository_variable(repo_owner, repo_name, variable, request, response)
 
         return response
 
-    def update_repository_variable(self, repo_owner: str, repo_name: str, variable: str, new_value: str) -> Response:
+    def update_repository_variable(self, repo_owner: str, repo_name: str, variable: str, new_value: str) -> HttpResponse:
         """
         Changes the value of a specified GitHub Actions repository variable for a specified repository. See https://docs.github.com/en/rest/actions/variables?apiVersion=2022-11-28#update-a-repository-variable
 
@@ -70,21 +166,76 @@ class GitHubClient:
 
         Returns:
         
-        response (Response) - A requests.Response object. This call does not return data in response body.
+        response (HttpResponse) - A src.clients.github._types.HttpResponse object. This call does not return data in response body.
         """
-        def _update_repository_variable() -> Response:
-            response: Response = requests.patch(
-                url=f"{self.base_uri}/repos/{repo_owner}/{repo_name}/actions/variables/{variable}",
-                headers=self.headers,
-                json={
-                    "name": variable,
-                    "value": new_value
-                }
-            )
+        response: HttpResponse = self._handle_api_request(
+            self._update_repository_variable_request(repo_owner, repo_name, variable, new_value))
+        self._invalidate_repository_variable(repo_owner, repo_name, variable)
+
+        return response
+
+    def create_repository_variable(self, repo_owner: str, repo_name: str, variable: str, value: str) -> HttpResponse:
+        """
+        Creates a GitHub Actions repository variable for a specified repository. See https://docs.github.com/en/rest/actions/variables?apiVersion=2022-11-28#create-a-repository-variable
+
+        Unlike the other calls it is not retried after a transport error or a server error, which may come after the variable was created.
+
+        Arguments:
 
-            return response
+        variable (str) - Name of the new GitHub repository variable
 
-        response: Response = self._handle_api_request(
-            _update_repository_variable)
+        value (str) - The value of the new repository variable
+        
+        repo_name (str) - GitHub repo to which the variable will belong
+        
+        repo_owner (str) - GitHub username of the account that owns the repo
+
+        Returns:
+        
+        response (HttpResponse) - A src.clients.github._types.HttpResponse object. This call does not return data in response body.
+        """
+        response: HttpResponse = self._handle_api_request(
+            self._create_repository_variable_request(repo_owner, repo_name, variable, value))
+        self._invalidate_repository_variable(repo_owner, repo_name, variable)
 
         return response
+
+    def iter_repository_variable_pages(self, repo_owner: str, repo_name: str, per_page: int = VARIABLES_PER_PAGE) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily lists the GitHub Actions repository variables of a specified repository, one page per request. See https://docs.github.com/en/rest/actions/variables?apiVersion=2022-11-28#list-repository-variables
+
+        The next page is only requested once the previous one has been consumed, so callers that stop early save the remaining requests.
+
+        Arguments:
+
+        repo_name (str) - GitHub repo whose variables will be listed
+
+        repo_owner (str) - GitHub username of the account that owns the repo
+
+        per_page (int) - Number of variables requested per page, at most 30
+
+        Returns:
+
+        pages (Iterator[Dict[str, Any]]) - The JSON body of each page, with the total number of variables under `total_count` and the page's variables under `variables`
+        """
+        url: Optional[str] = self._get_variables_url(repo_owner, repo_name, per_page)
+        while url:
+            response: HttpResponse = self._handle_api_request(self._list_repository_variables_request(url))
+            url = self._get_next_page_url(response)
+
+            yield json.loads(response.content)
+
+    def list_repository_variables(self, repo_owner: str, repo_name: str, per_page: int = VARIABLES_PER_PAGE) -> Iterator[Dict[str, str]]:
+        """
+        Lazily lists the GitHub Actions repository variables of a specified repository, as iter_repository_variable_pages() does, one variable at a time.
+
+        Returns:
+
+        variables (Iterator[Dict[str, str]]) - Each variable as returned by the API, e.g. {"name": "VERSION", "value": "1.0.0", ...}
+        """
+        pages: Iterator[Dict[str, Any]] = self.iter_repository_variable_pages(repo_owner, repo_name, per_page)
+        try:
+            for page in pages:
+                yield from page["variables"]
+        finally:
+            pages.close()
@@ -0,0 +1,234 @@
+from email.message import Message
+from email.utils import parsedate_to_datetime
+import json
+import random
+import re
+import time
+from typing import Dict, Optional, Tuple
+from src.clients.github._types import ApiRequest, CachedResponse, GitHubApiError, HTTPError, HttpResponse
+from src.clients.github.rate_limit_governor import RateLimitGovernor
+from src.clients.github.response_cache import ResponseCache
+from src.tracing.tracer import NULL_TRACER, Tracer
+from src.clients.github.constants import BASE_URI, BACKOFF_FACTOR, CONNECT_TIMEOUT, IDEMPOTENT_METHODS, MAX_BACKOFF, MAX_RETRIES, MAX_RETRY_WAIT, READ_TIMEOUT, RETRYABLE_STATUS_CODES
+
+# Matches the URL of the next page in a `Link` header, see https://docs.github.com/en/rest/using-the-rest-api/using-pagination-in-the-rest-api
+NEXT_PAGE_LINK_PATTERN: re.Pattern = re.compile(r'<([^>]+)>;\s*rel="next"')
+
+
+class GitHubClientBase:
+    """
+    Everything GitHubClient and AsyncGitHubClient share that does not depend on how requests are sent: building the API requests,
+    deciding whether and when to retry them, interpreting their responses and keeping the response cache up to date.
+
+    It has no public API of its own, so each client defines its API methods in its own calling convention, blocking or awaitable.
+    """
+    def __init__(self, github_token: str, connect_timeout: float = CONNECT_TIMEOUT, read_timeout: float = READ_TIMEOUT, max_retries: int = MAX_RETRIES, backoff_factor: float = BACKOFF_FACTOR, max_backoff: float = MAX_BACKOFF, max_retry_wait: float = MAX_RETRY_WAIT, cache: Optional[ResponseCache] = None, base_uri: str = BASE_URI, tracer: Optional[Tracer] = None, rate_limit_governor: Optional[RateLimitGovernor] = None):
+        """
+        Arguments:
+
+        See GitHubClient
+        """
+        self.github_token: str = github_token
+        self.base_uri: str = base_uri
+        self.headers: Dict[str, str] = {
+            "Accept": "application/vnd.github+json",
+            "Authorization": f"Bearer {self.github_token}",
+            "X-GitHub-Api-Version": "2022-11-28"
+        }
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        self.max_retries: int = max_retries
+        self.backoff_factor: float = backoff_factor
+        self.max_backoff: float = max_backoff
+        self.max_retry_wait: float = max_retry_wait
+        self.cache: Optional[ResponseCache] = cache
+        self.tracer: Tracer = tracer or NULL_TRACER
+        self.rate_limit_governor: Optional[RateLimitGovernor] = rate_limit_governor
+
+    def _get_backoff_delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * 2 ** attempt))
+
+    def _get_retry_delay(self, response: HttpResponse, attempt: int) -> Optional[float]:
+        """
+        Returns how many seconds to wait before retrying `response`'s request, or None if it should not be retried.
+        """
+        retry_after: Optional[str] = response.headers.get("Retry-After")
+        rate_limit_remaining: Optional[str] = response.headers.get("X-RateLimit-Remaining")
+        rate_limit_reset: Optional[str] = response.headers.get("X-RateLimit-Reset")
+        is_rate_limited: bool = response.status_code in (403, 429) and (retry_after is not None or rate_limit_remaining == "0")
+
+        if response.status_code not in RETRYABLE_STATUS_CODES and not is_rate_limited:
+            return None
+
+        delay: float
+        if retry_after is not None:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                # Retry-After may also be an HTTP date
+                try:
+                    delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                except (TypeError, ValueError):
+                    delay = self._get_backoff_delay(attempt)
+        elif rate_limit_remaining == "0" and rate_limit_reset is not None:
+            delay = float(rate_limit_reset) - time.time() + 1
+        else:
+            delay = self._get_backoff_delay(attempt)
+
+        if delay > self.max_retry_wait:
+            return None
+
+        return max(delay, 0)
+
+    def _get_next_retry_delay(self, request: ApiRequest, attempt: int, response: Optional[HttpResponse]) -> Optional[float]:
+        """
+        Returns how long to wait before retrying `request` after `response`, or None if it is final.
+
+        A missing `response` means the transport failed to get one, which is retried until `max_retries` is reached and then re-raised by the caller.
+        Requests that are not idempotent, like creating a variable, are only retried when rate limited, since after a transport error or a server error
+        they may have taken effect, and repeating them would fail with a conflict or act twice.
+        """
+        if attempt >= self.max_retries:
+            return None
+        if request.method not in IDEMPOTENT_METHODS and (response is None or response.status_code >= 500):
+            return None
+        if response is None:
+            return self._get_backoff_delay(attempt)
+
+        return self._get_retry_delay(response, attempt)
+
+    def _create_cached_response(self, not_modified_response: HttpResponse, cached_response: CachedResponse) -> HttpResponse:
+        """
+        Turns a 304 Not Modified response into a 200 response carrying the cached body.
+        """
+        headers: Message = Message()
+        for header, value in not_modified_response.headers.items():
+            if header.lower() != "etag":
+                headers[header] = value
+        headers["ETag"] = cached_response.etag
+
+        return HttpResponse(
+            status_code=200,
+            reason="OK",
+            headers=headers,
+            content=cached_response.content,
+            url=not_modified_response.url
+        )
+
+    def _receive_response(self, request: ApiRequest, response: HttpResponse) -> HttpResponse:
+        """
+        Reports the rate limit budget of `response` to the governor, and answers a 304 to a cached request from the cache.
+        """
+        if self.rate_limit_governor:
+            self.rate_limit_governor.update(response.headers)
+        if response.status_code == 304 and request.cached_response:
+            return self._create_cached_response(response, request.cached_response)
+
+        return response
+
+    def _check_response(self, response: HttpResponse) -> HttpResponse:
+        if response.status_code >= 400:
+            raise HTTPError(
+                f"{response.status_code} {response.reason}: {response.text}", response)
+        elif response.status_code >= 300:
+            raise GitHubApiError(
+                f"{response.status_code} {response.reason}: {response.text}", response)
+
+        return response
+
+    def _get_variable_url(self, repo_owner: str, repo_name: str, variable: str) -> str:
+        return f"{self.base_uri}/repos/{repo_owner}/{repo_name}/actions/variables/{variable}"
+
+    def _get_variables_url(self, repo_owner: str, repo_name: str, per_page: int) -> str:
+        return f"{self.base_uri}/repos/{repo_owner}/{repo_name}/actions/variables?per_page={per_page}"
+
+    def _get_next_page_url(self, response: HttpResponse) -> Optional[str]:
+        match: Optional[re.Match] = NEXT_PAGE_LINK_PATTERN.search(response.headers.get("Link") or "")
+
+        return match.group(1) if match else None
+
+    def _get_cache_key(self, repo_owner: str, repo_name: str, variable: str) -> str:
+        # Includes the API host, so e.g. a GitHub Enterprise Server and github.com never share entries
+        return f"{self.base_uri}/repos/{repo_owner}/{repo_name}/actions/variables/{variable}"
+
+    def _get_request_headers(self, headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        return {**self.headers, **headers} if headers else self.headers
+
+    def _get_json_body(self, body: Dict) -> Tuple[Dict[str, str], bytes]:
+        return {"Content-Type": "application/json"}, json.dumps(body).encode("utf-8")
+
+    def _get_if_none_match_headers(self, etag: Optional[str], cached_response: Optional[CachedResponse]) -> Optional[Dict[str, str]]:
+        if etag:
+            return {"If-None-Match": etag}
+        if cached_response:
+            return {"If-None-Match": cached_response.etag}
+
+        return None
+
+    def _get_repository_variable_request(self, repo_owner: str, repo_name: str, variable: str, etag: Optional[str]) -> ApiRequest:
+        # A caller-supplied ETag bypasses the cache, so the caller sees the 304
+        cached_response: Optional[CachedResponse] = self.cache.get(self._get_cache_key(repo_owner, repo_name, variable)) if self.cache and not etag else None
+
+        return ApiRequest(
+            operation="get_repository_variable",
+            method="GET",
+            url=self._get_variable_url(repo_owner, repo_name, variable),
+            headers=self._get_request_headers(self._get_if_none_match_headers(etag, cached_response)),
+            cached_response=cached_response
+        )
+
+    def _update_repository_variable_request(self, repo_owner: str, repo_name: str, variable: str, new_value: str) -> ApiRequest:
+        json_headers, body = self._get_json_body({
+            "name": variable,
+            "value": new_value
+        })
+
+        return ApiRequest(
+            operation="update_repository_variable",
+            method="PATCH",
+            url=self._get_variable_url(repo_owner, repo_name, variable),
+            headers=self._get_request_headers(json_headers),
+            body=body
+        )
+
+    def _create_repository_variable_request(self, repo_owner: str, repo_name: str, variable: str, value: str) -> ApiRequest:
+        json_headers, body = self._get_json_body({
+            "name": variable,
+            "value": value
+        })
+
+        return ApiRequest(
+            operation="create_repository_variable",
+            method="POST",
+            url=f"{self.base_uri}/repos/{repo_owner}/{repo_name}/actions/variables",
+            headers=self._get_request_headers(json_headers),
+            body=body
+        )
+
+    def _list_repository_variables_request(self, page_url: str) -> ApiRequest:
+        return ApiRequest(
+            operation="list_repository_variables",
+            method="GET",
+            url=page_url,
+            headers=self._get_request_headers()
+        )
+
+    def _get_not_modified_response(self, etag: Optional[str], error: GitHubApiError) -> Optional[HttpResponse]:
+        """
+        Returns the 304 response `error` was raised for if the caller asked for it by passing its own `etag`, otherwise None.
+        """
+        if etag and error.response is not None and error.response.status_code == 304:
+            return error.response
+
+        return None
+
+    def _cache_repository_variable(self, repo_owner: str, repo_name: str, variable: str, request: ApiRequest, response: HttpResponse):
+        """
+        Stores the variable `response` carries, unless the cache already holds it under the same ETag.
+        """
+        etag: Optional[str] = response.headers.get("ETag")
+        if self.cache and etag and not (request.cached_response and request.cached_response.etag == etag):
+            self.cache.put(self._get_cache_key(repo_owner, repo_name, variable), etag, response.content)
+
+    def _invalidate_repository_variable(self, repo_owner: str, repo_name: str, variable: str):
+        if self.cache:
+            self.cache.invalidate(self._get_cache_key(repo_owner, repo_name, variable))
@@ -0,0 +1,108 @@
+from http.client import HTTPConnection, HTTPException, HTTPResponse, HTTPSConnection
+import queue
+import socket
+import ssl
+from typing import Dict, Optional, Tuple
+from urllib.parse import SplitResult, urlsplit
+from src.clients.github._types import HttpResponse, TransportError
+from src.clients.github.constants import IDEMPOTENT_METHODS
+from src.clients.github.http_transport import HttpTransport
+
+
+class HttpClientTransport(HttpTransport):
+    """
+    Sends requests with the standard library's http.client, so no third-party packages have to be imported.
+
+    Idle keep-alive connections are pooled per host and reused by later requests from any thread.
+    If a reused connection turns out to have been closed by the server, the request is resent once on a new connection if its method is in IDEMPOTENT_METHODS.
+    """
+    def __init__(self, pool_maxsize: int):
+        """
+        Arguments:
+
+        pool_maxsize (int) - Number of idle keep-alive connections kept open per host
+        """
+        self.pool_maxsize: int = pool_maxsize
+        self.ssl_context: ssl.SSLContext = ssl.create_default_context()
+        self._pools: Dict[Tuple[str, str], queue.LifoQueue] = {}
+
+    def _get_pool(self, scheme: str, netloc: str) -> queue.LifoQueue:
+        # setdefault is atomic, so concurrent first requests to a host end up with the same pool
+        return self._pools.setdefault((scheme, netloc), queue.LifoQueue(maxsize=self.pool_maxsize))
+
+    def _create_connection(self, url: SplitResult, connect_timeout: float) -> HTTPConnection:
+        if url.scheme == "https":
+            return HTTPSConnection(url.netloc, timeout=connect_timeout, context=self.ssl_context)
+        elif url.scheme == "http":
+            return HTTPConnection(url.netloc, timeout=connect_timeout)
+
+        raise ValueError(f"Unsupported URL scheme '{url.scheme}'")
+
+    def _release_connection(self, pool: queue.LifoQueue, connection: HTTPConnection):
+        try:
+            pool.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def _send(self, connection: HTTPConnection, method: str, path: str, headers: Dict[str, str], body: Optional[bytes], read_timeout: float) -> HTTPResponse:
+        if connection.sock is None:
+            connection.connect()
+        # The connection timeout only applies to connecting. Reads wait up to read_timeout
+        connection.sock.settimeout(read_timeout)
+        connection.request(method, path, body=body, headers=headers)
+
+        return connection.getresponse()
+
+    def request(self, method: str, url: str, headers: Dict[str, str], body: Optional[bytes], timeout: Tuple[float, float]) -> HttpResponse:
+        connect_timeout, read_timeout = timeout
+        split_url: SplitResult = urlsplit(url)
+        path: str = split_url.path or "/"
+        if split_url.query:
+            path += f"?{split_url.query}"
+        pool: queue.LifoQueue = self._get_pool(split_url.scheme, split_url.netloc)
+
+        try:
+            connection: HTTPConnection = pool.get_nowait()
+            is_reused: bool = True
+        except queue.Empty:
+            connection = self._create_connection(split_url, connect_timeout)
+            is_reused = False
+
+        try:
+            try:
+                response: HTTPResponse = self._send(connection, method, path, headers, body, read_timeout)
+            except (ConnectionError, HTTPException):
+                # The server most likely closed the idle connection before the request reached it. It may also have dropped the connection
+                # after receiving the request, so only requests that can safely be sent twice are resent
+                if not is_reused or method not in IDEMPOTENT_METHODS:
+                    raise
+                connection.close()
+                connection = self._create_connection(split_url, connect_timeout)
+                response = self._send(connection, method, path, headers, body, read_timeout)
+            content: bytes = response.read()
+        except (OSError, HTTPException) as e:
+            connection.close()
+            if isinstance(e, socket.timeout):
+                raise TransportError(f"{method} {url} timed out") from e
+            raise TransportError(f"{method} {url} failed: {e}") from e
+
+        if response.will_close:
+            connection.close()
+        else:
+            self._release_connection(pool, connection)
+
+        return HttpResponse(
+            status_code=response.status,
+            reason=response.reason,
+            headers=response.headers,
+            content=content,
+            url=url
+        )
+
+    def close(self):
+        for pool in self._pools.values():
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
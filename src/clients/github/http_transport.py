@@ -0,0 +1,58 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple
+from src.clients.github._types import HttpResponse, HttpTransportType
+
+
+class HttpTransport(ABC):
+    """
+    Sends HTTP requests for GitHubClient over reusable connections.
+
+    Implementations read the whole response body, and raise src.clients.github._types.TransportError when no response is received.
+    Status codes are not interpreted, since retries and error handling are left to GitHubClient.
+    """
+    @abstractmethod
+    def request(self, method: str, url: str, headers: Dict[str, str], body: Optional[bytes], timeout: Tuple[float, float]) -> HttpResponse:
+        """
+        Sends a request and returns its response.
+
+        `timeout` holds the seconds to wait for a connection and for the response, respectively.
+        """
+
+    def close(self):
+        """
+        Closes any pooled connections.
+        """
+
+
+class AsyncHttpTransport(ABC):
+    """
+    The awaitable counterpart of HttpTransport, used by AsyncGitHubClient so many requests can be in flight on one event loop.
+    """
+    @abstractmethod
+    async def request(self, method: str, url: str, headers: Dict[str, str], body: Optional[bytes], timeout: Tuple[float, float]) -> HttpResponse:
+        """
+        Sends a request and returns its response.
+
+        `timeout` holds the seconds to wait for a connection and for the response, respectively.
+        """
+
+    async def close(self):
+        """
+        Closes any pooled connections.
+        """
+
+
+def create_transport(transport_type: HttpTransportType, pool_maxsize: int) -> HttpTransport:
+    """
+    Returns a new transport of `transport_type` that keeps up to `pool_maxsize` idle connections per host.
+
+    Transports are imported on demand, so the `requests` package is only loaded if its transport is used.
+    """
+    if transport_type == HttpTransportType.HTTP_CLIENT:
+        from src.clients.github.http_client_transport import HttpClientTransport
+        return HttpClientTransport(pool_maxsize=pool_maxsize)
+    elif transport_type == HttpTransportType.REQUESTS:
+        from src.clients.github.requests_transport import RequestsTransport
+        return RequestsTransport(pool_maxsize=pool_maxsize)
+
+    raise ValueError(f"Unknown HTTP transport '{transport_type}'")
@@ -0,0 +1,113 @@
+import fcntl
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Mapping, Optional
+from src.clients.github.constants import MAX_RETRY_WAIT, RATE_LIMIT_BURST, RATE_LIMIT_RESERVE
+
+
+class RateLimitGovernor:
+    """
+    Paces API requests against the rate limit budget GitHub reports, so that many clients sharing a token slow down smoothly instead of running into 403/429 responses.
+
+    It is a token bucket whose refill rate is the remaining budget, per `X-RateLimit-Remaining`, spread evenly over the time until the window resets, per `X-RateLimit-Reset`.
+    Up to `burst` requests may be sent back to back. Every granted request is deducted from the remaining budget, so the rate adapts as the budget is spent.
+    See https://docs.github.com/en/rest/using-the-rest-api/rate-limits-for-the-rest-api#checking-the-status-of-your-rate-limit
+
+    The bucket is stored as JSON in `state_path` and every update holds an exclusive `flock` on it, so all clients and processes on a host that use the same file
+    share one budget. Locks are held per open file, so threads of one process exclude each other as well. Until a response has reported the budget, and after the
+    window has reset, requests are not delayed.
+    """
+    def __init__(self, state_path: str, burst: float = RATE_LIMIT_BURST, reserve: int = RATE_LIMIT_RESERVE, max_wait: float = MAX_RETRY_WAIT):
+        """
+        Arguments:
+
+        state_path (str) - File storing the shared bucket. Created if it does not exist
+
+        burst (float) - Number of requests that may be sent back to back while the bucket is full
+
+        reserve (int) - Part of the budget that is never spent, e.g. left for other tools using the same token
+
+        max_wait (float) - Requests are sent without waiting if the budget would only allow them in more than this many seconds, e.g. when it is exhausted until the reset
+        """
+        self.state_path: str = state_path
+        self.burst: float = burst
+        self.reserve: int = reserve
+        self.max_wait: float = max_wait
+        self._clock: Callable[[], float] = time.time
+        state_dir: str = os.path.dirname(os.path.abspath(state_path))
+        os.makedirs(state_dir, exist_ok=True)
+
+    def _update_state(self, update: Callable[[Optional[Dict[str, Any]]], Optional[Dict[str, Any]]]):
+        """
+        Calls `update` with the stored state, or None if there is none, and stores the state it returns, all while holding the lock.
+        """
+        with open(file=self.state_path, mode="a+") as state_file:
+            fcntl.flock(state_file, fcntl.LOCK_EX)
+            try:
+                state_file.seek(0)
+                try:
+                    state: Optional[Dict[str, Any]] = json.loads(state_file.read() or "null")
+                except ValueError:
+                    state = None
+                new_state: Optional[Dict[str, Any]] = update(state)
+                if new_state is not None:
+                    state_file.seek(0)
+                    state_file.truncate()
+                    json.dump(new_state, state_file)
+                    state_file.flush()
+            finally:
+                fcntl.flock(state_file, fcntl.LOCK_UN)
+
+    def try_acquire(self) -> float:
+        """
+        Takes one request from the budget and returns 0, or returns how many seconds to wait before trying again if the budget does not allow a request yet.
+        """
+        delay: float = 0.0
+
+        def _take(state: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+            nonlocal delay
+            now: float = self._clock()
+            if not state or now >= state["reset"]:
+                return None
+
+            budget: float = state["remaining"] - self.reserve
+            if budget < 1:
+                delay = state["reset"] - now
+            else:
+                rate: float = budget / (state["reset"] - now)
+                tokens: float = min(self.burst, state["tokens"] + rate * max(now - state["updated"], 0))
+                if tokens >= 1:
+                    return {**state, "remaining": state["remaining"] - 1, "tokens": tokens - 1, "updated": now}
+                delay = (1 - tokens) / rate
+            if delay > self.max_wait:
+                # Waiting this long would only postpone the failure, see GitHubClient.max_retry_wait
+                delay = 0.0
+
+            return None
+
+        self._update_state(_take)
+
+        return delay
+
+    def update(self, headers: Mapping[str, str]):
+        """
+        Feeds the rate limit headers of a response into the bucket.
+
+        Responses to requests that were in flight at the same time arrive in any order, so within a window the lowest reported budget is kept.
+        """
+        try:
+            remaining: int = int(headers["X-RateLimit-Remaining"])
+            reset: float = float(headers["X-RateLimit-Reset"])
+        except (KeyError, TypeError, ValueError):
+            return
+
+        def _report(state: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+            if state and state["reset"] == reset:
+                return {**state, "remaining": min(state["remaining"], remaining)}
+            if state and state["reset"] > reset:
+                return None
+
+            return {"remaining": remaining, "reset": reset, "tokens": self.burst, "updated": self._clock()}
+
+        self._update_state(_report)
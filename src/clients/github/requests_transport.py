@@ -0,0 +1,73 @@
+from email.message import Message
+import threading
+from typing import Any, Dict, Optional, Tuple
+from src.clients.github._types import HttpResponse, TransportError
+from src.clients.github.http_transport import HttpTransport
+
+
+class RequestsTransport(HttpTransport):
+    """
+    Sends requests over a persistent `requests` session, so consecutive requests reuse the same keep-alive connection.
+
+    Importing `requests` takes longer than starting the rest of the action, so it is only imported, and the session created, when the first request is sent.
+    """
+    def __init__(self, pool_maxsize: int):
+        """
+        Arguments:
+
+        pool_maxsize (int) - Number of keep-alive connections kept open per host
+        """
+        self.pool_maxsize: int = pool_maxsize
+        # A requests.Session, see the session property
+        self._session: Optional[Any] = None
+        # Threads sharing the transport, e.g. in batch mode, must not each create a session of their own
+        self._session_lock: threading.Lock = threading.Lock()
+
+    @property
+    def session(self) -> Any:
+        if self._session is not None:
+            return self._session
+
+        with self._session_lock:
+            if self._session is not None:
+                return self._session
+            import requests
+            from requests.adapters import HTTPAdapter
+            session: requests.Session = requests.Session()
+            # Retries are handled by GitHubClient, so they can take GitHub's rate limit headers into account
+            adapter: HTTPAdapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._session = session
+
+        return self._session
+
+    def request(self, method: str, url: str, headers: Dict[str, str], body: Optional[bytes], timeout: Tuple[float, float]) -> HttpResponse:
+        session: Any = self.session
+        import requests
+        try:
+            response: requests.Response = session.request(method=method, url=url, headers=headers, data=body, timeout=timeout)
+        except (requests.exceptions.InvalidURL, requests.exceptions.InvalidSchema, requests.exceptions.MissingSchema, requests.exceptions.InvalidHeader):
+            # Malformed requests fail the same way on every attempt
+            raise
+        except requests.RequestException as e:
+            # Including responses broken off mid-body, e.g. requests.exceptions.ChunkedEncodingError
+            raise TransportError(f"{method} {url} failed: {e}") from e
+
+        response_headers: Message = Message()
+        for header, value in response.headers.items():
+            response_headers[header] = value
+
+        return HttpResponse(
+            status_code=response.status_code,
+            reason=response.reason or "",
+            headers=response_headers,
+            content=response.content,
+            url=url
+        )
+
+    def close(self):
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+            self._session = None
@@ -0,0 +1,90 @@
+import hashlib
+import json
+import os
+import tempfile
+from typing import List, Optional
+from src.clients.github._types import CachedResponse
+from src.clients.github.constants import RESPONSE_CACHE_EVICTION_SLACK, RESPONSE_CACHE_MAX_ENTRIES
+
+
+class ResponseCache:
+    """
+    Stores GET response bodies on disk together with their ETags, so repeat requests can be made conditional with `If-None-Match`.
+
+    Each entry is a small JSON file named after a hash of its key. File modification times track recency: reading an entry touches it,
+    and once the number of entries exceeds `max_entries` by RESPONSE_CACHE_EVICTION_SLACK the least recently used ones are deleted down to `max_entries`.
+    The number of entries is counted once and then tracked as this instance adds and removes them, so the directory is only scanned when evicting.
+    The directory is self-contained, so it can be persisted between workflow runs, e.g. with actions/cache.
+    See https://docs.github.com/en/rest/using-the-rest-api/best-practices-for-using-the-rest-api#use-conditional-requests-if-appropriate
+    """
+    def __init__(self, cache_dir: str, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        """
+        Arguments:
+
+        cache_dir (str) - Directory where entries are stored. Created if it does not exist
+
+        max_entries (int) - Maximum number of entries kept before the least recently used ones are evicted
+        """
+        self.cache_dir: str = cache_dir
+        self.max_entries: int = max_entries
+        self.high_water_mark: int = max_entries + int(max_entries * RESPONSE_CACHE_EVICTION_SLACK)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._entry_count: int = len(self._list_entry_paths())
+
+    def _list_entry_paths(self) -> List[str]:
+        return [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir) if name.endswith(".json")]
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        path: str = self._get_path(key)
+        try:
+            with open(file=path, mode="r") as entry_file:
+                entry: dict = json.load(entry_file)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+
+        return CachedResponse(etag=entry["etag"], content=entry["content"].encode("utf-8"))
+
+    def put(self, key: str, etag: str, content: bytes):
+        # Written to a temporary file first, so concurrent readers never see a partial entry
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(file_descriptor, mode="w") as temp_file:
+            json.dump({"key": key, "etag": etag, "content": content.decode("utf-8")}, temp_file)
+        path: str = self._get_path(key)
+        if not os.path.exists(path):
+            self._entry_count += 1
+        os.replace(temp_path, path)
+
+        if self._entry_count > self.high_water_mark:
+            self._evict()
+
+    def invalidate(self, key: str):
+        try:
+            os.remove(self._get_path(key))
+            self._entry_count -= 1
+        except FileNotFoundError:
+            pass
+
+    def _get_last_used(self, path: str) -> int:
+        try:
+            return os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def _evict(self):
+        # Other processes sharing the directory may have added or removed entries, so they are counted again
+        entry_paths: List[str] = self._list_entry_paths()
+        self._entry_count = len(entry_paths)
+        if self._entry_count <= self.max_entries:
+            return
+
+        entry_paths.sort(key=self._get_last_used)
+        for path in entry_paths[:len(entry_paths) - self.max_entries]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self._entry_count = self.max_entries
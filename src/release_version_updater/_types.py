@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Dict
+from typing import Dict, NamedTuple, Optional
 
 
 class CommitMessagePrefix(str, Enum):
@@ -17,6 +17,19 @@ class CommitMessagePrefix(str, Enum):
     PERFORMANCE = "performance"
 
 
+class VersionSource(str, Enum):
+    """
+    Where the current release version is read from.
+
+    The repository variable is read through the GitHub API.
+
+    Tags are read from the local checkout: the highest version among the tags on the nearest tagged commits reachable from the analyzed ref, one per merged branch.
+    The repository variable is still read, and the higher of the two versions is incremented, so a stale tag can never lower the variable.
+    """
+    VARIABLE = "variable"
+    TAGS = "tags"
+
+
 class CommitType(str, Enum):
     """
     Commits that break backwards compatibility are a major change.
@@ -42,3 +55,66 @@ MESSAGE_PREFIX_TO_COMMIT_TYPE: Dict[CommitMessagePrefix, CommitType] = {
     CommitMessagePrefix.PERFORMANCE: CommitType.PATCH,
     CommitMessagePrefix.PERF: CommitType.PATCH
 }
+
+
+# Higher values take precedence when several commits are analyzed together
+COMMIT_TYPE_PRECEDENCE: Dict[CommitType, int] = {
+    CommitType.OTHER: 0,
+    CommitType.PATCH: 1,
+    CommitType.MINOR: 2,
+    CommitType.MAJOR: 3
+}
+
+
+class ConventionalCommit(NamedTuple):
+    """
+    A commit message parsed according to the Conventional Commits specification.
+
+    See https://www.conventionalcommits.org/en/v1.0.0/#specification
+    """
+    type: Optional[str]
+    scope: Optional[str]
+    description: str
+    is_breaking: bool
+    commit_type: CommitType
+
+
+class ReleaseVersionConflictError(RuntimeError):
+    """
+    Raised when the release version kept being changed by other runs, so an increment could not be applied on top of the latest value.
+    """
+
+
+class ReleaseVersionUpdate(NamedTuple):
+    """
+    The outcome of a single ReleaseVersionUpdater.update_release_version() run.
+    """
+    previous_version: str
+    release_version: str
+    commit_type: CommitType
+
+
+class ManifestEntry(NamedTuple):
+    """
+    A repository whose release version is updated in batch mode.
+
+    `path` is the local checkout of the repository and `ref` the commit whose history is analyzed.
+    """
+    repo_owner: str
+    repo_name: str
+    repo_variable: str
+    ref: str = "HEAD"
+    path: str = "."
+    since_ref: Optional[str] = None
+    checkpoint_variable: Optional[str] = None
+
+
+class ReleaseIndexRecord(NamedTuple):
+    """
+    An entry of the release index, see src.release_version_updater.release_index
+
+    `position` orders the commits by when they were indexed, oldest first, and `version` is the release version of the run that indexed the commit.
+    """
+    position: int
+    sha: str
+    version: str
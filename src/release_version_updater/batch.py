@@ -0,0 +1,168 @@
+import argparse
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+import json
+from logging import Logger
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, TextIO
+WORKSPACE_ROOT: str = os.path.abspath(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+sys.path.append(WORKSPACE_ROOT)
+from src.clients.github.github_client import GitHubClient
+from src.clients.github.rate_limit_governor import RateLimitGovernor
+from src.clients.github.response_cache import ResponseCache
+from src.clients.github._types import HttpTransportType
+from src.clients.github.http_transport import create_transport
+from src.clients.git._types import GitBackendType
+from src.clients.git.git_backend import GitBackend
+from src.clients.git.git_client import GitClient
+from src.clients.git.git_repository import GitRepository
+from src.release_version_updater._types import ManifestEntry, ReleaseVersionUpdate
+from src.release_version_updater.logger import create_logger
+from src.release_version_updater.release_version_updater import ReleaseVersionUpdater
+
+DEFAULT_MAX_WORKERS: int = 16
+
+
+def load_manifest(manifest_path: str) -> List[ManifestEntry]:
+    """
+    Reads batch entries from a JSON array or from newline-delimited JSON objects.
+
+    Each entry requires `repo_owner`, `repo_name` and `repo_variable`, and may set `ref`, `path`, `since_ref` and `checkpoint_variable`.
+    """
+    with open(file=manifest_path, mode="r") as manifest_file:
+        content: str = manifest_file.read()
+
+    if content.lstrip().startswith("["):
+        raw_entries: List[Dict[str, Any]] = json.loads(content)
+    else:
+        raw_entries = [json.loads(line) for line in content.splitlines() if line.strip()]
+
+    return [ManifestEntry(**raw_entry) for raw_entry in raw_entries]
+
+
+class BatchReleaseVersionUpdater:
+    """
+    Updates the release versions of many repositories concurrently on a bounded thread pool.
+
+    All repositories share one GitHubClient, whose connection pool is sized to the number of workers so the API calls of different repositories overlap on reused connections.
+    Results are reported as one JSON object per repository, in order of completion.
+    """
+    def __init__(self, logger: Logger, github_client: GitHubClient, max_workers: int = DEFAULT_MAX_WORKERS, git_backend_type: GitBackendType = GitBackendType.NATIVE):
+        """
+        Arguments:
+
+        logger (Logger) - An instance of logging.Logger, shared by all repositories
+
+        github_client (GitHubClient) - An instance of src.clients.github.github_client.GitHubClient, shared by all repositories
+
+        max_workers (int) - Maximum number of repositories processed at once
+
+        git_backend_type (GitBackendType) - How commit history is read from each repository's checkout
+        """
+        self.logger: Logger = logger
+        self.github_client: GitHubClient = github_client
+        self.max_workers: int = max_workers
+        self.git_backend_type: GitBackendType = git_backend_type
+
+    def _create_git_backend(self, entry: ManifestEntry) -> GitBackend:
+        if self.git_backend_type == GitBackendType.SUBPROCESS:
+            return GitClient(logger=self.logger, repo_path=entry.path)
+
+        return GitRepository(entry.path)
+
+    def update_release_version(self, entry: ManifestEntry) -> Dict[str, Any]:
+        """
+        Updates the release version of a single entry and returns its report. Errors are reported rather than raised.
+        """
+        report: Dict[str, Any] = entry._asdict()
+        start_time: float = time.monotonic()
+        git_backend: Optional[GitBackend] = None
+        try:
+            git_backend = self._create_git_backend(entry)
+            release_version_updater: ReleaseVersionUpdater = ReleaseVersionUpdater(
+                logger=self.logger,
+                repo_owner=entry.repo_owner,
+                repo_name=entry.repo_name,
+                repo_variable=entry.repo_variable,
+                github_client=self.github_client,
+                github_output=None,
+                since_ref=entry.since_ref,
+                git_backend=git_backend,
+                ref=entry.ref,
+                checkpoint_variable=entry.checkpoint_variable
+            )
+            update: ReleaseVersionUpdate = release_version_updater.update_release_version()
+            report.update(status="ok", **update._asdict())
+        except Exception as e:
+            report.update(status="error", error=f"{type(e).__name__}: {e}")
+        finally:
+            if git_backend:
+                git_backend.close()
+        report["duration_seconds"] = round(time.monotonic() - start_time, 6)
+
+        return report
+
+    def update_release_versions(self, entries: List[ManifestEntry], report: TextIO) -> int:
+        """
+        Updates the release version of every entry and writes one NDJSON line per entry to `report`.
+
+        Returns the number of entries that failed.
+        """
+        failures: int = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="release_version_updater") as executor:
+            futures: List[Future] = [executor.submit(self.update_release_version, entry) for entry in entries]
+            for future in as_completed(futures):
+                result: Dict[str, Any] = future.result()
+                if result["status"] != "ok":
+                    failures += 1
+                report.write(json.dumps(result) + "\n")
+                report.flush()
+
+        return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Updates the release versions of many repositories concurrently.")
+    parser.add_argument("manifest", help="JSON array or NDJSON file of {repo_owner, repo_name, repo_variable, ref, path, since_ref, checkpoint_variable} entries")
+    parser.add_argument("--max-workers", type=int, default=int(os.environ.get("MAX_WORKERS", DEFAULT_MAX_WORKERS)), help="Maximum number of repositories processed at once")
+    parser.add_argument("--report", default="-", help="Path of the NDJSON report, or '-' for stdout")
+    args = parser.parse_args()
+
+    # Logs go to stderr so the report can be piped from stdout
+    logger: Logger = create_logger("release_version_batch", sys.stderr)
+    entries: List[ManifestEntry] = load_manifest(args.manifest)
+    cache_dir: str = os.environ.get("CACHE_DIR", "")
+    rate_limit_state_file: str = os.environ.get("RATE_LIMIT_STATE_FILE", "")
+    github_client: GitHubClient = GitHubClient(
+        github_token=os.environ["GITHUB_TOKEN"],
+        pool_maxsize=args.max_workers,
+        cache=ResponseCache(cache_dir) if cache_dir else None,
+        transport=create_transport(HttpTransportType(os.environ.get("HTTP_TRANSPORT", HttpTransportType.REQUESTS)), args.max_workers),
+        rate_limit_governor=RateLimitGovernor(rate_limit_state_file) if rate_limit_state_file else None
+    )
+    batch_updater: BatchReleaseVersionUpdater = BatchReleaseVersionUpdater(
+        logger=logger,
+        github_client=github_client,
+        max_workers=args.max_workers,
+        git_backend_type=GitBackendType(os.environ.get("GIT_BACKEND", GitBackendType.NATIVE))
+    )
+
+    logger.info(f"Updating release versions of {len(entries)} repositories with {args.max_workers} workers...")
+    try:
+        if args.report == "-":
+            failures: int = batch_updater.update_release_versions(entries, sys.stdout)
+        else:
+            with open(file=args.report, mode="w") as report:
+                failures = batch_updater.update_release_versions(entries, report)
+    finally:
+        github_client.close()
+
+    logger.info(f"Finished: {len(entries) - failures} succeeded, {failures} failed.")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import shutil
+import tempfile
+from typing import Dict, List, Optional, TextIO
+from src.release_version_updater._types import CommitType, ConventionalCommit
+from src.release_version_updater.commit_classifier import CommitClassifier
+
+# Sections in the order they are written, with the commit types they collect. Breaking changes go to their own section whatever their type
+CHANGELOG_SECTIONS: Dict[str, List[str]] = {
+    "Breaking changes": [],
+    "Features": ["feat", "feature"],
+    "Fixes": ["fix"],
+    "Performance": ["perf", "performance"]
+}
+BREAKING_SECTION: str = "Breaking changes"
+# Bytes of a section kept in memory before it is spilled to a temporary file
+SECTION_SPOOL_SIZE: int = 1024 * 1024
+
+
+class ChangelogWriter:
+    """
+    Groups commit messages into a Markdown changelog with a section each for breaking changes, features, fixes and performance improvements.
+
+    Commits are added one at a time while the history is streamed, and each section is appended to its own spooled temporary file,
+    so memory stays bounded however many commits are added. Commits of other types are left out.
+
+    Usage:
+
+        with ChangelogWriter() as changelog:
+            for commit_msg in commit_msgs:
+                changelog.add(commit_msg)
+            changelog.write(stream)
+    """
+    def __init__(self, commit_classifier: Optional[CommitClassifier] = None, spool_size: int = SECTION_SPOOL_SIZE):
+        """
+        Arguments:
+
+        commit_classifier (Optional[CommitClassifier]) - Parses the commit messages
+
+        spool_size (int) - Characters of each section kept in memory before it is spilled to disk
+        """
+        self.commit_classifier: CommitClassifier = commit_classifier or CommitClassifier()
+        self._sections: Dict[str, tempfile.SpooledTemporaryFile] = {
+            section: tempfile.SpooledTemporaryFile(max_size=spool_size, mode="w+", encoding="utf-8") for section in CHANGELOG_SECTIONS
+        }
+        self._type_to_section: Dict[str, str] = {
+            commit_type: section for section, commit_types in CHANGELOG_SECTIONS.items() for commit_type in commit_types
+        }
+
+    def add(self, commit_msg: str) -> CommitType:
+        """
+        Adds `commit_msg` to its section, if it has one, and returns its CommitType.
+        """
+        commit: ConventionalCommit = self.commit_classifier.parse(commit_msg)
+        section: Optional[str] = BREAKING_SECTION if commit.is_breaking else self._type_to_section.get((commit.type or "").lower())
+        if section is not None:
+            scope: str = f"**{commit.scope}:** " if commit.scope else ""
+            self._sections[section].write(f"- {scope}{commit.description}\n")
+
+        return commit.commit_type
+
+    def write(self, stream: TextIO):
+        """
+        Writes every non-empty section to `stream`, in the order of CHANGELOG_SECTIONS.
+        """
+        is_first: bool = True
+        for section, section_file in self._sections.items():
+            if section_file.tell() == 0:
+                continue
+            stream.write(f"### {section}\n" if is_first else f"\n### {section}\n")
+            section_file.seek(0)
+            shutil.copyfileobj(section_file, stream)
+            section_file.seek(0, 2)
+            is_first = False
+
+    def close(self):
+        for section_file in self._sections.values():
+            section_file.close()
+
+    def __enter__(self) -> "ChangelogWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,106 @@
+import re
+from typing import Dict, Iterable, Iterator, Optional
+from src.release_version_updater._types import CommitMessagePrefix, CommitType, COMMIT_TYPE_PRECEDENCE, ConventionalCommit, MESSAGE_PREFIX_TO_COMMIT_TYPE
+from src.release_version_updater.commit_rules import CommitRules
+
+# `type(scope)!: description`, where "BREAKING CHANGE" is also accepted as a type for backwards compatibility
+HEADER_PATTERN: re.Pattern = re.compile(
+    r"(?P<type>BREAKING[ -]CHANGE|[A-Za-z][\w-]*)(?:\((?P<scope>[^()\r\n]*)\))?(?P<breaking>!)?:[ \t]*(?P<description>[^\r\n]*)")
+# Same header grammar without capturing the description or scope, which classification does not need
+HEADER_TYPE_PATTERN: re.Pattern = re.compile(r"(BREAKING[ -]CHANGE|[A-Za-z][\w-]*)(?:\([^()\r\n]*\))?(!)?:")
+BREAKING_FOOTER_PATTERN: re.Pattern = re.compile(r"^BREAKING[ -]CHANGE:", re.MULTILINE)
+
+# Enum attribute access is several times slower than a global lookup, which adds up when classifying millions of messages
+_MAJOR: CommitType = CommitType.MAJOR
+_OTHER: CommitType = CommitType.OTHER
+
+
+class CommitClassifier:
+    """
+    Determines the CommitType of commit messages following the Conventional Commits specification.
+
+    The header is parsed with one precompiled pattern into type, optional scope and `!` marker, and only the text after the header is scanned for a `BREAKING CHANGE:` footer, and only if it could still change the result.
+    Types are matched case-insensitively against MESSAGE_PREFIX_TO_COMMIT_TYPE; `BREAKING CHANGE` must be uppercase.
+    User-defined CommitRules can add types and raise the result through prefixes, patterns and footers.
+    See https://www.conventionalcommits.org/en/v1.0.0/#specification
+    """
+    def __init__(self, prefix_to_commit_type: Dict[CommitMessagePrefix, CommitType] = MESSAGE_PREFIX_TO_COMMIT_TYPE, rules: Optional[CommitRules] = None):
+        """
+        Arguments:
+
+        prefix_to_commit_type (Dict[CommitMessagePrefix, CommitType]) - Maps commit types such as "feat" to the version increment they cause
+
+        rules (Optional[CommitRules]) - User-defined rules, e.g. loaded with src.release_version_updater.commit_rules.load_commit_rules()
+        """
+        self._type_to_commit_type: Dict[str, CommitType] = {
+            prefix.value.lower(): commit_type for prefix, commit_type in prefix_to_commit_type.items()
+        }
+        self._type_to_commit_type["breaking-change"] = self._type_to_commit_type.get("breaking change", CommitType.MAJOR)
+        self.rules: Optional[CommitRules] = rules
+        if rules is not None:
+            self._type_to_commit_type.update(rules.types)
+
+    def classify(self, commit_msg: str) -> CommitType:
+        header_match: Optional[re.Match] = HEADER_TYPE_PATTERN.match(commit_msg)
+        if header_match is None:
+            commit_type: CommitType = _OTHER
+        else:
+            prefix, breaking = header_match.groups()
+            if breaking:
+                return _MAJOR
+            # Most types are already lowercase, so the exact lookup usually avoids lower()
+            commit_type = self._type_to_commit_type.get(prefix) or self._type_to_commit_type.get(prefix.lower(), _OTHER)
+            if commit_type is _MAJOR:
+                return commit_type
+
+        body_start: int = commit_msg.find("\n")
+        # The substring check avoids running the footer pattern over the vast majority of bodies
+        if body_start != -1 and commit_msg.find("BREAKING", body_start) != -1 and BREAKING_FOOTER_PATTERN.search(commit_msg, body_start + 1):
+            return _MAJOR
+        if self.rules is not None:
+            return self.rules.match(commit_msg, commit_type)
+
+        return commit_type
+
+    def parse(self, commit_msg: str) -> ConventionalCommit:
+        header_match: Optional[re.Match] = HEADER_PATTERN.match(commit_msg)
+        commit_type: CommitType = self.classify(commit_msg)
+        if header_match is None:
+            return ConventionalCommit(
+                type=None,
+                scope=None,
+                description=commit_msg.split("\n", 1)[0].strip(),
+                is_breaking=commit_type == CommitType.MAJOR,
+                commit_type=commit_type
+            )
+
+        return ConventionalCommit(
+            type=header_match["type"],
+            scope=header_match["scope"],
+            description=header_match["description"].strip(),
+            is_breaking=commit_type == CommitType.MAJOR,
+            commit_type=commit_type
+        )
+
+    def classify_many(self, commit_msgs: Iterable[str]) -> Iterator[CommitType]:
+        """
+        Lazily classifies every message in `commit_msgs`.
+        """
+        return map(self.classify, commit_msgs)
+
+    def get_highest_commit_type(self, commit_msgs: Iterable[str]) -> CommitType:
+        """
+        Returns the most significant commit type among `commit_msgs`.
+
+        Stops consuming `commit_msgs` as soon as a major change is found, since nothing can outrank it.
+        """
+        highest_commit_type: CommitType = CommitType.OTHER
+        highest_precedence: int = COMMIT_TYPE_PRECEDENCE[highest_commit_type]
+        for commit_type in self.classify_many(commit_msgs):
+            if COMMIT_TYPE_PRECEDENCE[commit_type] > highest_precedence:
+                highest_commit_type = commit_type
+                highest_precedence = COMMIT_TYPE_PRECEDENCE[commit_type]
+                if highest_commit_type == CommitType.MAJOR:
+                    break
+
+        return highest_commit_type
@@ -0,0 +1,193 @@
+import bisect
+import itertools
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from src.release_version_updater._types import CommitType, COMMIT_TYPE_PRECEDENCE
+
+# Rule kinds in a rule file, each mapping a matcher to the name of a CommitType
+RULE_KINDS: Tuple[str, ...] = ("types", "prefixes", "patterns", "footers")
+YAML_EXTENSIONS: Tuple[str, ...] = (".yml", ".yaml")
+
+# Enum attribute access is several times slower than a global lookup, which adds up when classifying millions of messages
+_OTHER: CommitType = CommitType.OTHER
+# Commit types that rules can raise a commit to, most significant first
+_RULE_COMMIT_TYPES: Tuple[CommitType, ...] = tuple(sorted(
+    (commit_type for commit_type in CommitType if commit_type is not CommitType.OTHER), key=COMMIT_TYPE_PRECEDENCE.__getitem__, reverse=True
+))
+
+
+class _PrefixTrieNode:
+    """
+    A node of the prefix trie, with its children by lowercase character and the most significant commit type among the prefixes ending at it.
+    """
+    __slots__ = ("children", "commit_type")
+
+    def __init__(self):
+        self.children: Dict[str, "_PrefixTrieNode"] = {}
+        self.commit_type: Optional[CommitType] = None
+
+
+def _validate_pattern(pattern: str):
+    """
+    Raises ValueError if `pattern` is not a valid regular expression, or one that cannot be combined with other patterns.
+    """
+    try:
+        # Compiled as it is combined with the other patterns, where inline global flags such as "(?i)" are not allowed
+        compiled_pattern: re.Pattern = re.compile(f"(?:{pattern})")
+    except re.error as e:
+        raise ValueError(f"Invalid pattern '{pattern}': {e}") from e
+    if compiled_pattern.groups and re.search(r"\\\d|\(\?P=", pattern):
+        raise ValueError(f"Pattern '{pattern}' uses a backreference, which cannot be combined with other patterns")
+    reserved_names: List[str] = [name for name in compiled_pattern.groupindex if re.fullmatch(r"r\d+", name)]
+    if reserved_names:
+        raise ValueError(f"Pattern '{pattern}' defines the groups {reserved_names}, whose names are reserved for combining patterns")
+
+
+class CommitRules:
+    """
+    User-defined rules that raise the CommitType of commit messages, on top of the Conventional Commits types of CommitClassifier.
+
+    There are four kinds of rules, each mapping to a CommitType:
+
+    - types: Conventional Commits types, e.g. "deps" in "deps(npm): Bumped lodash". These extend or override MESSAGE_PREFIX_TO_COMMIT_TYPE
+    - prefixes: Literal message prefixes, e.g. "[security]", matched case-insensitively
+    - patterns: Regular expressions searched for in the header line, e.g. r"^[A-Z]+-\\d+ feature\\b". They must not use backreferences
+    - footers: Git trailer tokens in the body, e.g. "Security-Impact" matches a "Security-Impact: high" line, case-insensitively
+
+    When several rules match, the most significant commit type wins, as it does across commits.
+    The rules are compiled once, so matching does not try them one by one: prefixes are looked up in a character trie, which costs one step per character
+    of the longest matching prefix, and the patterns and footers of each commit type are joined into one alternation, which is only searched
+    if its commit type would raise the result. Matching cost therefore stays flat as rule sets grow into the hundreds.
+    """
+    def __init__(self, types: Optional[Dict[str, CommitType]] = None, prefixes: Optional[Dict[str, CommitType]] = None, patterns: Optional[Dict[str, CommitType]] = None, footers: Optional[Dict[str, CommitType]] = None):
+        """
+        Arguments:
+
+        types (Optional[Dict[str, CommitType]]) - Maps Conventional Commits types to the version increment they cause
+
+        prefixes (Optional[Dict[str, CommitType]]) - Maps literal message prefixes to the version increment they cause
+
+        patterns (Optional[Dict[str, CommitType]]) - Maps regular expressions, searched for in the header line, to the version increment they cause
+
+        footers (Optional[Dict[str, CommitType]]) - Maps git trailer tokens to the version increment they cause
+        """
+        self.types: Dict[str, CommitType] = {commit_type.lower(): increment for commit_type, increment in (types or {}).items()}
+        self._prefix_trie: _PrefixTrieNode = _PrefixTrieNode()
+        for prefix, commit_type in (prefixes or {}).items():
+            self._insert_prefix(prefix, commit_type)
+
+        for pattern in (patterns or {}):
+            _validate_pattern(pattern)
+        self._matchers: List[Tuple[CommitType, Optional[re.Pattern], Optional[re.Pattern]]] = []
+        for commit_type in _RULE_COMMIT_TYPES:
+            header_patterns: List[str] = [pattern for pattern, increment in (patterns or {}).items() if increment is commit_type]
+            footer_tokens: List[str] = [token for token, increment in (footers or {}).items() if increment is commit_type]
+            if header_patterns or footer_tokens:
+                self._matchers.append((
+                    commit_type,
+                    self._combine_patterns(header_patterns) if header_patterns else None,
+                    re.compile(r"^(?:" + "|".join(map(re.escape, footer_tokens)) + r")(?::|[ \t]#)", re.MULTILINE | re.IGNORECASE) if footer_tokens else None
+                ))
+
+    @staticmethod
+    def _combine_patterns(patterns: List[str]) -> re.Pattern:
+        # Each pattern is wrapped in a group with a generated name, r0, r1, ..., and the span of each group maps an error back to its pattern
+        groups: List[str] = [f"(?P<r{index}>{pattern})" for index, pattern in enumerate(patterns)]
+        group_ends: List[int] = list(itertools.accumulate(len(group) + 1 for group in groups))
+        try:
+            return re.compile("|".join(groups))
+        except re.error as e:
+            # Patterns that compile on their own can still clash when combined, e.g. by defining the same group name
+            offending_pattern: str = patterns[bisect.bisect_right(group_ends, e.pos)] if e.pos is not None else patterns[-1]
+            raise ValueError(f"Pattern '{offending_pattern}' cannot be combined with the other patterns: {e.msg}") from e
+
+    def _insert_prefix(self, prefix: str, commit_type: CommitType):
+        if not prefix or commit_type is _OTHER:
+            return
+        node: _PrefixTrieNode = self._prefix_trie
+        for char in prefix.lower():
+            node = node.children.get(char) or node.children.setdefault(char, _PrefixTrieNode())
+        if node.commit_type is None or COMMIT_TYPE_PRECEDENCE[commit_type] > COMMIT_TYPE_PRECEDENCE[node.commit_type]:
+            node.commit_type = commit_type
+
+    def _match_prefix(self, commit_msg: str) -> CommitType:
+        commit_type: CommitType = _OTHER
+        children: Dict[str, _PrefixTrieNode] = self._prefix_trie.children
+        for char in commit_msg:
+            node: Optional[_PrefixTrieNode] = children.get(char) or children.get(char.lower())
+            if node is None:
+                break
+            if node.commit_type is not None and COMMIT_TYPE_PRECEDENCE[node.commit_type] > COMMIT_TYPE_PRECEDENCE[commit_type]:
+                commit_type = node.commit_type
+            children = node.children
+
+        return commit_type
+
+    def match(self, commit_msg: str, commit_type: CommitType = _OTHER) -> CommitType:
+        """
+        Returns the most significant of `commit_type` and the commit types of the rules that `commit_msg` matches.
+
+        Patterns and footers are only searched for if their commit type is more significant than the result so far.
+        """
+        if self._prefix_trie.children:
+            prefix_commit_type: CommitType = self._match_prefix(commit_msg)
+            if COMMIT_TYPE_PRECEDENCE[prefix_commit_type] > COMMIT_TYPE_PRECEDENCE[commit_type]:
+                commit_type = prefix_commit_type
+
+        precedence: int = COMMIT_TYPE_PRECEDENCE[commit_type]
+        header_end: int = commit_msg.find("\n")
+        for rule_commit_type, header_pattern, footer_pattern in self._matchers:
+            if COMMIT_TYPE_PRECEDENCE[rule_commit_type] <= precedence:
+                break
+            if header_pattern is not None and header_pattern.search(commit_msg, 0, len(commit_msg) if header_end == -1 else header_end):
+                return rule_commit_type
+            if footer_pattern is not None and header_end != -1 and footer_pattern.search(commit_msg, header_end + 1):
+                return rule_commit_type
+
+        return commit_type
+
+    @classmethod
+    def from_dict(cls, rules: Dict[str, Any]) -> "CommitRules":
+        """
+        Creates rules from a parsed rule file, e.g. {"types": {"deps": "patch"}, "footers": {"Security-Impact": "patch"}}.
+
+        Raises ValueError for unknown rule kinds, unknown commit types and invalid patterns.
+        """
+        unknown_kinds: List[str] = [kind for kind in rules if kind not in RULE_KINDS]
+        if unknown_kinds:
+            raise ValueError(f"Unknown rule kinds {unknown_kinds}, expected some of {list(RULE_KINDS)}")
+
+        parsed_rules: Dict[str, Dict[str, CommitType]] = {}
+        for kind in RULE_KINDS:
+            kind_rules: Any = rules.get(kind) or {}
+            if not isinstance(kind_rules, dict):
+                raise ValueError(f"'{kind}' must map matchers to commit types, e.g. {{\"deps\": \"patch\"}}")
+            try:
+                parsed_rules[kind] = {str(matcher): CommitType(str(commit_type).lower()) for matcher, commit_type in kind_rules.items()}
+            except ValueError as e:
+                raise ValueError(f"Invalid commit type in '{kind}': {e}. Expected one of {[commit_type.value for commit_type in CommitType]}") from e
+
+        return cls(**parsed_rules)
+
+
+def load_commit_rules(rules_path: str) -> CommitRules:
+    """
+    Loads a rule file, see CommitRules. Files ending in .yml or .yaml are read as YAML, which requires PyYAML, and all others as JSON.
+    """
+    with open(file=rules_path, mode="r") as rules_file:
+        if os.path.splitext(rules_path)[1].lower() in YAML_EXTENSIONS:
+            # Only imported for YAML rule files, so JSON users do not pay for it at startup
+            import yaml
+            rules: Any = yaml.safe_load(rules_file)
+        else:
+            rules = json.load(rules_file)
+
+    if not isinstance(rules, dict):
+        raise ValueError(f"Rule file {rules_path} must contain a mapping of rule kinds, e.g. {{\"types\": {{\"deps\": \"patch\"}}}}")
+
+    try:
+        return CommitRules.from_dict(rules)
+    except ValueError as e:
+        raise ValueError(f"Invalid rule file {rules_path}: {e}") from e
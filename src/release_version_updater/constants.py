@@ -1,18 +1,42 @@
-import sys
 import os
-from logging import Logger, StreamHandler, Formatter, INFO
-
-LOGGER: Logger = Logger("release_version_updater")
-LOGGER.setLevel(INFO)
-HANDLER = StreamHandler(sys.stdout)
-HANDLER.setLevel(INFO)
-FORMATTER = Formatter(
-    "[%(asctime)s][%(name)s][%(filename)s:%(lineno)d][%(funcName)s][%(levelname)s]: %(message)s")
-HANDLER.setFormatter(FORMATTER)
-LOGGER.addHandler(HANDLER)
+from src.release_version_updater.logger import LOGGER
 
 REPO_NAME: str = os.environ["REPO_NAME"]
 REPO_OWNER: str = os.environ["REPO_OWNER"]
-REPO_VARIABLE: str = os.environ["REPO_VARIABLE"]
+# JSON object mapping package path prefixes to the repository variables storing their release versions
+PACKAGE_VARIABLES: str = os.environ.get("PACKAGE_VARIABLES", "")
+# Not needed in monorepo mode, where each package has its own variable
+REPO_VARIABLE: str = os.environ.get("REPO_VARIABLE", "") if PACKAGE_VARIABLES else os.environ["REPO_VARIABLE"]
 GITHUB_TOKEN: str = os.environ["GITHUB_TOKEN"]
 GITHUB_OUTPUT: str = os.environ["GITHUB_OUTPUT"]
+SINCE_REF: str = os.environ.get("SINCE_REF", "")
+# Repository variable storing the last analyzed commit, so each run only analyzes commits made since. Disabled if unset
+CHECKPOINT_VARIABLE: str = os.environ.get("CHECKPOINT_VARIABLE", "")
+# If "true", release versions are updated with optimistic concurrency, so parallel runs do not need a concurrency group
+COMPARE_AND_SWAP: bool = os.environ.get("COMPARE_AND_SWAP", "").lower() == "true"
+# Path that a changelog of the analyzed commits is written to. It is also exposed as the `changelog` output. Disabled if unset
+CHANGELOG_FILE: str = os.environ.get("CHANGELOG_FILE", "")
+# Where the current release version is read from, "variable" or "tags". See src.release_version_updater._types.VersionSource
+VERSION_SOURCE: str = os.environ.get("VERSION_SOURCE", "variable")
+# If "true", a shallow checkout is deepened with `git fetch --deepen` until the analyzed range has been fetched
+DEEPEN_HISTORY: bool = os.environ.get("DEEPEN_HISTORY", "").lower() == "true"
+# JSON or YAML file of rules mapping commit types, prefixes, patterns and footers to version increments. See src.release_version_updater.commit_rules
+COMMIT_RULES_FILE: str = os.environ.get("COMMIT_RULES_FILE", "")
+# Path of a release index that every analyzed commit is appended to with its release version. See src.release_version_updater.release_index. Disabled if unset
+RELEASE_INDEX_FILE: str = os.environ.get("RELEASE_INDEX_FILE", "")
+GIT_BACKEND: str = os.environ.get("GIT_BACKEND", "native")
+# Set by GitHub Actions. On push events, the pushed commits are read from the event file instead of the repository where possible
+GITHUB_EVENT_NAME: str = os.environ.get("GITHUB_EVENT_NAME", "")
+GITHUB_EVENT_PATH: str = os.environ.get("GITHUB_EVENT_PATH", "")
+# If "false", commits are always read from the repository, even on push events
+PUSH_EVENT_COMMITS: bool = os.environ.get("PUSH_EVENT_COMMITS", "true").lower() == "true"
+CACHE_DIR: str = os.environ.get("CACHE_DIR", "")
+HTTP_TRANSPORT: str = os.environ.get("HTTP_TRANSPORT", "requests")
+# File storing the rate limit budget shared by every process on the host that uses it. Requests are not paced if unset
+RATE_LIMIT_STATE_FILE: str = os.environ.get("RATE_LIMIT_STATE_FILE", "")
+# Path that timing spans are written to as JSON lines. Tracing is disabled if unset
+TRACE_FILE: str = os.environ.get("TRACE_FILE", "")
+# Set by GitHub Actions. If tracing is enabled, a table of span timings is appended to it
+GITHUB_STEP_SUMMARY: str = os.environ.get("GITHUB_STEP_SUMMARY", "")
+# Path that cProfile statistics of the whole run are dumped to, for use with pstats or snakeviz. Profiling is disabled if unset
+PROFILE_FILE: str = os.environ.get("PROFILE_FILE", "")
@@ -0,0 +1,19 @@
+import sys
+from logging import Logger, StreamHandler, Formatter, INFO
+from typing import TextIO
+
+
+def create_logger(name: str, stream: TextIO = sys.stdout) -> Logger:
+    logger: Logger = Logger(name)
+    logger.setLevel(INFO)
+    handler = StreamHandler(stream)
+    handler.setLevel(INFO)
+    formatter = Formatter(
+        "[%(asctime)s][%(name)s][%(filename)s:%(lineno)d][%(funcName)s][%(levelname)s]: %(message)s")
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+
+    return logger
+
+
+LOGGER: Logger = create_logger("release_version_updater")
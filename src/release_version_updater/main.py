@@ -1,30 +1,99 @@
+import json
 import os
 import sys
+from typing import Optional, TextIO
 WORKSPACE_ROOT: str = os.path.abspath(
     os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 sys.path.append(WORKSPACE_ROOT)
 from src.clients.github.github_client import GitHubClient
+from src.clients.github.http_transport import create_transport
+from src.clients.github.rate_limit_governor import RateLimitGovernor
+from src.clients.github.response_cache import ResponseCache
+from src.clients.github._types import HttpTransportType
+from src.clients.github.constants import POOL_MAXSIZE
+from src.clients.git._types import GitBackendType
+from src.clients.git.git_backend import GitBackend
+from src.clients.git.git_client import GitClient
+from src.release_version_updater.commit_rules import load_commit_rules
 from src.release_version_updater.release_version_updater import ReleaseVersionUpdater
-from src.release_version_updater.constants import LOGGER, REPO_OWNER, REPO_NAME, REPO_VARIABLE, GITHUB_TOKEN, GITHUB_OUTPUT
+from src.release_version_updater._types import VersionSource
+from src.tracing.tracer import NULL_TRACER, Tracer
+from src.release_version_updater.constants import LOGGER, REPO_OWNER, REPO_NAME, REPO_VARIABLE, GITHUB_TOKEN, GITHUB_OUTPUT, SINCE_REF, CHECKPOINT_VARIABLE, COMPARE_AND_SWAP, CHANGELOG_FILE, VERSION_SOURCE, DEEPEN_HISTORY, COMMIT_RULES_FILE, RELEASE_INDEX_FILE, GIT_BACKEND, GITHUB_EVENT_NAME, GITHUB_EVENT_PATH, PUSH_EVENT_COMMITS, CACHE_DIR, PACKAGE_VARIABLES, HTTP_TRANSPORT, RATE_LIMIT_STATE_FILE, TRACE_FILE, GITHUB_STEP_SUMMARY, PROFILE_FILE
+
+
+def _create_git_backend() -> GitBackend:
+    if GIT_BACKEND == GitBackendType.SUBPROCESS:
+        return GitClient(logger=LOGGER)
+
+    from src.clients.git.git_repository import GitRepository
+    return GitRepository()
 
 
 def main():
+    """
+    Runs the action as configured by the environment, see src.release_version_updater.constants
+
+    Modules that only some configurations need, such as the native git reader or the push event reader, are imported where they are used,
+    since every run starts a fresh interpreter and imports make up most of its time to the first git call.
+    """
+    trace_file: Optional[TextIO] = open(file=TRACE_FILE, mode="a") if TRACE_FILE else None
+    tracer: Tracer = Tracer(stream=trace_file) if trace_file else NULL_TRACER
     try:
-        github_client: GitHubClient = GitHubClient(github_token=GITHUB_TOKEN)
+        github_client: GitHubClient = GitHubClient(
+            github_token=GITHUB_TOKEN,
+            cache=ResponseCache(CACHE_DIR) if CACHE_DIR else None,
+            transport=create_transport(HttpTransportType(HTTP_TRANSPORT), POOL_MAXSIZE),
+            tracer=tracer,
+            rate_limit_governor=RateLimitGovernor(RATE_LIMIT_STATE_FILE) if RATE_LIMIT_STATE_FILE else None
+        )
+        if PUSH_EVENT_COMMITS and GITHUB_EVENT_NAME == "push":
+            from src.clients.git.push_event_backend import PushEventBackend
+            # The repository is only opened if the event cannot answer a request, so simple push runs need no checkout
+            git_backend: GitBackend = PushEventBackend(event_path=GITHUB_EVENT_PATH or None, fallback=_create_git_backend, logger=LOGGER)
+        else:
+            git_backend: GitBackend = _create_git_backend()
         release_version_updater: ReleaseVersionUpdater = ReleaseVersionUpdater(
             logger=LOGGER,
             repo_owner=REPO_OWNER,
             repo_name=REPO_NAME,
             repo_variable=REPO_VARIABLE,
             github_client=github_client,
-            github_output=GITHUB_OUTPUT
+            github_output=GITHUB_OUTPUT,
+            since_ref=SINCE_REF or None,
+            git_backend=git_backend,
+            package_variables=json.loads(PACKAGE_VARIABLES) if PACKAGE_VARIABLES else None,
+            tracer=tracer,
+            checkpoint_variable=CHECKPOINT_VARIABLE or None,
+            compare_and_swap=COMPARE_AND_SWAP,
+            changelog_file=CHANGELOG_FILE or None,
+            version_source=VersionSource(VERSION_SOURCE),
+            history_fetcher=GitClient(logger=LOGGER) if DEEPEN_HISTORY else None,
+            commit_rules=load_commit_rules(COMMIT_RULES_FILE) if COMMIT_RULES_FILE else None,
+            release_index_file=RELEASE_INDEX_FILE or None
         )
 
-        release_version_updater.update_release_version()
+        if release_version_updater.package_variables:
+            release_version_updater.update_package_release_versions()
+        else:
+            release_version_updater.update_release_version()
     except Exception as e:
         LOGGER.info(e)
         raise e
+    finally:
+        if trace_file:
+            trace_file.close()
+            if GITHUB_STEP_SUMMARY:
+                tracer.write_summary(GITHUB_STEP_SUMMARY, "Release version updater timings")
 
 
 if __name__ == "__main__":
-    main()
+    if PROFILE_FILE:
+        import cProfile
+        profiler: cProfile.Profile = cProfile.Profile()
+        try:
+            profiler.runcall(main)
+        finally:
+            profiler.dump_stats(PROFILE_FILE)
+            LOGGER.info(f"Profile written to {PROFILE_FILE}")
+    else:
+        main()
@@ -0,0 +1,36 @@
+from typing import Dict, Generic, Iterator, List, TypeVar
+
+T = TypeVar("T")
+
+
+class PathPrefixTrie(Generic[T]):
+    """
+    Maps directory prefixes such as "packages/api" to values, and finds every prefix a file path falls under.
+
+    Prefixes are split into path components, so "packages/api" matches "packages/api/setup.py" but not "packages/api-client/setup.py".
+    Looking up a path costs one dictionary access per path component, no matter how many prefixes are stored.
+    An empty prefix matches every path.
+    """
+    def __init__(self):
+        self._children: Dict[str, "PathPrefixTrie[T]"] = {}
+        self._values: List[T] = []
+
+    def insert(self, prefix: str, value: T):
+        node: PathPrefixTrie[T] = self
+        for component in prefix.strip("/").split("/"):
+            if component in ("", "."):
+                continue
+            node = node._children.setdefault(component, PathPrefixTrie())
+        node._values.append(value)
+
+    def match(self, path: str) -> Iterator[T]:
+        """
+        Yields the values of every stored prefix that `path` is equal to or inside of, shortest prefix first.
+        """
+        node: PathPrefixTrie[T] = self
+        yield from node._values
+        for component in path.split("/"):
+            node = node._children.get(component)
+            if node is None:
+                return
+            yield from node._values
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+import argparse
+import fcntl
+import heapq
+import mmap
+import os
+import struct
+import sys
+from typing import BinaryIO, Iterable, List, Optional, Set, Tuple, Union
+WORKSPACE_ROOT: str = os.path.abspath(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+sys.path.append(WORKSPACE_ROOT)
+from src.release_version_updater._types import ReleaseIndexRecord
+from src.release_version_updater.semver import SemVer
+
+# A record is the binary SHA of a commit, its position and the major, minor and patch numbers of its release version
+RECORD_FORMAT: str = ">20sQIII"
+RECORD_SIZE: int = struct.calcsize(RECORD_FORMAT)
+# Every segment ends with a trailer of the same size as a record: the magic, the format version and the number of records in the segment
+TRAILER_FORMAT: str = ">4sIQ24x"
+RELEASE_INDEX_MAGIC: bytes = b"RVIX"
+RELEASE_INDEX_VERSION: int = 1
+SHA_LENGTH: int = 20
+# Abbreviated SHAs shorter than this match too many commits to be useful, like `git rev-parse --short`
+MIN_ABBREV_LENGTH: int = 4
+
+# Fields of a record in RECORD_FORMAT order
+Record = Tuple[bytes, int, int, int, int]
+
+
+class ReleaseIndex:
+    """
+    Looks up which release version commits were recorded with, through a memory-mapped release index file, without touching git or the API.
+
+    The file is a sequence of segments of fixed-width records sorted by SHA, each followed by a trailer giving its record count, so the segments are found by walking the trailers back from the end of the file.
+    Every run appends one segment, see append_to_release_index(), and merges it into the segments before it while they are less than twice its size.
+    Since appends rewrite those segments in place, an open index holds a shared `flock` on the file, and appends wait for it to be closed.
+    Segment sizes therefore at least halve from one segment to the next, so a file of n records has at most log2(n) + 1 segments, and a lookup is a binary search in each of them,
+    touching only a handful of pages however many releases the file covers.
+    """
+    def __init__(self, index_path: str, locked: bool = False):
+        """
+        Arguments:
+
+        index_path (str) - Path to a release index file. A missing or empty file is an empty index
+
+        locked (bool) - Whether the caller already holds a `flock` on the file. Otherwise a shared one is held until close(), so appends wait for the index to be closed
+        """
+        self.index_path: str = index_path
+        self._file: Optional[BinaryIO] = None
+        self._mmap: Union[mmap.mmap, bytes] = b""
+        try:
+            self._file = open(index_path, "rb")
+        except FileNotFoundError:
+            pass
+        try:
+            if self._file:
+                # Appends rewrite the last segments in place, so they must not run while the segments are read or mapped
+                if not locked:
+                    fcntl.flock(self._file, fcntl.LOCK_SH)
+                if os.fstat(self._file.fileno()).st_size:
+                    self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.size: int = len(self._mmap)
+            # (offset, record count) of every segment, oldest first
+            self.segments: List[Tuple[int, int]] = self._read_segments()
+        except BaseException:
+            self.close()
+            raise
+        self.record_count: int = sum(count for _, count in self.segments)
+
+    def _read_segments(self) -> List[Tuple[int, int]]:
+        if len(self._mmap) % RECORD_SIZE:
+            raise ValueError(f"Release index is truncated: {self.index_path}")
+
+        segments: List[Tuple[int, int]] = []
+        end: int = len(self._mmap)
+        while end:
+            magic, version, count = struct.unpack_from(TRAILER_FORMAT, self._mmap, end - RECORD_SIZE)
+            start: int = end - RECORD_SIZE * (count + 1)
+            if magic != RELEASE_INDEX_MAGIC or version != RELEASE_INDEX_VERSION or start < 0:
+                raise ValueError(f"Not a release index, or an unsupported version of it: {self.index_path}")
+            segments.append((start, count))
+            end = start
+        segments.reverse()
+
+        return segments
+
+    def _sha_at(self, offset: int, position: int) -> bytes:
+        start: int = offset + RECORD_SIZE * position
+
+        return self._mmap[start:start + SHA_LENGTH]
+
+    def _lower_bound(self, offset: int, count: int, sha: bytes) -> int:
+        low: int = 0
+        high: int = count
+        while low < high:
+            middle: int = (low + high) // 2
+            if self._sha_at(offset, middle) < sha:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+    def _read_records(self, offset: int, count: int) -> List[Record]:
+        return list(struct.iter_unpack(RECORD_FORMAT, self._mmap[offset:offset + RECORD_SIZE * count]))
+
+    def _to_index_record(self, offset: int, position: int) -> ReleaseIndexRecord:
+        sha, commit_position, major, minor, patch = struct.unpack_from(RECORD_FORMAT, self._mmap, offset + RECORD_SIZE * position)
+
+        return ReleaseIndexRecord(position=commit_position, sha=sha.hex(), version=f"{major}.{minor}.{patch}")
+
+    def contains(self, sha: bytes) -> bool:
+        """
+        Returns whether there is a record for the commit with binary name `sha`.
+        """
+        for offset, count in self.segments:
+            position: int = self._lower_bound(offset, count, sha)
+            if position < count and self._sha_at(offset, position) == sha:
+                return True
+
+        return False
+
+    def find(self, hex_sha: str) -> Optional[ReleaseIndexRecord]:
+        """
+        Returns the record of the commit whose full or abbreviated hex name is `hex_sha`, or None if there is none.
+
+        Raises ValueError if `hex_sha` is not a hex name of at least MIN_ABBREV_LENGTH digits, or if it abbreviates more than one recorded commit.
+        """
+        hex_sha = hex_sha.lower()
+        if not MIN_ABBREV_LENGTH <= len(hex_sha) <= SHA_LENGTH * 2:
+            raise ValueError(f"'{hex_sha}' is not a commit SHA of {MIN_ABBREV_LENGTH} to {SHA_LENGTH * 2} hex digits")
+        padded_sha: bytes = bytes.fromhex(hex_sha.ljust(SHA_LENGTH * 2, "0"))
+
+        matches: List[ReleaseIndexRecord] = []
+        for offset, count in self.segments:
+            position: int = self._lower_bound(offset, count, padded_sha)
+            while position < count and self._sha_at(offset, position).hex().startswith(hex_sha) and len(matches) < 2:
+                matches.append(self._to_index_record(offset, position))
+                position += 1
+        if len(matches) > 1:
+            raise ValueError(f"Commit SHA '{hex_sha}' is ambiguous in {self.index_path}")
+
+        return matches[0] if matches else None
+
+    def close(self):
+        """
+        Unmaps the file and releases its lock.
+        """
+        if self._file:
+            if isinstance(self._mmap, mmap.mmap):
+                self._mmap.close()
+            # Closing the file releases its lock
+            self._file.close()
+        self._file = None
+        self._mmap = b""
+
+    def __enter__(self) -> "ReleaseIndex":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def append_to_release_index(index_path: str, shas: Iterable[str], version: str) -> int:
+    """
+    Records `version` as the release version of every commit in `shas`, given as full hex names, oldest first. Returns the number of records added.
+
+    Commits that already have a record keep it, so each commit stays mapped to the first release version it was recorded with.
+    Only the last segments of the file are ever rewritten, while holding an exclusive `flock` on it, see ReleaseIndex.
+    """
+    release_version: SemVer = SemVer.parse(version)
+    if release_version.prerelease or release_version.build:
+        raise ValueError(f"Only versions of the form major.minor.patch can be indexed, not '{version}'")
+
+    index_dir: str = os.path.dirname(os.path.abspath(index_path))
+    os.makedirs(index_dir, exist_ok=True)
+    with open(os.open(index_path, os.O_RDWR | os.O_CREAT, 0o644), "r+b") as index_file:
+        fcntl.flock(index_file, fcntl.LOCK_EX)
+        try:
+            with ReleaseIndex(index_path, locked=True) as release_index:
+                new_shas: Set[bytes] = set()
+                records: List[Record] = []
+                for hex_sha in shas:
+                    sha: bytes = bytes.fromhex(hex_sha)
+                    if len(sha) != SHA_LENGTH:
+                        raise ValueError(f"'{hex_sha}' is not a full commit SHA")
+                    if sha in new_shas or release_index.contains(sha):
+                        continue
+                    new_shas.add(sha)
+                    records.append((sha, release_index.record_count + len(records), release_version.major, release_version.minor, release_version.patch))
+                if not records:
+                    return 0
+
+                added_count: int = len(records)
+                records.sort()
+                start: int = release_index.size
+                segments: List[Tuple[int, int]] = list(release_index.segments)
+                while segments and 2 * len(records) > segments[-1][1]:
+                    start, count = segments.pop()
+                    records = list(heapq.merge(release_index._read_records(start, count), records))
+
+            index_file.seek(start)
+            index_file.write(b"".join(struct.pack(RECORD_FORMAT, *record) for record in records))
+            index_file.write(struct.pack(TRAILER_FORMAT, RELEASE_INDEX_MAGIC, RELEASE_INDEX_VERSION, len(records)))
+            index_file.truncate()
+            index_file.flush()
+        finally:
+            fcntl.flock(index_file, fcntl.LOCK_UN)
+
+    return added_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Looks up the release versions of commits in a release index written by the release version updater.")
+    parser.add_argument("index_file", help="Release index file, see RELEASE_INDEX_FILE")
+    parser.add_argument("shas", nargs="+", help="Full or abbreviated SHAs of the commits to look up")
+    args: argparse.Namespace = parser.parse_args()
+
+    exit_code: int = 0
+    with ReleaseIndex(args.index_file) as release_index:
+        for hex_sha in args.shas:
+            try:
+                record: Optional[ReleaseIndexRecord] = release_index.find(hex_sha)
+            except ValueError as e:
+                print(e, file=sys.stderr)
+                exit_code = 1
+                continue
+            if record is None:
+                print(f"Commit {hex_sha} is not in {args.index_file}", file=sys.stderr)
+                exit_code = 1
+            else:
+                print(f"{record.sha} {record.version}")
+
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,35 @@
 #!/usr/bin/env python3
-from subprocess import CompletedProcess
-import subprocess
-from typing import List
-from requests import Response
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 import json
+import math
 import os
+import random
 import sys
+import time
 from logging import Logger
 WORKSPACE_ROOT: str = os.path.abspath(
     os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 sys.path.append(WORKSPACE_ROOT)
-from src.release_version_updater._types import CommitType, MESSAGE_PREFIX_TO_COMMIT_TYPE
+from src.release_version_updater._types import CommitType, COMMIT_TYPE_PRECEDENCE, ReleaseVersionConflictError, ReleaseVersionUpdate, VersionSource
+from src.release_version_updater.changelog import ChangelogWriter
+from src.release_version_updater.commit_classifier import CommitClassifier
+from src.release_version_updater.commit_rules import CommitRules
+from src.release_version_updater.path_prefix_trie import PathPrefixTrie
+from src.release_version_updater.release_index import append_to_release_index
+from src.release_version_updater.semver import SemVer, max_version, parse_versions
+from src.clients.github._types import HTTPError, HttpResponse
+from src.clients.github.constants import VARIABLES_PER_PAGE
 from src.clients.github.github_client import GitHubClient
+from src.clients.git._types import GitCommitChanges
+from src.clients.git.git_backend import GitBackend
+from src.clients.git.git_client import GitClient
+from src.tracing.tracer import NULL_TRACER, Tracer
+
+# Number of times a compare-and-swap update is attempted before giving up
+COMPARE_AND_SWAP_MAX_ATTEMPTS: int = 5
+# Delays between compare-and-swap attempts are drawn uniformly from [0, min(COMPARE_AND_SWAP_MAX_BACKOFF, COMPARE_AND_SWAP_BACKOFF_FACTOR * 2 ** attempt)]
+COMPARE_AND_SWAP_BACKOFF_FACTOR: float = 1.0
+COMPARE_AND_SWAP_MAX_BACKOFF: float = 15.0
 
 
 class ReleaseVersionUpdater:
@@ -23,6 +41,10 @@ class ReleaseVersionUpdater:
     See https://semver.org/
 
     Tries to determine which digit to increment based on the prefix of the latest commit, see https://www.conventionalcommits.org/en/v1.0.0/
+    If a `since_ref` is given, every commit in `{since_ref}..HEAD` is analyzed instead and the most significant change wins.
+
+    In a monorepo, update_package_release_versions() maintains a separate release version per package in a single pass over the history,
+    bumping each package according to the commits that changed files under its path prefix.
 
     Commits that break backwards compatibility result in a major version increment.
     Commits that add non-breaking features result in a minor version increment.
@@ -32,7 +54,7 @@ class ReleaseVersionUpdater:
     In addition to updating the release version via API, the incremented version is also passed to other stages of the current GitHub Actions run via $GITHUB_OUTPUT.
     See https://docs.github.com/en/actions/using-jobs/defining-outputs-for-jobs
     """
-    def __init__(self, logger: Logger, repo_owner: str, repo_name: str, repo_variable: str, github_client: GitHubClient, github_output: str):
+    def __init__(self, logger: Logger, repo_owner: str, repo_name: str, repo_variable: str, github_client: GitHubClient, github_output: Optional[str], since_ref: Optional[str] = None, git_backend: Optional[GitBackend] = None, ref: str = "HEAD", package_variables: Optional[Dict[str, str]] = None, tracer: Optional[Tracer] = None, checkpoint_variable: Optional[str] = None, compare_and_swap: bool = False, changelog_file: Optional[str] = None, version_source: VersionSource = VersionSource.VARIABLE, history_fetcher: Optional[GitClient] = None, commit_rules: Optional[CommitRules] = None, release_index_file: Optional[str] = None):
         """
         Arguments:
 
@@ -46,114 +68,533 @@ class ReleaseVersionUpdater:
         
         github_client (GitHubClient) - An instance of src.clients.github.github_client.GitHubClient
 
-        github_output (str) - Path to $GITHUB_OUTPUT in GitHub Actions environment, see https://docs.github.com/en/actions/using-jobs/defining-outputs-for-jobs
+        github_output (Optional[str]) - Path to $GITHUB_OUTPUT in GitHub Actions environment, see https://docs.github.com/en/actions/using-jobs/defining-outputs-for-jobs. If None, nothing is written
+
+        since_ref (Optional[str]) - Git ref of the last release, e.g. a tag. If set, all commits in `{since_ref}..{ref}` are analyzed instead of only the latest one
+
+        git_backend (Optional[GitBackend]) - Reads commit history from the local repository. Defaults to an instance of src.clients.git.git_client.GitClient, which runs the `git` executable
+
+        ref (str) - Git ref of the commit being released
+
+        package_variables (Optional[Dict[str, str]]) - Maps path prefixes of packages in a monorepo, e.g. "packages/api", to the repository variables storing their release versions. Used by update_package_release_versions()
+
+        tracer (Optional[Tracer]) - Records a span for each phase of the update: reading commits, getting and updating the release version, and writing $GITHUB_OUTPUT
+
+        checkpoint_variable (Optional[str]) - Repository variable storing the last commit whose changes were counted. If set, only commits after it are analyzed, as long as it is an ancestor of `ref`, and it is advanced to `ref` after every update
+
+        compare_and_swap (bool) - Whether release versions are updated with optimistic concurrency, so that parallel runs re-apply their increments on top of each other instead of overwriting them
+
+        changelog_file (Optional[str]) - Path that a changelog of the analyzed commits, grouped into breaking changes, features, fixes and performance improvements, is written to by update_release_version(). It is also written to $GITHUB_OUTPUT as `changelog`
+
+        version_source (VersionSource) - Where the current release version of `repo_variable` is read from. With the local tags, the higher of the highest reachable version tag and the repository variable is incremented. Package versions and compare-and-swap updates only read the repository variables
+
+        history_fetcher (Optional[GitClient]) - Deepens a shallow clone of the repository until the analyzed range, e.g. back to `since_ref` or the checkpoint, has been fetched. If None, the history is expected to be complete already
+
+        commit_rules (Optional[CommitRules]) - User-defined rules mapping commit types, prefixes, patterns and footers to version increments, on top of the Conventional Commits types
+
+        release_index_file (Optional[str]) - Path of a release index that update_release_version() appends every analyzed commit to, with the release version of the run. See src.release_version_updater.release_index
         """
         self.logger: Logger = logger
         self.repo_owner: str = repo_owner
         self.repo_name: str = repo_name
         self.repo_variable: str = repo_variable
         self.github_client: GitHubClient = github_client
-        self.github_output: str = github_output
-
-    def _get_latest_commit_msg(self) -> str:
-        git_cmd: List[str] = [
-            "git",
-            "-c",
-            f"safe.directory={os.getcwd()}",
-            "--no-pager",
-            "log",
-            "-1",
-            "--pretty=%B"
-        ]
-        self.logger.info(f"Running the following git command: {' '.join(git_cmd)}")
-        git_log: CompletedProcess = subprocess.run(
-            git_cmd,
-            shell=False,
-            capture_output=True
-        )
-
-        if git_log.returncode != 0:
-            raise ChildProcessError(bytes(git_log.stderr).decode("utf-8"))
+        self.github_output: Optional[str] = github_output
+        self.since_ref: Optional[str] = since_ref
+        self.git_backend: GitBackend = git_backend or GitClient(logger=logger)
+        self.ref: str = ref
+        self.commit_classifier: CommitClassifier = CommitClassifier(rules=commit_rules)
+        self.package_variables: Dict[str, str] = package_variables or {}
+        self.tracer: Tracer = tracer or NULL_TRACER
+        self.checkpoint_variable: Optional[str] = checkpoint_variable
+        self.compare_and_swap: bool = compare_and_swap
+        self.changelog_file: Optional[str] = changelog_file
+        self.version_source: VersionSource = version_source
+        self.history_fetcher: Optional[GitClient] = history_fetcher
+        self.release_index_file: Optional[str] = release_index_file
+        # Values read ahead by _prefetch_variables(), by variable name. None means the variable does not exist
+        self._prefetched_variables: Dict[str, Optional[str]] = {}
+        self._sleep: Callable[[float], None] = time.sleep
 
-        commit_msg: str = bytes(git_log.stdout).decode("utf-8")
+    def _get_latest_commit_msg(self, ref: Optional[str] = None) -> str:
+        commit_msg: str = self.git_backend.get_latest_commit_msg(ref or self.ref)
 
         return commit_msg
 
+    def _iter_commit_msgs(self, revision_range: str) -> Iterator[str]:
+        return self.git_backend.iter_commit_msgs(revision_range)
+
     def _get_commit_type(self, commit_msg: str) -> CommitType:
-        msg_prefix: str = commit_msg.split(":")[0]
-        commit_type: CommitType = MESSAGE_PREFIX_TO_COMMIT_TYPE.get(
-            msg_prefix, CommitType.OTHER)
+        commit_type: CommitType = self.commit_classifier.classify(commit_msg)
 
         return commit_type
 
-    def _get_current_release_version(self) -> str:
-        response: Response = self.github_client.get_repository_variable(
+    def _get_highest_commit_type(self, commit_msgs: Iterable[str]) -> CommitType:
+        """
+        Returns the most significant commit type among `commit_msgs`.
+
+        Stops consuming `commit_msgs` as soon as a major change is found, since nothing can outrank it.
+        """
+        highest_commit_type: CommitType = self.commit_classifier.get_highest_commit_type(commit_msgs)
+
+        return highest_commit_type
+
+    def _prefetch_variables(self, variables: Iterable[str]):
+        """
+        Reads the values of `variables` by listing the repository's variables, which returns up to VARIABLES_PER_PAGE of them per request.
+
+        Listing stops as soon as every variable has been found, or once the remaining pages outnumber the variables still missing,
+        which are then left to one GET request each. A single variable is always left to a GET, which the response cache can serve.
+        """
+        missing_variables: Dict[str, str] = {
+            variable.upper(): variable for variable in variables if variable and variable not in self._prefetched_variables
+        }
+        if len(missing_variables) < 2:
+            return
+
+        self.logger.info(f"Calling GitHub API to list the variables of {self.repo_owner}/{self.repo_name}...")
+        with self.tracer.span("list_variables", variables=len(missing_variables)) as attributes:
+            pages: Iterator[Dict[str, Any]] = self.github_client.iter_repository_variable_pages(
+                repo_owner=self.repo_owner,
+                repo_name=self.repo_name,
+                per_page=VARIABLES_PER_PAGE
+            )
+            listed_count: int = 0
+            try:
+                for page in pages:
+                    for listed_variable in page["variables"]:
+                        listed_count += 1
+                        variable: Optional[str] = missing_variables.pop(listed_variable["name"].upper(), None)
+                        if variable is not None:
+                            self._prefetched_variables[variable] = listed_variable["value"]
+                    remaining_pages: int = math.ceil((page["total_count"] - listed_count) / VARIABLES_PER_PAGE)
+                    if remaining_pages == 0:
+                        # Every variable was listed, so the missing ones do not exist
+                        self._prefetched_variables.update(dict.fromkeys(missing_variables.values()))
+                        missing_variables.clear()
+                    if not missing_variables or remaining_pages >= len(missing_variables):
+                        break
+            finally:
+                pages.close()
+            attributes["unresolved"] = len(missing_variables)
+
+    def _get_current_release_version(self, variable: Optional[str] = None) -> str:
+        prefetched_release_version: Optional[str] = self._prefetched_variables.pop(variable or self.repo_variable, None)
+        if prefetched_release_version is not None:
+            return prefetched_release_version
+
+        response: HttpResponse = self.github_client.get_repository_variable(
             repo_owner=self.repo_owner,
             repo_name=self.repo_name,
-            variable=self.repo_variable
+            variable=variable or self.repo_variable
         )
 
         release_version: str = json.loads(response.content)["value"]
 
         return release_version
 
-    def _increment_release_version(self, curr_release_version: str, latest_commit_type: CommitType) -> str:
-        major_version, minor_version, patch_version = map(
-            int, curr_release_version.split("."))
+    def _is_version_tag(self, tag: str) -> bool:
+        return next(parse_versions([tag]), None) is not None
+
+    def _get_tag_release_version(self) -> Optional[str]:
+        """
+        Returns the highest version among the tags on the nearest version-tagged commits reachable from `ref`, one per merged branch, or None if there is none.
+        """
+        tag_release_version: Optional[SemVer] = max_version(self.git_backend.get_nearest_tags(self._is_version_tag, self.ref))
+
+        return str(tag_release_version) if tag_release_version else None
 
-        if latest_commit_type == CommitType.MAJOR:
-            major_version += 1
-        elif latest_commit_type == CommitType.MINOR:
-            minor_version += 1
-        elif latest_commit_type == CommitType.PATCH:
-            patch_version += 1
+    def _read_release_version(self, variable: str) -> str:
+        """
+        Returns the current release version of `variable`. If the local tags are the version source, that is the higher of the highest reachable version tag and the repository variable,
+        so the increment is never applied to a version lower than either.
+        """
+        self.logger.info(
+            f"Calling GitHub API to get current release version {variable} for {self.repo_owner}/{self.repo_name}...")
+        release_version: str = self._get_current_release_version(variable)
+        if self.version_source != VersionSource.TAGS or variable != self.repo_variable:
+            return release_version
 
-        new_release_version: str = f"{major_version}.{minor_version}.{patch_version}"
+        tag_release_version: Optional[str] = self._get_tag_release_version()
+        if not tag_release_version:
+            self.logger.info(f"No version tag is reachable from {self.ref}, using repository variable {variable}")
+            return release_version
+        self.logger.info(f"Found release version {tag_release_version} in the tags of {self.ref}")
+        if SemVer.parse(tag_release_version) <= SemVer.parse(release_version):
+            return release_version
+
+        return tag_release_version
+
+    def _increment_release_version(self, curr_release_version: str, latest_commit_type: CommitType) -> str:
+        new_release_version: str = str(SemVer.parse(curr_release_version).increment(latest_commit_type))
 
         return new_release_version
     
     def _write_to_github_output(self, key: str, value: str):
         with open(file=self.github_output, mode="a") as github_output:
-            github_output.write(f"{key}={value}")
+            github_output.write(f"{key}={value}\n")
 
-    def update_release_version(self):
-        try:
-            self.logger.info(f"Checking latest commit for {self.repo_owner}/{self.repo_name}...")
-            latest_commit_msg: str = self._get_latest_commit_msg()
-            self.logger.info(f"Latest commit message: {latest_commit_msg}")
-            latest_commit_type: CommitType = self._get_commit_type(latest_commit_msg)
-            self.logger.info(f"Latest commit type: {latest_commit_type}")
+    def _write_changelog_to_github_output(self, key: str, changelog: ChangelogWriter):
+        """
+        Appends `changelog` to $GITHUB_OUTPUT as multiline output `key`, through a single buffered file handle.
+
+        The delimiter is random, so it cannot occur in the changelog. See https://docs.github.com/en/actions/using-workflows/workflow-commands-for-github-actions#multiline-strings
+        """
+        delimiter: str = f"ghadelimiter_{os.urandom(16).hex()}"
+        with open(file=self.github_output, mode="a", encoding="utf-8") as github_output:
+            github_output.write(f"{key}<<{delimiter}\n")
+            # Every changelog line ends with a newline, so the delimiter starts a line of its own
+            changelog.write(github_output)
+            github_output.write(f"{delimiter}\n")
+
+    def _add_to_changelog(self, commit_msgs: Iterable[str], changelog: ChangelogWriter) -> CommitType:
+        """
+        Adds every message in `commit_msgs` to `changelog` and returns the most significant commit type among them.
+
+        Unlike _get_highest_commit_type(), all of `commit_msgs` is consumed, since a major change does not end the changelog.
+        """
+        return max(map(changelog.add, commit_msgs), key=COMMIT_TYPE_PRECEDENCE.__getitem__, default=CommitType.OTHER)
+
+    def _compare_and_swap_release_version(self, variable: str, commit_type: CommitType) -> ReleaseVersionUpdate:
+        """
+        Increments the release version stored in repository variable `variable` with optimistic concurrency.
+
+        Right before writing, the variable is re-read conditionally on the ETag it was read with. If another run changed it in the meantime,
+        or overwrote this run's write with a lower version, the increment is re-applied on top of the newer value after a backoff.
+
+        The API has no conditional writes, so this narrows the window for lost updates to the time between the re-read and the write rather than closing it.
+        """
+        for attempt in range(COMPARE_AND_SWAP_MAX_ATTEMPTS):
+            if attempt:
+                self._sleep(random.uniform(0, min(COMPARE_AND_SWAP_MAX_BACKOFF, COMPARE_AND_SWAP_BACKOFF_FACTOR * 2 ** attempt)))
 
             self.logger.info(
-                f"Calling GitHub API to get current release version for {self.repo_owner}/{self.repo_name}...")
-            curr_release_version: str = self._get_current_release_version()
+                f"Calling GitHub API to get current release version {variable} for {self.repo_owner}/{self.repo_name} (attempt {attempt + 1})...")
+            with self.tracer.span("get_release_version", variable=variable, attempt=attempt):
+                response: HttpResponse = self.github_client.get_repository_variable(
+                    repo_owner=self.repo_owner,
+                    repo_name=self.repo_name,
+                    variable=variable
+                )
+            curr_release_version: str = json.loads(response.content)["value"]
+            etag: Optional[str] = response.headers.get("ETag")
             self.logger.info(f"Latest release version: {curr_release_version}")
 
-            incremented_version: str = self._increment_release_version(curr_release_version, latest_commit_type)
-            # Ensures version was successfully incremented
-            if incremented_version != curr_release_version:
+            incremented_version: str = self._increment_release_version(curr_release_version, commit_type)
+            if incremented_version == curr_release_version:
+                self.logger.info(f"No increment applied to version number {curr_release_version}.")
+                return ReleaseVersionUpdate(
+                    previous_version=curr_release_version,
+                    release_version=curr_release_version,
+                    commit_type=commit_type
+                )
+
+            with self.tracer.span("update_release_version", variable=variable, attempt=attempt):
+                if etag:
+                    is_unchanged: bool = self.github_client.get_repository_variable(
+                        repo_owner=self.repo_owner,
+                        repo_name=self.repo_name,
+                        variable=variable,
+                        etag=etag
+                    ).status_code == 304
+                else:
+                    is_unchanged = self._get_current_release_version(variable) == curr_release_version
+                if not is_unchanged:
+                    self.logger.info(f"Release version {variable} was changed by another run, retrying...")
+                    continue
+
                 self.logger.info(
-                    f"Calling GitHub API to update release version for {self.repo_owner}/{self.repo_name} to {incremented_version}...")
-                response: Response = self.github_client.update_repository_variable(
+                    f"Calling GitHub API to update release version {variable} for {self.repo_owner}/{self.repo_name} to {incremented_version}...")
+                self.github_client.update_repository_variable(
                     repo_owner=self.repo_owner,
                     repo_name=self.repo_name,
-                    variable=self.repo_variable,
+                    variable=variable,
                     new_value=incremented_version
                 )
-                self.logger.info(
-                    f"Received the following response from GitHub: {response.status_code}")
+                written_release_version: str = self._get_current_release_version(variable)
+
+            # A higher version means a later run built on top of this one's increment
+            if SemVer.parse(written_release_version) >= SemVer.parse(incremented_version):
                 self.logger.info(f"Successfully incremented release version from {curr_release_version} to {incremented_version}!")
+                return ReleaseVersionUpdate(
+                    previous_version=curr_release_version,
+                    release_version=incremented_version,
+                    commit_type=commit_type
+                )
+            self.logger.info(f"Release version {variable} was overwritten with {written_release_version} by another run, retrying...")
 
-                curr_release_version = incremented_version
+        raise ReleaseVersionConflictError(
+            f"Release version {variable} of {self.repo_owner}/{self.repo_name} kept changing, gave up after {COMPARE_AND_SWAP_MAX_ATTEMPTS} attempts")
+
+    def _apply_commit_type(self, variable: str, commit_type: CommitType) -> ReleaseVersionUpdate:
+        """
+        Increments the release version stored in repository variable `variable` according to `commit_type`.
+        """
+        if self.compare_and_swap:
+            return self._compare_and_swap_release_version(variable, commit_type)
+
+        with self.tracer.span("get_release_version", variable=variable):
+            curr_release_version: str = self._read_release_version(variable)
+        previous_release_version: str = curr_release_version
+        self.logger.info(f"Latest release version: {curr_release_version}")
+
+        incremented_version: str = self._increment_release_version(curr_release_version, commit_type)
+        # Ensures version was successfully incremented
+        if incremented_version != curr_release_version:
+            self.logger.info(
+                f"Calling GitHub API to update release version {variable} for {self.repo_owner}/{self.repo_name} to {incremented_version}...")
+            with self.tracer.span("update_release_version", variable=variable):
+                response: HttpResponse = self.github_client.update_repository_variable(
+                    repo_owner=self.repo_owner,
+                    repo_name=self.repo_name,
+                    variable=variable,
+                    new_value=incremented_version
+                )
+            self.logger.info(
+                f"Received the following response from GitHub: {response.status_code}")
+            self.logger.info(f"Successfully incremented release version from {curr_release_version} to {incremented_version}!")
+
+            curr_release_version = incremented_version
+        else:
+            self.logger.info(f"No increment applied to version number {curr_release_version}.")
+
+        return ReleaseVersionUpdate(
+            previous_version=previous_release_version,
+            release_version=curr_release_version,
+            commit_type=commit_type
+        )
+
+    def _get_checkpoint(self) -> Optional[str]:
+        """
+        Returns the commit stored in `checkpoint_variable`, or None if the variable does not exist yet.
+        """
+        if self.checkpoint_variable in self._prefetched_variables:
+            return self._prefetched_variables.pop(self.checkpoint_variable)
+
+        try:
+            response: HttpResponse = self.github_client.get_repository_variable(
+                repo_owner=self.repo_owner,
+                repo_name=self.repo_name,
+                variable=self.checkpoint_variable
+            )
+        except HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return None
+            raise
+
+        return json.loads(response.content)["value"]
+
+    def _deepen_history(self, since_ref: Optional[str], ref: str):
+        """
+        Deepens a shallow clone until all commits in `{since_ref}..{ref}` have been fetched, if there is a `history_fetcher`.
+        """
+        if not self.history_fetcher or not since_ref:
+            return
+
+        revision_range: str = f"{since_ref}..{ref}"
+        with self.tracer.span("deepen_history", revision_range=revision_range):
+            if not self.history_fetcher.deepen_until_complete(revision_range):
+                self.logger.info(f"{since_ref} could not be found in the history of {ref}")
+            self.git_backend.refresh()
+
+    def _get_history_start(self, version_variables: Iterable[str] = ()) -> Tuple[Optional[str], str, Optional[str]]:
+        """
+        Returns the ref history analysis starts after, the ref it ends at, and the stored checkpoint.
+
+        The checkpoint is read together with `version_variables`, the release version variables that will likely be read afterwards, see _prefetch_variables().
+
+        With checkpointing, `ref` is resolved to a commit so the checkpoint saved afterwards is exactly the commit that was analyzed.
+        The checkpoint replaces `since_ref` if it is an ancestor of that commit. Otherwise, e.g. after a force push, the usual range is analyzed in full.
+        A shallow clone is deepened just far enough to reach the start of the range, see _deepen_history().
+        """
+        self._prefetched_variables.clear()
+        if not self.checkpoint_variable:
+            self._deepen_history(self.since_ref, self.ref)
+            return self.since_ref, self.ref, None
+
+        with self.tracer.span("read_checkpoint", variable=self.checkpoint_variable):
+            head_sha: str = self.git_backend.rev_parse(self.ref)
+            self._prefetch_variables([self.checkpoint_variable, *version_variables])
+            checkpoint: Optional[str] = self._get_checkpoint()
+            self._deepen_history(checkpoint, head_sha)
+            if checkpoint and self.git_backend.is_ancestor(checkpoint, head_sha):
+                self.logger.info(f"Resuming from checkpoint {checkpoint} stored in {self.checkpoint_variable}")
+                return checkpoint, head_sha, checkpoint
+
+        self.logger.info(f"No usable checkpoint in {self.checkpoint_variable}, analyzing the full range")
+        self._deepen_history(self.since_ref, head_sha)
+
+        return self.since_ref, head_sha, checkpoint
+
+    def _save_checkpoint(self, head_sha: str, checkpoint: Optional[str]):
+        """
+        Stores `head_sha` in `checkpoint_variable`, creating the variable if there was no previous `checkpoint`.
+        """
+        if not self.checkpoint_variable or head_sha == checkpoint:
+            return
+
+        self.logger.info(f"Saving checkpoint {head_sha} to {self.checkpoint_variable}...")
+        with self.tracer.span("save_checkpoint", variable=self.checkpoint_variable):
+            if checkpoint is None:
+                self.github_client.create_repository_variable(
+                    repo_owner=self.repo_owner,
+                    repo_name=self.repo_name,
+                    variable=self.checkpoint_variable,
+                    value=head_sha
+                )
             else:
-                self.logger.info(f"No increment applied to version number {curr_release_version}.")
+                self.github_client.update_repository_variable(
+                    repo_owner=self.repo_owner,
+                    repo_name=self.repo_name,
+                    variable=self.checkpoint_variable,
+                    new_value=head_sha
+                )
+
+    def _index_commits(self, since_ref: Optional[str], ref: str, release_version: str):
+        """
+        Appends the commits analyzed by update_release_version() to `release_index_file`, mapped to `release_version`.
+
+        Commits of runs that did not increment the version are mapped to the unchanged version. Prerelease versions do not fit the fixed-width records, so their commits are not indexed.
+        """
+        if not self.release_index_file:
+            return
+        version: SemVer = SemVer.parse(release_version)
+        if version.prerelease or version.build:
+            self.logger.info(f"Not adding commits to release index '{self.release_index_file}', since {release_version} is not a major.minor.patch version")
+            return
+
+        with self.tracer.span("write_release_index") as attributes:
+            shas: List[str] = list(self.git_backend.iter_commit_shas(f"{since_ref}..{ref}")) if since_ref else [self.git_backend.rev_parse(ref)]
+            # Positions are assigned oldest commit first
+            shas.reverse()
+            added_count: int = append_to_release_index(self.release_index_file, shas, release_version)
+            attributes["commits"] = added_count
+        self.logger.info(f"Added {added_count} commits to release index '{self.release_index_file}'")
+
+    def update_release_version(self) -> ReleaseVersionUpdate:
+        changelog: Optional[ChangelogWriter] = ChangelogWriter(self.commit_classifier) if self.changelog_file else None
+        try:
+            # Compare-and-swap updates read the variable with its ETag, so there is nothing to read ahead
+            version_variables: List[str] = [] if self.compare_and_swap else [self.repo_variable]
+            since_ref, ref, checkpoint = self._get_history_start(version_variables)
+            if since_ref:
+                revision_range: str = f"{since_ref}..{ref}"
+                self.logger.info(f"Checking commits in {revision_range} for {self.repo_owner}/{self.repo_name}...")
+                with self.tracer.span("read_commits", revision_range=revision_range):
+                    commit_msgs: Iterator[str] = self._iter_commit_msgs(revision_range)
+                    try:
+                        if changelog:
+                            latest_commit_type: CommitType = self._add_to_changelog(commit_msgs, changelog)
+                        else:
+                            latest_commit_type: CommitType = self._get_highest_commit_type(commit_msgs)
+                    finally:
+                        commit_msgs.close()
+                self.logger.info(f"Highest commit type since {since_ref}: {latest_commit_type}")
+            else:
+                self.logger.info(f"Checking latest commit for {self.repo_owner}/{self.repo_name}...")
+                with self.tracer.span("read_commits", revision_range=ref):
+                    latest_commit_msg: str = self._get_latest_commit_msg(ref)
+                self.logger.info(f"Latest commit message: {latest_commit_msg}")
+                latest_commit_type: CommitType = changelog.add(latest_commit_msg) if changelog else self._get_commit_type(latest_commit_msg)
+                self.logger.info(f"Latest commit type: {latest_commit_type}")
+
+            release_version_update: ReleaseVersionUpdate = self._apply_commit_type(self.repo_variable, latest_commit_type)
+            # Commits indexed before a failed checkpoint save are skipped when the next run analyzes them again
+            self._index_commits(since_ref, ref, release_version_update.release_version)
+            self._save_checkpoint(ref, checkpoint)
+
+            if changelog:
+                self.logger.info(f"Writing changelog to '{self.changelog_file}'...")
+                with self.tracer.span("write_changelog"):
+                    with open(file=self.changelog_file, mode="w", encoding="utf-8") as changelog_file:
+                        changelog.write(changelog_file)
+
+            if self.github_output:
+                self.logger.info(f"Writing '{release_version_update.release_version}' to $GITHUB_OUTPUT '{self.github_output}'...")
+                with self.tracer.span("write_github_output"):
+                    self._write_to_github_output("release_version", release_version_update.release_version)
+                    if changelog:
+                        self._write_changelog_to_github_output("changelog", changelog)
+                self.logger.info(f"Release version successfully written to $GITHUB_OUTPUT '{self.github_output}'!")
+
+            self.logger.info("Exiting.")
+
+            return release_version_update
+
+        except Exception as e:
+            self.logger.error(e)
+            raise e
+        finally:
+            if changelog:
+                changelog.close()
 
-            self.logger.info(f"Writing '{curr_release_version}' to $GITHUB_OUTPUT '{self.github_output}'...")
-            self._write_to_github_output("release_version", curr_release_version)
-            self.logger.info(f"Release version successfully written to $GITHUB_OUTPUT '{self.github_output}'!")
+    def _get_package_commit_types(self, since_ref: Optional[str], ref: str) -> Dict[str, CommitType]:
+        """
+        Walks the commit history once and returns the most significant commit type that touched each package.
+
+        Each commit is classified once and routed to every package whose path prefix contains one of its changed files.
+        """
+        package_trie: PathPrefixTrie[str] = PathPrefixTrie()
+        for prefix, variable in self.package_variables.items():
+            package_trie.insert(prefix, variable)
+        package_commit_types: Dict[str, CommitType] = {variable: CommitType.OTHER for variable in self.package_variables.values()}
+        unfinished_packages: int = len(package_commit_types)
+
+        # Without a since_ref only the latest commit is analyzed, as in update_release_version()
+        revision_range: str = f"{since_ref}..{ref}" if since_ref else ref
+        commit_changes: Iterator[GitCommitChanges] = self.git_backend.iter_commit_changes(revision_range)
+        try:
+            for commit in commit_changes:
+                commit_type: CommitType = self._get_commit_type(commit.message)
+                if commit_type != CommitType.OTHER:
+                    touched_packages: Set[str] = {variable for path in commit.paths for variable in package_trie.match(path)}
+                    for variable in touched_packages:
+                        if COMMIT_TYPE_PRECEDENCE[commit_type] > COMMIT_TYPE_PRECEDENCE[package_commit_types[variable]]:
+                            package_commit_types[variable] = commit_type
+                            if commit_type == CommitType.MAJOR:
+                                unfinished_packages -= 1
+                # Nothing can outrank a major change, so the walk ends once every package has one
+                if not since_ref or unfinished_packages == 0:
+                    break
+        finally:
+            commit_changes.close()
+
+        return package_commit_types
+
+    def update_package_release_versions(self) -> Dict[str, ReleaseVersionUpdate]:
+        """
+        Increments the release version of every package in `package_variables` that was changed by a relevant commit.
+
+        Repository variables of packages without relevant changes are not written. The variables of changed packages are read with as few requests as possible, see _prefetch_variables().
+        The new versions of all updated packages are written to $GITHUB_OUTPUT as a JSON object under `release_versions`.
+        """
+        try:
+            self.logger.info(f"Checking commits for {len(self.package_variables)} packages in {self.repo_owner}/{self.repo_name}...")
+            since_ref, ref, checkpoint = self._get_history_start([] if self.compare_and_swap else self.package_variables.values())
+            with self.tracer.span("read_commits", revision_range=f"{since_ref}..{ref}" if since_ref else ref):
+                package_commit_types: Dict[str, CommitType] = self._get_package_commit_types(since_ref, ref)
+
+            if not self.compare_and_swap:
+                self._prefetch_variables(variable for variable, commit_type in package_commit_types.items() if commit_type != CommitType.OTHER)
+            release_version_updates: Dict[str, ReleaseVersionUpdate] = {}
+            for variable, commit_type in package_commit_types.items():
+                self.logger.info(f"Highest commit type for {variable}: {commit_type}")
+                if commit_type != CommitType.OTHER:
+                    release_version_updates[variable] = self._apply_commit_type(variable, commit_type)
+            self._save_checkpoint(ref, checkpoint)
+
+            if self.github_output:
+                release_versions: Dict[str, str] = {
+                    variable: release_version_update.release_version for variable, release_version_update in release_version_updates.items()
+                }
+                self.logger.info(f"Writing {release_versions} to $GITHUB_OUTPUT '{self.github_output}'...")
+                with self.tracer.span("write_github_output"):
+                    self._write_to_github_output("release_versions", json.dumps(release_versions))
 
             self.logger.info("Exiting.")
-            
+
+            return release_version_updates
+
         except Exception as e:
             self.logger.error(e)
             raise e
@@ -0,0 +1,207 @@
+import re
+from typing import Iterable, Iterator, List, Optional, Tuple
+from src.release_version_updater._types import CommitType
+
+# The regular expression suggested by the specification, see https://semver.org/#is-there-a-suggested-regular-expression-regex-to-check-a-semver-string
+SEMVER_PATTERN: re.Pattern = re.compile(
+    r"(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)"
+    r"(?:-((?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?"
+    r"(?:\+([0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?"
+)
+# Prefix commonly put in front of versions in tag names, e.g. "v1.2.0"
+TAG_PREFIX: str = "v"
+
+# Enum attribute access is several times slower than a global lookup, which adds up when incrementing many versions
+_MAJOR: CommitType = CommitType.MAJOR
+_MINOR: CommitType = CommitType.MINOR
+_PATCH: CommitType = CommitType.PATCH
+
+# Sort key of a prerelease identifier: numeric identifiers sort before alphanumeric ones, and each kind is compared by its own rules
+PrereleaseKey = Tuple[Tuple[int, int, str], ...]
+SortKey = Tuple[int, int, int, int, PrereleaseKey]
+
+
+def _get_prerelease_key(prerelease: str) -> PrereleaseKey:
+    return tuple((0, int(identifier), "") if identifier.isdigit() else (1, 0, identifier) for identifier in prerelease.split("."))
+
+
+def _get_sort_key(major: int, minor: int, patch: int, prerelease: Optional[str]) -> SortKey:
+    # A release has higher precedence than any of its prereleases
+    if prerelease is None:
+        return (major, minor, patch, 1, ())
+
+    return (major, minor, patch, 0, _get_prerelease_key(prerelease))
+
+
+class SemVer:
+    """
+    An immutable semantic version, e.g. "1.4.0-rc.1+build.7", ordered by SemVer 2.0 precedence.
+
+    Prerelease versions sort before their release, and prerelease identifiers are compared numerically or in ASCII order depending on whether they are numeric.
+    Build metadata is kept but, as the specification requires, ignored for precedence, so versions differing only in build metadata are equal and hash the same.
+    The sort key is computed on the first comparison and cached, so sorting and comparing many versions only compares tuples.
+    See https://semver.org/#spec-item-11
+    """
+    __slots__ = ("major", "minor", "patch", "prerelease", "build", "_sort_key")
+
+    def __init__(self, major: int, minor: int, patch: int, prerelease: Optional[str] = None, build: Optional[str] = None):
+        """
+        Arguments:
+
+        major (int), minor (int), patch (int) - The version core
+
+        prerelease (Optional[str]) - Dot-separated prerelease identifiers, e.g. "rc.1"
+
+        build (Optional[str]) - Dot-separated build metadata identifiers, e.g. "build.7"
+        """
+        _set_major(self, major)
+        _set_minor(self, minor)
+        _set_patch(self, patch)
+        _set_prerelease(self, prerelease)
+        _set_build(self, build)
+
+    def __getattr__(self, name: str) -> SortKey:
+        # Only called while the `_sort_key` slot is still empty
+        if name != "_sort_key":
+            raise AttributeError(name)
+        sort_key: SortKey = _get_sort_key(self.major, self.minor, self.patch, self.prerelease)
+        _set_sort_key(self, sort_key)
+
+        return sort_key
+
+    @classmethod
+    def parse(cls, version: str) -> "SemVer":
+        """
+        Parses `version`, raising ValueError if it is not a valid semantic version.
+        """
+        match: Optional[re.Match] = SEMVER_PATTERN.fullmatch(version)
+        if match is None:
+            raise ValueError(f"'{version}' is not a valid semantic version, see https://semver.org/")
+        major, minor, patch, prerelease, build = match.groups()
+
+        return cls(int(major), int(minor), int(patch), prerelease, build)
+
+    def increment(self, commit_type: CommitType) -> "SemVer":
+        """
+        Returns the version following this one after a change of `commit_type`, without build metadata. Other changes return this version as it is.
+
+        Lower fields are reset, e.g. a minor change turns 1.2.3 into 1.3.0. A prerelease that already leads up to the incremented version is released instead,
+        e.g. a minor change turns 1.3.0-rc.1 into 1.3.0. See https://semver.org/#spec-item-7
+        """
+        if commit_type is _MAJOR:
+            if self.prerelease is not None and self.minor == 0 and self.patch == 0:
+                return SemVer(self.major, 0, 0)
+            return SemVer(self.major + 1, 0, 0)
+        elif commit_type is _MINOR:
+            if self.prerelease is not None and self.patch == 0:
+                return SemVer(self.major, self.minor, 0)
+            return SemVer(self.major, self.minor + 1, 0)
+        elif commit_type is _PATCH:
+            if self.prerelease is not None:
+                return SemVer(self.major, self.minor, self.patch)
+            return SemVer(self.major, self.minor, self.patch + 1)
+
+        return self
+
+    def __setattr__(self, name: str, value: object):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self) -> Tuple[type, Tuple[int, int, int, Optional[str], Optional[str]]]:
+        return (type(self), (self.major, self.minor, self.patch, self.prerelease, self.build))
+
+    def __str__(self) -> str:
+        version: str = f"{self.major}.{self.minor}.{self.patch}"
+        if self.prerelease is not None:
+            version += f"-{self.prerelease}"
+        if self.build is not None:
+            version += f"+{self.build}"
+
+        return version
+
+    def __repr__(self) -> str:
+        return f"SemVer('{self}')"
+
+    def __hash__(self) -> int:
+        return hash(self._sort_key)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SemVer):
+            return NotImplemented
+        return self._sort_key == other._sort_key
+
+    def __lt__(self, other: "SemVer") -> bool:
+        if not isinstance(other, SemVer):
+            return NotImplemented
+        return self._sort_key < other._sort_key
+
+    def __le__(self, other: "SemVer") -> bool:
+        if not isinstance(other, SemVer):
+            return NotImplemented
+        return self._sort_key <= other._sort_key
+
+    def __gt__(self, other: "SemVer") -> bool:
+        if not isinstance(other, SemVer):
+            return NotImplemented
+        return self._sort_key > other._sort_key
+
+    def __ge__(self, other: "SemVer") -> bool:
+        if not isinstance(other, SemVer):
+            return NotImplemented
+        return self._sort_key >= other._sort_key
+
+
+# SemVer.__setattr__ rejects every assignment, so slots are set through their descriptors, which is also faster than object.__setattr__()
+_set_major, _set_minor, _set_patch, _set_prerelease, _set_build, _set_sort_key = (
+    SemVer.__dict__[slot].__set__ for slot in SemVer.__slots__
+)
+
+
+def parse_versions(versions: Iterable[str], prefix: str = TAG_PREFIX) -> Iterator[SemVer]:
+    """
+    Lazily parses every string in `versions`, e.g. tag names, with an optional `prefix` stripped. Strings that are not semantic versions are skipped.
+    """
+    fullmatch = SEMVER_PATTERN.fullmatch
+    for version in versions:
+        match: Optional[re.Match] = fullmatch(version, len(prefix) if prefix and version.startswith(prefix) else 0)
+        if match is not None:
+            major, minor, patch, prerelease, build = match.groups()
+            yield SemVer(int(major), int(minor), int(patch), prerelease, build)
+
+
+def sort_versions(versions: Iterable[str], prefix: str = TAG_PREFIX, reverse: bool = False) -> List[SemVer]:
+    """
+    Parses `versions` as parse_versions() does and returns them sorted by precedence, lowest first unless `reverse` is set.
+    """
+    return sorted(parse_versions(versions, prefix), key=_get_key, reverse=reverse)
+
+
+def max_version(versions: Iterable[str], prefix: str = TAG_PREFIX, include_prereleases: bool = True) -> Optional[SemVer]:
+    """
+    Returns the version of highest precedence among `versions`, e.g. the latest release among a repository's tags, or None if none is a semantic version.
+
+    Only sort keys are built while scanning, and a SemVer is created for the winner alone, which keeps this fast for tens of thousands of tags.
+    """
+    fullmatch = SEMVER_PATTERN.fullmatch
+    max_key: Optional[SortKey] = None
+    max_match: Optional[re.Match] = None
+    for version in versions:
+        match: Optional[re.Match] = fullmatch(version, len(prefix) if prefix and version.startswith(prefix) else 0)
+        if match is None:
+            continue
+        major, minor, patch, prerelease, _ = match.groups()
+        if prerelease is not None and not include_prereleases:
+            continue
+        key: SortKey = _get_sort_key(int(major), int(minor), int(patch), prerelease)
+        if max_key is None or key > max_key:
+            max_key = key
+            max_match = match
+
+    if max_match is None:
+        return None
+    major, minor, patch, prerelease, build = max_match.groups()
+
+    return SemVer(int(major), int(minor), int(patch), prerelease, build)
+
+
+def _get_key(version: SemVer) -> SortKey:
+    return version._sort_key
@@ -0,0 +1,380 @@
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import hmac
+import ipaddress
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+from logging import Logger
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Set
+WORKSPACE_ROOT: str = os.path.abspath(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+sys.path.append(WORKSPACE_ROOT)
+from src.clients.github.github_client import GitHubClient
+from src.clients.github.rate_limit_governor import RateLimitGovernor
+from src.clients.github.response_cache import ResponseCache
+from src.clients.github._types import HttpTransportType
+from src.clients.github.http_transport import create_transport
+from src.clients.git._types import GitBackendType
+from src.clients.git.git_client import GitClient
+from src.release_version_updater._types import ManifestEntry
+from src.release_version_updater.batch import DEFAULT_MAX_WORKERS, BatchReleaseVersionUpdater, load_manifest
+from src.release_version_updater.logger import create_logger
+from src.tracing.metrics import Histogram
+
+DEFAULT_PORT: int = 8000
+# GitHub caps webhook payloads at 25 MB, see https://docs.github.com/en/webhooks/webhook-events-and-payloads#payload-cap
+MAX_PAYLOAD_SIZE: int = 25 * 1024 * 1024
+# `before` of a push that created a branch, and `after` of one that deleted it
+NULL_SHA: str = "0" * 40
+METRICS_CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class PendingEvaluation(NamedTuple):
+    """
+    Pushes to one repository that are waiting to be evaluated together.
+
+    `before` is the head before the first of the pushes and `after` the head after the last one, so the evaluation covers every pushed commit.
+    `received_time` is when the first push arrived, on the monotonic clock.
+    """
+    entry: ManifestEntry
+    git_ref: str
+    before: str
+    after: str
+    received_time: float
+    push_count: int = 1
+
+
+class WebhookService:
+    """
+    Updates release versions in response to GitHub push events, on a bounded pool of worker threads shared by all repositories.
+
+    Pushes to a repository whose evaluation has not started yet are coalesced into it, so a burst of pushes costs one evaluation of the whole pushed range.
+    At most one evaluation per repository runs at a time, and pushes that arrive while it runs are coalesced into a single follow-up evaluation.
+    All evaluations share the GitHubClient of `batch_updater`, and with it its keep-alive connections.
+    """
+    def __init__(self, logger: Logger, batch_updater: BatchReleaseVersionUpdater, entries: List[ManifestEntry], fetch_remote: Optional[str] = None):
+        """
+        Arguments:
+
+        logger (Logger) - An instance of logging.Logger
+
+        batch_updater (BatchReleaseVersionUpdater) - Evaluates one repository at a time. Its `max_workers` bounds how many repositories are evaluated at once
+
+        entries (List[ManifestEntry]) - The repositories to serve. Pushes to other repositories are ignored, and so are pushes to other branches than `ref`, or the default branch if `ref` is "HEAD"
+
+        fetch_remote (Optional[str]) - Remote that the pushed ref is fetched from into the checkout at `path` before it is evaluated. If None, the checkout is expected to be up to date
+        """
+        self.logger: Logger = logger
+        self.batch_updater: BatchReleaseVersionUpdater = batch_updater
+        self.entries: Dict[str, ManifestEntry] = {f"{entry.repo_owner}/{entry.repo_name}".lower(): entry for entry in entries}
+        self.fetch_remote: Optional[str] = fetch_remote
+        self.lock: threading.Lock = threading.Lock()
+        self._idle: threading.Condition = threading.Condition(self.lock)
+        self._pending: Dict[str, PendingEvaluation] = {}
+        self._running: Set[str] = set()
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=batch_updater.max_workers, thread_name_prefix="release_version_webhook")
+        self.event_counts: Dict[str, int] = {"queued": 0, "coalesced": 0, "ignored": 0}
+        self.evaluation_counts: Dict[str, int] = {"ok": 0, "error": 0}
+        self.queue_wait_histogram: Histogram = Histogram("release_version_webhook_queue_wait_seconds", "Time from the first coalesced push to the start of its evaluation")
+        self.evaluation_histogram: Histogram = Histogram("release_version_webhook_evaluation_seconds", "Time spent evaluating a repository and updating its release version")
+
+    def _is_tracked_ref(self, entry: ManifestEntry, git_ref: str, default_branch: Optional[str]) -> bool:
+        branch: Optional[str] = default_branch if entry.ref == "HEAD" else entry.ref
+
+        return branch is not None and git_ref in (branch, f"refs/heads/{branch}")
+
+    def submit(self, push_event: Dict[str, Any]) -> str:
+        """
+        Queues an evaluation for a push event payload, see https://docs.github.com/en/webhooks/webhook-events-and-payloads#push
+
+        Returns "queued" if a new evaluation was queued, "coalesced" if the push was merged into a waiting one, or "ignored".
+        """
+        repository: Dict[str, Any] = push_event.get("repository") or {}
+        entry: Optional[ManifestEntry] = self.entries.get(str(repository.get("full_name", "")).lower())
+        git_ref: str = push_event.get("ref", "")
+        after: str = push_event.get("after") or NULL_SHA
+        if entry is None or after == NULL_SHA or not self._is_tracked_ref(entry, git_ref, repository.get("default_branch")):
+            with self.lock:
+                self.event_counts["ignored"] += 1
+            return "ignored"
+
+        repo_key: str = f"{entry.repo_owner}/{entry.repo_name}".lower()
+        with self.lock:
+            pending: Optional[PendingEvaluation] = self._pending.get(repo_key)
+            if pending is not None:
+                self._pending[repo_key] = pending._replace(after=after, push_count=pending.push_count + 1)
+                self.event_counts["coalesced"] += 1
+                return "coalesced"
+
+            self._pending[repo_key] = PendingEvaluation(entry, git_ref, push_event.get("before") or NULL_SHA, after, time.monotonic())
+            self.event_counts["queued"] += 1
+            # A running evaluation schedules the next one itself when it finishes
+            if repo_key not in self._running:
+                self._executor.submit(self._evaluate, repo_key)
+
+        return "queued"
+
+    def _get_evaluation_entry(self, pending: PendingEvaluation) -> ManifestEntry:
+        # A configured since_ref or checkpoint already covers every pushed commit. Otherwise the pushed range is analyzed
+        if pending.entry.since_ref or pending.entry.checkpoint_variable:
+            return pending.entry._replace(ref=pending.after)
+
+        return pending.entry._replace(ref=pending.after, since_ref=None if pending.before == NULL_SHA else pending.before)
+
+    def _evaluate(self, repo_key: str):
+        with self.lock:
+            pending: PendingEvaluation = self._pending.pop(repo_key)
+            self._running.add(repo_key)
+
+        status: str = "error"
+        try:
+            self.queue_wait_histogram.observe(time.monotonic() - pending.received_time)
+            start_time: float = time.monotonic()
+            report: Dict[str, Any]
+            try:
+                if self.fetch_remote:
+                    GitClient(logger=self.logger, repo_path=pending.entry.path).fetch(self.fetch_remote, pending.git_ref)
+                report = self.batch_updater.update_release_version(self._get_evaluation_entry(pending))
+            except Exception as e:
+                report = {**pending.entry._asdict(), "status": "error", "error": f"{type(e).__name__}: {e}"}
+            report["push_count"] = pending.push_count
+            self.evaluation_histogram.observe(time.monotonic() - start_time)
+            self.logger.info(json.dumps(report))
+            status = report["status"]
+        finally:
+            # Even if the evaluation failed unexpectedly, the repository must not stay marked as running, or its later pushes would be coalesced into nothing
+            with self.lock:
+                self.evaluation_counts["ok" if status == "ok" else "error"] += 1
+                self._running.discard(repo_key)
+                if repo_key in self._pending:
+                    self._executor.submit(self._evaluate, repo_key)
+                elif not self._pending and not self._running:
+                    self._idle.notify_all()
+
+    def wait_until_idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until no evaluation is queued or running. Returns False if `timeout` seconds passed first.
+        """
+        with self.lock:
+            return self._idle.wait_for(lambda: not self._pending and not self._running, timeout)
+
+    def render_metrics(self) -> str:
+        """
+        Returns the service's metrics in the Prometheus text exposition format.
+        """
+        with self.lock:
+            queue_depth: int = len(self._pending)
+            in_progress: int = len(self._running)
+            event_counts: Dict[str, int] = dict(self.event_counts)
+            evaluation_counts: Dict[str, int] = dict(self.evaluation_counts)
+
+        lines: List[str] = [
+            "# HELP release_version_webhook_queue_depth Repositories with pushes waiting to be evaluated",
+            "# TYPE release_version_webhook_queue_depth gauge",
+            f"release_version_webhook_queue_depth {queue_depth}",
+            "# HELP release_version_webhook_evaluations_in_progress Repositories being evaluated",
+            "# TYPE release_version_webhook_evaluations_in_progress gauge",
+            f"release_version_webhook_evaluations_in_progress {in_progress}",
+            "# HELP release_version_webhook_events_total Push events received, by whether they queued an evaluation, were coalesced into one or were ignored",
+            "# TYPE release_version_webhook_events_total counter"
+        ]
+        lines.extend(f'release_version_webhook_events_total{{result="{result}"}} {count}' for result, count in event_counts.items())
+        lines.extend([
+            "# HELP release_version_webhook_evaluations_total Finished evaluations, by status",
+            "# TYPE release_version_webhook_evaluations_total counter"
+        ])
+        lines.extend(f'release_version_webhook_evaluations_total{{status="{status}"}} {count}' for status, count in evaluation_counts.items())
+
+        return "\n".join(lines) + "\n" + self.queue_wait_histogram.render() + self.evaluation_histogram.render()
+
+    def close(self):
+        """
+        Waits for queued and running evaluations to finish and stops the workers.
+        """
+        self.wait_until_idle()
+        self._executor.shutdown(wait=True)
+
+
+class WebhookServer:
+    """
+    Serves GitHub push webhooks to a WebhookService on a background thread, see https://docs.github.com/en/webhooks
+
+    `POST /webhook` accepts `push` and `ping` events and answers as soon as the push is queued. `GET /metrics` serves the service's Prometheus metrics
+    and `GET /healthz` answers 200 while the server is up. If a secret is set, payloads without a matching `X-Hub-Signature-256` header are rejected with 401.
+
+    Usage:
+
+        with WebhookServer(service, port=0) as server:
+            requests.post(f"{server.base_uri}/webhook", json=push_event, headers={"X-GitHub-Event": "push"})
+    """
+    def __init__(self, service: WebhookService, host: str = "127.0.0.1", port: int = DEFAULT_PORT, secret: Optional[str] = None):
+        """
+        Arguments:
+
+        service (WebhookService) - Evaluates the pushes
+
+        host (str) - Interface to listen on
+
+        port (int) - Port to listen on. 0 picks a free port
+
+        secret (Optional[str]) - The webhook's secret, used to verify payload signatures. See https://docs.github.com/en/webhooks/using-webhooks/validating-webhook-deliveries
+        """
+        self.service: WebhookService = service
+        self.secret: Optional[bytes] = secret.encode("utf-8") if secret else None
+        self.server: ThreadingHTTPServer = ThreadingHTTPServer((host, port), self._create_handler())
+        self.server.daemon_threads = True
+        self.base_uri: str = f"http://{self.server.server_address[0]}:{self.server.server_address[1]}"
+        self._thread: Optional[threading.Thread] = None
+
+    def _is_signature_valid(self, body: bytes, signature: Optional[str]) -> bool:
+        if self.secret is None:
+            return True
+        expected_signature: str = "sha256=" + hmac.new(self.secret, body, hashlib.sha256).hexdigest()
+
+        return signature is not None and hmac.compare_digest(expected_signature, signature)
+
+    def start(self) -> "WebhookServer":
+        self._thread = threading.Thread(target=self.server.serve_forever, name="release_version_webhook_server", daemon=True)
+        self._thread.start()
+
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "WebhookServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _create_handler(self) -> type:
+        webhook_server: WebhookServer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args):
+                pass
+
+            def _send(self, status_code: int, body: bytes, content_type: str = "application/json"):
+                self.send_response(status_code)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_status(self, status_code: int, status: str):
+                self._send(status_code, json.dumps({"status": status}).encode("utf-8"))
+
+            def do_GET(self):
+                if self.path == "/metrics":
+                    self._send(200, webhook_server.service.render_metrics().encode("utf-8"), METRICS_CONTENT_TYPE)
+                elif self.path == "/healthz":
+                    self._send_status(200, "ok")
+                else:
+                    self._send_status(404, "not found")
+
+            def do_POST(self):
+                content_length: int = int(self.headers.get("Content-Length") or 0)
+                if self.path != "/webhook":
+                    self.close_connection = True
+                    self._send_status(404, "not found")
+                    return
+                if content_length > MAX_PAYLOAD_SIZE:
+                    self.close_connection = True
+                    self._send_status(413, "payload too large")
+                    return
+                body: bytes = self.rfile.read(content_length)
+
+                if not webhook_server._is_signature_valid(body, self.headers.get("X-Hub-Signature-256")):
+                    self._send_status(401, "invalid signature")
+                    return
+                event: str = self.headers.get("X-GitHub-Event", "")
+                if event == "ping":
+                    self._send_status(200, "pong")
+                    return
+                if event != "push":
+                    self._send_status(200, "ignored")
+                    return
+
+                try:
+                    push_event: Dict[str, Any] = json.loads(body)
+                except ValueError:
+                    self._send_status(400, "invalid payload")
+                    return
+                status: str = webhook_server.service.submit(push_event)
+                self._send_status(200 if status == "ignored" else 202, status)
+
+        return Handler
+
+
+def is_loopback_host(host: str) -> bool:
+    """
+    Returns whether listening on `host` only accepts connections from the local machine.
+    """
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Updates release versions in response to GitHub push webhooks.")
+    parser.add_argument("manifest", help="JSON array or NDJSON file of {repo_owner, repo_name, repo_variable, ref, path, since_ref, checkpoint_variable} entries")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on. Interfaces other than loopback require WEBHOOK_SECRET")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", DEFAULT_PORT)), help="Port to listen on")
+    parser.add_argument("--max-workers", type=int, default=int(os.environ.get("MAX_WORKERS", DEFAULT_MAX_WORKERS)), help="Maximum number of repositories evaluated at once")
+    parser.add_argument("--fetch-remote", default=None, help="Remote that pushed refs are fetched from before they are evaluated, e.g. 'origin'")
+    args = parser.parse_args()
+    secret: Optional[str] = os.environ.get("WEBHOOK_SECRET") or None
+    # Without a secret, anyone who can reach the server can trigger version updates
+    if not secret and not is_loopback_host(args.host):
+        parser.error(f"WEBHOOK_SECRET must be set to listen on {args.host}")
+
+    logger: Logger = create_logger("release_version_webhook")
+    if not secret:
+        logger.warning("WEBHOOK_SECRET is not set, so webhook deliveries are not verified")
+    cache_dir: str = os.environ.get("CACHE_DIR", "")
+    rate_limit_state_file: str = os.environ.get("RATE_LIMIT_STATE_FILE", "")
+    github_client: GitHubClient = GitHubClient(
+        github_token=os.environ["GITHUB_TOKEN"],
+        pool_maxsize=args.max_workers,
+        cache=ResponseCache(cache_dir) if cache_dir else None,
+        transport=create_transport(HttpTransportType(os.environ.get("HTTP_TRANSPORT", HttpTransportType.REQUESTS)), args.max_workers),
+        rate_limit_governor=RateLimitGovernor(rate_limit_state_file) if rate_limit_state_file else None
+    )
+    service: WebhookService = WebhookService(
+        logger=logger,
+        batch_updater=BatchReleaseVersionUpdater(
+            logger=logger,
+            github_client=github_client,
+            max_workers=args.max_workers,
+            git_backend_type=GitBackendType(os.environ.get("GIT_BACKEND", GitBackendType.NATIVE))
+        ),
+        entries=load_manifest(args.manifest),
+        fetch_remote=args.fetch_remote
+    )
+    webhook_server: WebhookServer = WebhookServer(service, host=args.host, port=args.port, secret=secret)
+
+    logger.info(f"Serving {len(service.entries)} repositories on {webhook_server.base_uri} with {args.max_workers} workers...")
+    try:
+        webhook_server.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        webhook_server.server.server_close()
+        service.close()
+        github_client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import bisect
+import threading
+from typing import List, Sequence, Tuple
+
+# Upper bounds in seconds of the default latency buckets, from a cached API call to a slow range analysis
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    """
+    Counts observations into cumulative buckets, rendered in the Prometheus text exposition format.
+
+    Usage:
+
+        histogram = Histogram("request_seconds", "Time spent handling a request")
+        histogram.observe(0.042)
+        metrics_text = histogram.render()
+
+    See https://prometheus.io/docs/instrumenting/exposition_formats/#text-based-format
+    """
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        """
+        Arguments:
+
+        name (str) - Metric name, e.g. "release_version_webhook_evaluation_seconds"
+
+        help_text (str) - Description written on the `# HELP` line
+
+        buckets (Sequence[float]) - Ascending upper bounds of the buckets. A `+Inf` bucket is always added
+        """
+        self.name: str = name
+        self.help_text: str = help_text
+        self.buckets: Tuple[float, ...] = tuple(buckets)
+        self._counts: List[int] = [0] * (len(self.buckets) + 1)
+        self._sum: float = 0.0
+        self._count: int = 0
+        self.lock: threading.Lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self.lock:
+            self._counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._sum += value
+            self._count += 1
+
+    def render(self) -> str:
+        with self.lock:
+            counts: List[int] = self._counts[:]
+            total: float = self._sum
+            count: int = self._count
+
+        lines: List[str] = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        cumulative_count: int = 0
+        for upper_bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            cumulative_count += bucket_count
+            label: str = "+Inf" if upper_bound == float("inf") else repr(upper_bound)
+            lines.append(f'{self.name}_bucket{{le="{label}"}} {cumulative_count}')
+        lines.append(f"{self.name}_sum {total}")
+        lines.append(f"{self.name}_count {count}")
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,103 @@
+from contextlib import contextmanager
+import json
+import threading
+import time
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, TextIO
+
+
+class Span(NamedTuple):
+    """
+    A timed phase of a job. `start_time` is wall-clock time for correlating with logs, while `duration_seconds` is measured on the monotonic clock.
+    """
+    name: str
+    start_time: float
+    duration_seconds: float
+    attributes: Dict[str, Any]
+
+
+class Tracer:
+    """
+    Records how long each phase of a job takes, so slow jobs can be broken down into git, API and output time.
+
+    Spans are written as JSON lines to `stream` as they finish, and can be summarized as a Markdown table, e.g. for $GITHUB_STEP_SUMMARY.
+    See https://docs.github.com/en/actions/using-workflows/workflow-commands-for-github-actions#adding-a-job-summary
+
+    Usage:
+
+        with tracer.span("github.request", method="GET") as attributes:
+            response = send()
+            attributes["status_code"] = response.status_code
+    """
+    def __init__(self, stream: Optional[TextIO] = None, enabled: bool = True):
+        """
+        Arguments:
+
+        stream (Optional[TextIO]) - Where finished spans are written as JSON lines. If None, spans are only kept in memory
+
+        enabled (bool) - If False, spans are neither timed nor recorded
+        """
+        self.stream: Optional[TextIO] = stream
+        self.enabled: bool = enabled
+        self.spans: List[Span] = []
+        self.lock: threading.Lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Times the enclosed block as a span called `name`. The yielded attributes can be added to until the block ends.
+
+        If the block raises, the exception's type is recorded under `error`.
+        """
+        if not self.enabled:
+            yield attributes
+            return
+
+        start_time: float = time.time()
+        start_counter: float = time.perf_counter()
+        try:
+            yield attributes
+        except BaseException as e:
+            attributes["error"] = type(e).__name__
+            raise
+        finally:
+            self._record(Span(name, start_time, time.perf_counter() - start_counter, attributes))
+
+    def _record(self, span: Span):
+        with self.lock:
+            self.spans.append(span)
+            if self.stream is not None:
+                self.stream.write(json.dumps({
+                    "name": span.name,
+                    "start_time": span.start_time,
+                    "duration_ms": round(span.duration_seconds * 1000, 3),
+                    **span.attributes
+                }, default=str) + "\n")
+                self.stream.flush()
+
+    def get_summary(self) -> str:
+        """
+        Returns a Markdown table of the call count, total and maximum duration, and total retries of each span name, in order of first occurrence.
+        """
+        totals: Dict[str, List[float]] = {}
+        with self.lock:
+            for span in self.spans:
+                count, total, maximum, retries = totals.setdefault(span.name, [0, 0.0, 0.0, 0])
+                totals[span.name] = [count + 1, total + span.duration_seconds, max(maximum, span.duration_seconds), retries + span.attributes.get("retries", 0)]
+
+        lines: List[str] = [
+            "| Phase | Count | Total (ms) | Max (ms) | Retries |",
+            "| --- | ---: | ---: | ---: | ---: |"
+        ]
+        lines.extend(
+            f"| {name} | {count} | {total * 1000:.1f} | {maximum * 1000:.1f} | {retries} |" for name, (count, total, maximum, retries) in totals.items()
+        )
+
+        return "\n".join(lines) + "\n"
+
+    def write_summary(self, path: str, title: str = "Timings"):
+        with open(file=path, mode="a") as summary:
+            summary.write(f"### {title}\n\n{self.get_summary()}\n")
+
+
+# Used when no tracer is given, so instrumented code needs no None checks
+NULL_TRACER: Tracer = Tracer(enabled=False)
@@ -0,0 +1,263 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import io
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+WORKSPACE_ROOT: str = os.path.abspath(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+sys.path.append(WORKSPACE_ROOT)
+sys.path.append(os.path.join(WORKSPACE_ROOT, "test"))
+from src.clients.github.github_client import GitHubClient
+from src.clients.git.git_backend import GitBackend
+from src.clients.git.git_client import GitClient
+from src.clients.git.git_repository import GitRepository
+from src.release_version_updater._types import CommitType
+from src.release_version_updater.commit_rules import CommitRules
+from src.release_version_updater.logger import create_logger
+from src.release_version_updater.release_version_updater import ReleaseVersionUpdater
+from src.release_version_updater.semver import max_version
+from benchmark.synthetic_repo import COMMIT_MSGS, PACKAGE_COUNT, ROOT_TAG, get_synthetic_repo
+from stubs.github_api_stub import GitHubApiStub
+
+DEFAULT_SIZES: List[int] = [10_000, 100_000, 1_000_000]
+DEFAULT_BASELINE: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_WORK_DIR: str = os.path.join(tempfile.gettempdir(), "update-release-version-benchmark")
+# A result regresses if it is this much worse than the baseline
+DEFAULT_TOLERANCE: float = 0.25
+MOCK_REPO_OWNER: str = "benchmark-user"
+MOCK_REPO_NAME: str = "benchmark-repo"
+MOCK_REPO_VARIABLE: str = "VERSION_NUMBER"
+MOCK_GITHUB_TOKEN: str = "benchmark-token"
+# Rules of each kind in the get_commit_type_rules benchmark, the size of a large org-wide rule set
+BENCHMARK_RULE_COUNT: int = 300
+
+
+class BenchmarkResult(NamedTuple):
+    name: str
+    size: int
+    throughput: float
+    p50_ms: float
+    p99_ms: float
+    peak_rss_kb: int
+
+
+def _percentile(samples: List[float], percentile: float) -> float:
+    ordered: List[float] = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(percentile / 100 * len(ordered)))]
+
+
+def _get_peak_rss_kb() -> int:
+    # ru_maxrss is reported in kilobytes on Linux. Children covers `git` subprocesses
+    return max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+
+
+def _create_updater(github_client: GitHubClient, git_backend: Optional[GitBackend] = None, since_ref: Optional[str] = None, commit_rules: Optional[CommitRules] = None) -> ReleaseVersionUpdater:
+    return ReleaseVersionUpdater(
+        logger=create_logger("benchmark", io.StringIO()),
+        repo_owner=MOCK_REPO_OWNER,
+        repo_name=MOCK_REPO_NAME,
+        repo_variable=MOCK_REPO_VARIABLE,
+        github_client=github_client,
+        github_output=None,
+        since_ref=since_ref,
+        git_backend=git_backend,
+        commit_rules=commit_rules
+    )
+
+
+def _time_runs(name: str, size: int, operations_per_run: int, repetitions: int, run: Callable[[], None]) -> BenchmarkResult:
+    durations: List[float] = []
+    for _ in range(repetitions):
+        start_time: float = time.perf_counter()
+        run()
+        durations.append(time.perf_counter() - start_time)
+
+    return BenchmarkResult(
+        name=name,
+        size=size,
+        throughput=operations_per_run / _percentile(durations, 50),
+        p50_ms=_percentile(durations, 50) * 1000,
+        p99_ms=_percentile(durations, 99) * 1000,
+        peak_rss_kb=_get_peak_rss_kb()
+    )
+
+
+def _time_calls(name: str, size: int, calls: Iterator[Callable[[], object]]) -> BenchmarkResult:
+    latencies: List[float] = []
+    start_time: float = time.perf_counter()
+    for call in calls:
+        call_start_time: int = time.perf_counter_ns()
+        call()
+        latencies.append((time.perf_counter_ns() - call_start_time) / 1e6)
+    duration: float = time.perf_counter() - start_time
+
+    return BenchmarkResult(
+        name=name,
+        size=size,
+        throughput=len(latencies) / duration,
+        p50_ms=_percentile(latencies, 50),
+        p99_ms=_percentile(latencies, 99),
+        peak_rss_kb=_get_peak_rss_kb()
+    )
+
+
+def benchmark_commit_retrieval(repo_dir: str, size: int, repetitions: int, backend: str) -> BenchmarkResult:
+    git_backend: GitBackend = GitRepository(repo_dir) if backend == "native" else GitClient(repo_path=repo_dir)
+
+    def _run():
+        commit_count: int = sum(1 for _ in git_backend.iter_commit_msgs(f"{ROOT_TAG}..HEAD"))
+        assert commit_count == size - 1
+
+    return _time_runs(f"commit_retrieval_{backend}", size, size - 1, repetitions, _run)
+
+
+def benchmark_get_commit_type(repo_dir: str, size: int, repetitions: int) -> BenchmarkResult:
+    release_version_updater: ReleaseVersionUpdater = _create_updater(GitHubClient(github_token=MOCK_GITHUB_TOKEN))
+    commit_msgs: List[str] = [COMMIT_MSGS[i % len(COMMIT_MSGS)].format(i=i, package=i % PACKAGE_COUNT) for i in range(size)]
+    calls: Iterator[Callable[[], CommitType]] = (
+        (lambda commit_msg=commit_msg: release_version_updater._get_commit_type(commit_msg)) for commit_msg in commit_msgs
+    )
+
+    return _time_calls("get_commit_type", size, calls)
+
+
+def benchmark_get_commit_type_rules(repo_dir: str, size: int, repetitions: int) -> BenchmarkResult:
+    # None of the rules match the synthetic messages, so every one of them has to be ruled out
+    commit_rules: CommitRules = CommitRules.from_dict({
+        "types": {f"team{i}": "patch" for i in range(BENCHMARK_RULE_COUNT)},
+        "prefixes": {f"[team-{i}]": ("patch", "minor", "major")[i % 3] for i in range(BENCHMARK_RULE_COUNT)},
+        "patterns": {f"^TEAM{i}-\\d+ ": ("patch", "minor", "major")[i % 3] for i in range(BENCHMARK_RULE_COUNT)},
+        "footers": {f"Team-{i}-Impact": ("patch", "minor", "major")[i % 3] for i in range(BENCHMARK_RULE_COUNT)}
+    })
+    release_version_updater: ReleaseVersionUpdater = _create_updater(GitHubClient(github_token=MOCK_GITHUB_TOKEN), commit_rules=commit_rules)
+    commit_msgs: List[str] = [COMMIT_MSGS[i % len(COMMIT_MSGS)].format(i=i, package=i % PACKAGE_COUNT) for i in range(size)]
+    calls: Iterator[Callable[[], CommitType]] = (
+        (lambda commit_msg=commit_msg: release_version_updater._get_commit_type(commit_msg)) for commit_msg in commit_msgs
+    )
+
+    return _time_calls("get_commit_type_rules", size, calls)
+
+
+def benchmark_increment_release_version(repo_dir: str, size: int, repetitions: int) -> BenchmarkResult:
+    release_version_updater: ReleaseVersionUpdater = _create_updater(GitHubClient(github_token=MOCK_GITHUB_TOKEN))
+    commit_types: List[CommitType] = list(CommitType)
+    calls: Iterator[Callable[[], str]] = (
+        (lambda i=i: release_version_updater._increment_release_version(f"{i % 7}.{i % 13}.{i}", commit_types[i % len(commit_types)])) for i in range(size)
+    )
+
+    return _time_calls("increment_release_version", size, calls)
+
+
+def benchmark_max_version(repo_dir: str, size: int, repetitions: int) -> BenchmarkResult:
+    # Tag names as a long-lived repository accumulates them, including prereleases, build metadata and non-version tags
+    tags: List[str] = [f"v{i % 5}.{i % 97}.{i}" + ("", "-rc.1", "-beta.2+build.7", "")[i % 4] if i % 50 else f"nightly-{i}" for i in range(size)]
+
+    def _run():
+        assert max_version(tags) is not None
+
+    return _time_runs("max_version", size, size, repetitions, _run)
+
+
+def benchmark_update_release_version(repo_dir: str, size: int, repetitions: int) -> BenchmarkResult:
+    with GitHubApiStub() as github_api_stub:
+        github_client: GitHubClient = GitHubClient(github_token=MOCK_GITHUB_TOKEN, base_uri=github_api_stub.base_uri)
+        git_repository: GitRepository = GitRepository(repo_dir)
+        release_version_updater: ReleaseVersionUpdater = _create_updater(github_client, git_repository, since_ref=ROOT_TAG)
+
+        def _run():
+            github_api_stub.set_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE, "1.0.0")
+            release_version_updater.update_release_version()
+            assert github_api_stub.get_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE) == "1.1.0"
+
+        return _time_runs("update_release_version", size, size - 1, repetitions, _run)
+
+
+BENCHMARKS: Dict[str, Callable[[str, int, int], BenchmarkResult]] = {
+    "commit_retrieval_native": lambda repo_dir, size, repetitions: benchmark_commit_retrieval(repo_dir, size, repetitions, "native"),
+    "commit_retrieval_subprocess": lambda repo_dir, size, repetitions: benchmark_commit_retrieval(repo_dir, size, repetitions, "subprocess"),
+    "get_commit_type": benchmark_get_commit_type,
+    "get_commit_type_rules": benchmark_get_commit_type_rules,
+    "increment_release_version": benchmark_increment_release_version,
+    "max_version": benchmark_max_version,
+    "update_release_version": benchmark_update_release_version
+}
+
+
+def _run_benchmark(name: str, repo_dir: str, size: int, repetitions: int) -> BenchmarkResult:
+    return BENCHMARKS[name](repo_dir, size, repetitions)
+
+
+def _get_key(result: BenchmarkResult) -> str:
+    return f"{result.name}[{result.size}]"
+
+
+def find_regressions(results: List[BenchmarkResult], baseline: Dict[str, Dict[str, float]], tolerance: float) -> List[str]:
+    """
+    Compares `results` with `baseline` and describes every metric that is more than `tolerance` worse.
+    """
+    regressions: List[str] = []
+    for result in results:
+        baseline_result: Optional[Dict[str, float]] = baseline.get(_get_key(result))
+        if baseline_result is None:
+            continue
+        if result.throughput < baseline_result["throughput"] * (1 - tolerance):
+            regressions.append(f"{_get_key(result)}: throughput {result.throughput:.0f}/s is below baseline {baseline_result['throughput']:.0f}/s")
+        if result.p99_ms > baseline_result["p99_ms"] * (1 + tolerance):
+            regressions.append(f"{_get_key(result)}: p99 {result.p99_ms:.4f} ms is above baseline {baseline_result['p99_ms']:.4f} ms")
+        if result.peak_rss_kb > baseline_result["peak_rss_kb"] * (1 + tolerance):
+            regressions.append(f"{_get_key(result)}: peak RSS {result.peak_rss_kb} KB is above baseline {baseline_result['peak_rss_kb']} KB")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks the release version updater against synthetic git histories and a local API stub.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Numbers of commits in the synthetic repositories")
+    parser.add_argument("--benchmarks", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--repetitions", type=int, default=5, help="Runs per whole-history benchmark")
+    parser.add_argument("--work-dir", default=DEFAULT_WORK_DIR, help="Where synthetic repositories are built and kept between runs")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="JSON file of baseline results")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed relative regression before failing")
+    parser.add_argument("--update-baseline", action="store_true", help="Store the results as the new baseline instead of comparing")
+    args = parser.parse_args()
+
+    os.makedirs(args.work_dir, exist_ok=True)
+    results: List[BenchmarkResult] = []
+    print(f"{'benchmark':<40}{'throughput/s':>16}{'p50 ms':>12}{'p99 ms':>12}{'peak RSS KB':>14}")
+    for size in args.sizes:
+        repo_dir: str = get_synthetic_repo(args.work_dir, size)
+        for name in args.benchmarks:
+            # Each benchmark runs in a fresh process so its peak RSS is not inflated by the ones before it
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("fork")) as executor:
+                result: BenchmarkResult = executor.submit(_run_benchmark, name, repo_dir, size, args.repetitions).result()
+            results.append(result)
+            print(f"{_get_key(result):<40}{result.throughput:>16.0f}{result.p50_ms:>12.4f}{result.p99_ms:>12.4f}{result.peak_rss_kb:>14}")
+
+    baseline: Dict[str, Dict[str, float]] = {}
+    if os.path.isfile(args.baseline):
+        with open(file=args.baseline, mode="r") as baseline_file:
+            baseline = json.load(baseline_file)
+
+    if args.update_baseline:
+        baseline.update({_get_key(result): result._asdict() for result in results})
+        with open(file=args.baseline, mode="w") as baseline_file:
+            json.dump(baseline, baseline_file, indent=4, sort_keys=True)
+            baseline_file.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    regressions: List[str] = find_regressions(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import os
+import shutil
+import subprocess
+from subprocess import Popen, PIPE
+from typing import BinaryIO, List
+
+# Cycled through to give a realistic mix of commit types. There is deliberately no breaking change, so range analysis has to walk the whole history
+COMMIT_MSGS: List[str] = [
+    "feat(pkg{package}): Added option {i}",
+    "fix: Fixed bug {i}\n\nThe bug was caused by an off-by-one error in the parser.\n\nRefs: #{i}",
+    "chore: Bumped dependency {i}",
+    "docs: Updated README for change {i}",
+    "refactor(pkg{package}): Simplified module {i}",
+    "Merge pull request #{i} from example/branch-{i}\n\nfix: Merged fix {i}",
+    "perf: Cached lookup {i}",
+    "test: Added regression test {i}"
+]
+PACKAGE_COUNT: int = 80
+ROOT_TAG: str = "bench-root"
+# Written into the git directory once a repository is fully built, so interrupted builds are redone
+COMPLETE_MARKER: str = "synthetic-repo-complete"
+
+
+def build_synthetic_repo(repo_dir: str, commit_count: int):
+    """
+    Creates a repository at `repo_dir` with a linear history of `commit_count` commits using `git fast-import`.
+
+    Each commit changes one file under `packages/pkg*/`, and the root commit is tagged as ROOT_TAG.
+    The history is deterministic, so repositories of the same size are interchangeable between runs.
+    """
+    subprocess.run(["git", "init", "-q", "-b", "main", repo_dir], check=True)
+    fast_import: Popen = subprocess.Popen(
+        ["git", "fast-import", "--quiet", "--done"],
+        cwd=repo_dir,
+        stdin=PIPE
+    )
+    stream: BinaryIO = fast_import.stdin
+    for i in range(1, commit_count + 1):
+        package: int = i % PACKAGE_COUNT
+        commit_msg: bytes = COMMIT_MSGS[i % len(COMMIT_MSGS)].format(i=i, package=package).encode("utf-8")
+        content: bytes = f"{i}\n".encode("utf-8")
+        stream.write(b"commit refs/heads/main\n")
+        stream.write(b"mark :%d\n" % i)
+        stream.write(b"committer Benchmark <benchmark@example.com> %d +0000\n" % (1_600_000_000 + i))
+        stream.write(b"data %d\n%s\n" % (len(commit_msg), commit_msg))
+        if i > 1:
+            stream.write(b"from :%d\n" % (i - 1))
+        stream.write(b"M 644 inline packages/pkg%d/file.txt\n" % package)
+        stream.write(b"data %d\n%s\n" % (len(content), content))
+    stream.write(b"reset refs/tags/%s\nfrom :1\n\n" % ROOT_TAG.encode("utf-8"))
+    stream.write(b"done\n")
+    stream.close()
+
+    if fast_import.wait() != 0:
+        raise ChildProcessError(f"git fast-import failed with exit code {fast_import.returncode}")
+    subprocess.run(["git", "checkout", "-q", "main"], cwd=repo_dir, check=True)
+
+
+def get_synthetic_repo(work_dir: str, commit_count: int) -> str:
+    """
+    Returns the path of a synthetic repository with `commit_count` commits under `work_dir`, building it on first use.
+    """
+    repo_dir: str = os.path.join(work_dir, f"repo-{commit_count}")
+    complete_marker: str = os.path.join(repo_dir, ".git", COMPLETE_MARKER)
+    if not os.path.isfile(complete_marker):
+        shutil.rmtree(repo_dir, ignore_errors=True)
+        build_synthetic_repo(repo_dir, commit_count)
+        with open(file=complete_marker, mode="w"):
+            pass
+
+    return repo_dir
@@ -0,0 +1,320 @@
+import argparse
+from collections import Counter, deque
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+VARIABLE_PATH_PATTERN: re.Pattern = re.compile(r"^/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/actions/variables/(?P<name>[^/]+)$")
+VARIABLES_PATH_PATTERN: re.Pattern = re.compile(r"^/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/actions/variables$")
+DEFAULT_PER_PAGE: int = 30
+MAX_PER_PAGE: int = 30
+# Status codes picked from when `error_rate` injects a random fault
+RANDOM_FAULT_STATUS_CODES: Tuple[int, ...] = (429, 500, 502, 503)
+
+
+class Fault(NamedTuple):
+    status_code: int
+    retry_after: Optional[str] = None
+    # Whether the response breaks off in the middle of a chunked body instead of carrying an error
+    truncated: bool = False
+
+
+class GitHubApiStub:
+    """
+    A local stand-in for the GitHub REST API's repository variable endpoints, served from memory on a background thread.
+
+    It implements getting, creating, updating and listing repository variables, answers `If-None-Match` with 304, and can delay responses, inject 429/5xx faults and break off response bodies.
+    With a `rate_limit`, every response carries `X-RateLimit-*` headers and requests beyond the limit of the current window are answered with 403.
+    Requests are counted per method and responses per status code, and the highest number of requests handled at once is tracked, so client throughput, retries and concurrency limits can be measured without network access.
+
+    Usage:
+
+        with GitHubApiStub(latency=0.01) as stub:
+            stub.set_variable("owner", "repo", "VERSION", "1.0.0")
+            stub.fail_next(503, retry_after="1")
+            github_client = GitHubClient(github_token="token", base_uri=stub.base_uri)
+
+    It can also be run on its own, e.g. for a client in another process:
+
+        python3 test/stubs/github_api_stub.py --port 8080 --latency 0.05 --error-rate 0.1
+    """
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, error_rate: float = 0.0, retry_after: Optional[str] = None, seed: Optional[int] = None, rate_limit: Optional[int] = None, rate_limit_window: float = 3600.0):
+        """
+        Arguments:
+
+        host (str) - Interface to listen on
+
+        port (int) - Port to listen on. 0 picks a free port
+
+        latency (float) - Seconds every request is delayed before it is answered
+
+        error_rate (float) - Fraction of requests answered with a random 429 or 5xx instead of being handled
+
+        retry_after (Optional[str]) - `Retry-After` header sent with randomly injected faults
+
+        seed (Optional[int]) - Seed for the random faults, so runs are reproducible
+
+        rate_limit (Optional[int]) - Number of requests allowed per rate limit window. If None, requests are not limited
+
+        rate_limit_window (float) - Seconds from the first request of a window until the limit resets
+        """
+        self.variables: Dict[Tuple[str, str, str], str] = {}
+        self.latency: float = latency
+        self.error_rate: float = error_rate
+        self.retry_after: Optional[str] = retry_after
+        self.request_counts: Counter = Counter()
+        self.status_code_counts: Counter = Counter()
+        self.max_concurrent_requests: int = 0
+        self.lock: threading.Lock = threading.Lock()
+        self._random: random.Random = random.Random(seed)
+        self._faults: Deque[Fault] = deque()
+        self._concurrent_requests: int = 0
+        self.rate_limit: Optional[int] = rate_limit
+        self.rate_limit_window: float = rate_limit_window
+        self._rate_limit_used: int = 0
+        self._rate_limit_reset: float = 0.0
+        self.server: ThreadingHTTPServer = ThreadingHTTPServer((host, port), self._create_handler())
+        self.server.daemon_threads = True
+        self.base_uri: str = f"http://{self.server.server_address[0]}:{self.server.server_address[1]}"
+        self._thread: Optional[threading.Thread] = None
+
+    def set_variable(self, owner: str, repo: str, name: str, value: str):
+        with self.lock:
+            self.variables[(owner, repo, name)] = value
+
+    def get_variable(self, owner: str, repo: str, name: str) -> Optional[str]:
+        with self.lock:
+            return self.variables.get((owner, repo, name))
+
+    def list_variables(self, owner: str, repo: str) -> List[Tuple[str, str]]:
+        with self.lock:
+            return sorted((name, value) for (variable_owner, variable_repo, name), value in self.variables.items() if (variable_owner, variable_repo) == (owner, repo))
+
+    def fail_next(self, status_code: int, count: int = 1, retry_after: Optional[str] = None):
+        """
+        Answers the next `count` requests with `status_code`, optionally with a `Retry-After` header.
+        """
+        with self.lock:
+            self._faults.extend([Fault(status_code, retry_after)] * count)
+
+    def truncate_next(self, count: int = 1):
+        """
+        Answers the next `count` requests with a chunked 200 response whose body breaks off when the connection is closed mid-chunk.
+        """
+        with self.lock:
+            self._faults.extend([Fault(200, truncated=True)] * count)
+
+    def reset_stats(self):
+        with self.lock:
+            self.request_counts.clear()
+            self.status_code_counts.clear()
+            self.max_concurrent_requests = 0
+
+    def _take_fault(self) -> Optional[Fault]:
+        with self.lock:
+            if self._faults:
+                return self._faults.popleft()
+            if self.error_rate and self._random.random() < self.error_rate:
+                return Fault(self._random.choice(RANDOM_FAULT_STATUS_CODES), self.retry_after)
+
+        return None
+
+    def _take_rate_limit(self) -> Tuple[bool, Dict[str, str]]:
+        """
+        Counts a request against the rate limit and returns whether it is allowed, along with the rate limit headers to send.
+        """
+        if self.rate_limit is None:
+            return True, {}
+        with self.lock:
+            now: float = time.time()
+            if now >= self._rate_limit_reset:
+                self._rate_limit_reset = now + self.rate_limit_window
+                self._rate_limit_used = 0
+            allowed: bool = self._rate_limit_used < self.rate_limit
+            if allowed:
+                self._rate_limit_used += 1
+
+            return allowed, {
+                "X-RateLimit-Limit": str(self.rate_limit),
+                "X-RateLimit-Remaining": str(self.rate_limit - self._rate_limit_used),
+                "X-RateLimit-Used": str(self._rate_limit_used),
+                "X-RateLimit-Reset": str(math.ceil(self._rate_limit_reset))
+            }
+
+    def _enter_request(self, method: str):
+        with self.lock:
+            self.request_counts[method] += 1
+            self._concurrent_requests += 1
+            self.max_concurrent_requests = max(self.max_concurrent_requests, self._concurrent_requests)
+
+    def _exit_request(self):
+        with self.lock:
+            self._concurrent_requests -= 1
+
+    def start(self) -> "GitHubApiStub":
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "GitHubApiStub":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _create_handler(self) -> type:
+        stub: GitHubApiStub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            rate_limit_headers: Dict[str, str] = {}
+
+            def log_message(self, format: str, *args):
+                pass
+
+            def _send_json(self, status_code: int, body: Optional[dict] = None, headers: Optional[Dict[str, str]] = None):
+                content: bytes = json.dumps(body).encode("utf-8") if body is not None else b""
+                with stub.lock:
+                    stub.status_code_counts[status_code] += 1
+                self.send_response(status_code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                for header, value in {**self.rate_limit_headers, **(headers or {})}.items():
+                    self.send_header(header, value)
+                self.end_headers()
+                self.wfile.write(content)
+
+            def _send_truncated(self):
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                # The chunk announces more bytes than are sent before the connection is closed
+                self.wfile.write(b'40\r\n{"name": ')
+                self.wfile.flush()
+                self.close_connection = True
+
+            def _handle(self, handle_request):
+                stub._enter_request(self.command)
+                try:
+                    if stub.latency:
+                        time.sleep(stub.latency)
+                    # The body is read even when a fault is injected, so the connection can be reused
+                    content_length: int = int(self.headers.get("Content-Length", 0))
+                    body: bytes = self.rfile.read(content_length) if content_length else b""
+                    allowed, self.rate_limit_headers = stub._take_rate_limit()
+                    if not allowed:
+                        self._send_json(403, {"message": "API rate limit exceeded"})
+                        return
+                    fault: Optional[Fault] = stub._take_fault()
+                    if fault is not None and fault.truncated:
+                        self._send_truncated()
+                        return
+                    if fault is not None:
+                        self._send_json(fault.status_code, {"message": "Injected fault"}, {"Retry-After": fault.retry_after} if fault.retry_after else None)
+                        return
+                    handle_request(body)
+                finally:
+                    stub._exit_request()
+
+            def do_GET(self):
+                self._handle(self._get)
+
+            def do_PATCH(self):
+                self._handle(self._patch)
+
+            def do_POST(self):
+                self._handle(self._post)
+
+            def _get(self, body: bytes):
+                url = urlsplit(self.path)
+                variables_match: Optional[re.Match] = VARIABLES_PATH_PATTERN.match(url.path)
+                if variables_match:
+                    self._list(variables_match, parse_qs(url.query))
+                    return
+
+                match: Optional[re.Match] = VARIABLE_PATH_PATTERN.match(url.path)
+                value: Optional[str] = stub.get_variable(*match.groups()) if match else None
+                if value is None:
+                    self._send_json(404, {"message": "Not Found"})
+                    return
+                etag: str = f'W/"{hashlib.sha256(value.encode("utf-8")).hexdigest()}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self._send_json(304, headers={"ETag": etag})
+                    return
+                self._send_json(200, {"name": match["name"], "value": value}, {"ETag": etag})
+
+            def _list(self, match: re.Match, query: Dict[str, List[str]]):
+                per_page: int = min(int(query.get("per_page", [DEFAULT_PER_PAGE])[0]), MAX_PER_PAGE)
+                page: int = int(query.get("page", ["1"])[0])
+                variables: List[Tuple[str, str]] = stub.list_variables(match["owner"], match["repo"])
+                page_variables: List[Tuple[str, str]] = variables[(page - 1) * per_page:page * per_page]
+                headers: Dict[str, str] = {}
+                if page * per_page < len(variables):
+                    headers["Link"] = f'<{stub.base_uri}{match.group(0)}?per_page={per_page}&page={page + 1}>; rel="next"'
+                self._send_json(200, {
+                    "total_count": len(variables),
+                    "variables": [{"name": name, "value": value} for name, value in page_variables]
+                }, headers)
+
+            def _patch(self, body: bytes):
+                match: Optional[re.Match] = VARIABLE_PATH_PATTERN.match(self.path)
+                if match is None or stub.get_variable(*match.groups()) is None:
+                    self._send_json(404, {"message": "Not Found"})
+                    return
+                stub.set_variable(match["owner"], match["repo"], match["name"], json.loads(body or b"{}")["value"])
+                self._send_json(204)
+
+            def _post(self, body: bytes):
+                match: Optional[re.Match] = VARIABLES_PATH_PATTERN.match(self.path)
+                if match is None:
+                    self._send_json(404, {"message": "Not Found"})
+                    return
+                variable: dict = json.loads(body or b"{}")
+                if stub.get_variable(match["owner"], match["repo"], variable["name"]) is not None:
+                    self._send_json(409, {"message": "Already exists"})
+                    return
+                stub.set_variable(match["owner"], match["repo"], variable["name"], variable["value"])
+                self._send_json(201, {})
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serves a local stand-in for the GitHub repository variable API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds every request is delayed")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with a random 429 or 5xx")
+    parser.add_argument("--retry-after", help="Retry-After header sent with injected faults")
+    parser.add_argument("--seed", type=int, help="Seed for the injected faults")
+    parser.add_argument("--rate-limit", type=int, help="Requests allowed per rate limit window")
+    parser.add_argument("--rate-limit-window", type=float, default=3600.0, help="Seconds until the rate limit resets")
+    parser.add_argument("--variable", action="append", default=[], metavar="OWNER/REPO/NAME=VALUE", help="Variable to serve. Can be repeated")
+    args = parser.parse_args()
+
+    stub: GitHubApiStub = GitHubApiStub(args.host, args.port, args.latency, args.error_rate, args.retry_after, args.seed, args.rate_limit, args.rate_limit_window)
+    for variable in args.variable:
+        key, _, value = variable.partition("=")
+        stub.set_variable(*key.split("/", 2), value)
+    print(f"Serving the GitHub API stub at {stub.base_uri}", flush=True)
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        stub.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List
+import unittest
+from unittest.mock import MagicMock
+from requests import Response
+WORKSPACE_ROOT: str = os.path.abspath(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+sys.path.append(WORKSPACE_ROOT)
+from src.release_version_updater._types import ManifestEntry
+from src.release_version_updater.batch import BatchReleaseVersionUpdater, load_manifest
+from src.release_version_updater.logger import create_logger
+
+LOGGER = create_logger("test_batch", io.StringIO())
+MOCK_REPO_OWNER: str = "test-user"
+MOCK_REPO_VARIABLE: str = "VERSION_NUMBER"
+MOCK_API_LATENCY: float = 0.2
+
+
+class TestBatchReleaseVersionUpdater(unittest.TestCase):
+    def setUp(self):
+        self.repo_dir: str = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.repo_dir, ignore_errors=True)
+        git_cmd: List[str] = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+        subprocess.run(["git", "init", "-q", self.repo_dir], check=True)
+        for commit_msg in ["chore: Initial commit", "feat: Added option", "fix: Fixed bug"]:
+            subprocess.run(git_cmd + ["commit", "-q", "--allow-empty", "-m", commit_msg], cwd=self.repo_dir, check=True)
+
+        self.github_client = MagicMock()
+        self.in_flight: int = 0
+        self.max_in_flight: int = 0
+        lock: threading.Lock = threading.Lock()
+
+        def _get_repository_variable(repo_owner: str, repo_name: str, variable: str) -> Response:
+            with lock:
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            time.sleep(MOCK_API_LATENCY)
+            with lock:
+                self.in_flight -= 1
+            response: Response = Response()
+            response.status_code = 200
+            response._content = json.dumps({"name": variable, "value": "1.0.0"}).encode("utf-8")
+            return response
+
+        self.github_client.get_repository_variable.side_effect = _get_repository_variable
+
+    def _run(self, entries: List[ManifestEntry], max_workers: int) -> List[Dict[str, Any]]:
+        batch_updater: BatchReleaseVersionUpdater = BatchReleaseVersionUpdater(
+            logger=LOGGER,
+            github_client=self.github_client,
+            max_workers=max_workers
+        )
+        report: io.StringIO = io.StringIO()
+        batch_updater.update_release_versions(entries, report)
+
+        return [json.loads(line) for line in report.getvalue().splitlines()]
+
+    def test_update_release_versions(self):
+        entries: List[ManifestEntry] = [
+            ManifestEntry(MOCK_REPO_OWNER, "repo-latest", MOCK_REPO_VARIABLE, path=self.repo_dir),
+            ManifestEntry(MOCK_REPO_OWNER, "repo-range", MOCK_REPO_VARIABLE, path=self.repo_dir, since_ref="HEAD~2"),
+            ManifestEntry(MOCK_REPO_OWNER, "repo-ref", MOCK_REPO_VARIABLE, ref="HEAD~2", path=self.repo_dir),
+            ManifestEntry(MOCK_REPO_OWNER, "repo-missing", MOCK_REPO_VARIABLE, path=os.path.join(tempfile.gettempdir(), "missing-repo"))
+        ]
+
+        reports: Dict[str, Dict[str, Any]] = {report["repo_name"]: report for report in self._run(entries, max_workers=4)}
+
+        assert reports["repo-latest"]["status"] == "ok"
+        assert reports["repo-latest"]["release_version"] == "1.0.1"
+        assert reports["repo-range"]["release_version"] == "1.1.0"
+        assert reports["repo-ref"]["release_version"] == "1.0.0"
+        assert reports["repo-missing"]["status"] == "error"
+
+    def test_concurrency_is_bounded(self):
+        entries: List[ManifestEntry] = [ManifestEntry(MOCK_REPO_OWNER, f"repo-{i}", MOCK_REPO_VARIABLE, path=self.repo_dir) for i in range(12)]
+
+        start_time: float = time.monotonic()
+        reports: List[Dict[str, Any]] = self._run(entries, max_workers=4)
+        duration: float = time.monotonic() - start_time
+
+        assert len(reports) == 12
+        assert self.max_in_flight == 4
+        # 12 repos at 4 at a time take 3 rounds of API latency, not 12
+        assert duration < 6 * MOCK_API_LATENCY
+
+    def test_load_manifest(self):
+        manifest_path: str = os.path.join(self.repo_dir, "manifest.ndjson")
+        with open(file=manifest_path, mode="w") as manifest_file:
+            manifest_file.write(json.dumps({"repo_owner": MOCK_REPO_OWNER, "repo_name": "a", "repo_variable": MOCK_REPO_VARIABLE}) + "\n")
+            manifest_file.write(json.dumps({"repo_owner": MOCK_REPO_OWNER, "repo_name": "b", "repo_variable": MOCK_REPO_VARIABLE, "ref": "main"}) + "\n")
+
+        entries: List[ManifestEntry] = load_manifest(manifest_path)
+
+        assert entries == [
+            ManifestEntry(MOCK_REPO_OWNER, "a", MOCK_REPO_VARIABLE),
+            ManifestEntry(MOCK_REPO_OWNER, "b", MOCK_REPO_VARIABLE, ref="main")
+        ]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import io
+import os
+import sys
+import unittest
+WORKSPACE_ROOT: str = os.path.abspath(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+sys.path.append(WORKSPACE_ROOT)
+from src.release_version_updater._types import CommitType
+from src.release_version_updater.changelog import ChangelogWriter
+
+
+class TestChangelogWriter(unittest.TestCase):
+    def test_sections(self):
+        with ChangelogWriter() as changelog:
+            commit_types = [changelog.add(commit_msg) for commit_msg in [
+                "fix(api): Handled empty input",
+                "chore: Bumped dependencies",
+                "perf: Cached lookups",
+                "feat!: Removed legacy flag",
+                "feat(web): Added page",
+                "Merge branch 'main'",
+                "docs: Updated README\n\nBREAKING CHANGE: Docs moved"
+            ]]
+            stream: io.StringIO = io.StringIO()
+            changelog.write(stream)
+
+        assert commit_types == [CommitType.PATCH, CommitType.OTHER, CommitType.PATCH, CommitType.MAJOR, CommitType.MINOR, CommitType.OTHER, CommitType.MAJOR]
+        assert stream.getvalue() == (
+            "### Breaking changes\n- Removed legacy flag\n- Updated README\n"
+            "\n### Features\n- **web:** Added page\n"
+            "\n### Fixes\n- **api:** Handled empty input\n"
+            "\n### Performance\n- Cached lookups\n"
+        )
+
+    def test_spills_to_disk(self):
+        with ChangelogWriter(spool_size=64) as changelog:
+            for i in range(1000):
+                changelog.add(f"fix: Fixed bug {i}")
+            stream: io.StringIO = io.StringIO()
+            changelog.write(stream)
+            # Writing twice gives the same changelog
+            second_stream: io.StringIO = io.StringIO()
+            changelog.write(second_stream)
+
+        lines = stream.getvalue().splitlines()
+        assert lines[0] == "### Fixes"
+        assert lines[1:] == [f"- Fixed bug {i}" for i in range(1000)]
+        assert second_stream.getvalue() == stream.getvalue()
+
+    def test_empty(self):
+        with ChangelogWriter() as changelog:
+            changelog.add("chore: Tidied up")
+            stream: io.StringIO = io.StringIO()
+            changelog.write(stream)
+
+        assert stream.getvalue() == ""
+
+
+if __name__ == "__main__":
+    unittest.main()
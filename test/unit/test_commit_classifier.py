@@ -0,0 +1,60 @@
+import os
+import sys
+from typing import List
+import unittest
+WORKSPACE_ROOT: str = os.path.abspath(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+sys.path.append(WORKSPACE_ROOT)
+from src.release_version_updater._types import CommitType, ConventionalCommit
+from src.release_version_updater.commit_classifier import CommitClassifier
+
+
+class TestCommitClassifier(unittest.TestCase):
+    def setUp(self):
+        self.commit_classifier: CommitClassifier = CommitClassifier()
+
+    def test_classify_scope(self):
+        assert self.commit_classifier.classify("feat(api): Added endpoint") == CommitType.MINOR
+        assert self.commit_classifier.classify("fix(parser): Handled empty input") == CommitType.PATCH
+
+    def test_classify_breaking_marker(self):
+        assert self.commit_classifier.classify("fix!: Changed default") == CommitType.MAJOR
+        assert self.commit_classifier.classify("refactor(api)!: Renamed endpoint") == CommitType.MAJOR
+
+    def test_classify_breaking_footer(self):
+        commit_msg: str = "feat: Added option\n\nSome details.\n\nBREAKING CHANGE: The old option was removed\nRefs: #123\n"
+        assert self.commit_classifier.classify(commit_msg) == CommitType.MAJOR
+        assert self.commit_classifier.classify("docs: Updated README\n\nBREAKING-CHANGE: Docs moved\n") == CommitType.MAJOR
+
+    def test_classify_breaking_header(self):
+        assert self.commit_classifier.classify("BREAKING CHANGE: Deprecated legacy API endpoint") == CommitType.MAJOR
+        assert self.commit_classifier.classify("BREAKING-CHANGE: Deprecated legacy API endpoint") == CommitType.MAJOR
+
+    def test_classify_case_insensitive_type(self):
+        assert self.commit_classifier.classify("Feat: Added option") == CommitType.MINOR
+        assert self.commit_classifier.classify("PERF: Cached lookups") == CommitType.PATCH
+
+    def test_classify_other(self):
+        for commit_msg in ["Created files", "featured: Not a type", "Merge branch 'feat: x'", "chore: Mentioned BREAKING CHANGE: inline", ""]:
+            assert self.commit_classifier.classify(commit_msg) == CommitType.OTHER, commit_msg
+
+    def test_parse(self):
+        conventional_commit: ConventionalCommit = self.commit_classifier.parse("feat(api)!: Removed v1 endpoints\n\nBody")
+
+        assert conventional_commit == ConventionalCommit(
+            type="feat",
+            scope="api",
+            description="Removed v1 endpoints",
+            is_breaking=True,
+            commit_type=CommitType.MAJOR
+        )
+
+    def test_classify_many(self):
+        commit_msgs: List[str] = ["fix: a", "feat: b", "chore: c"]
+
+        assert list(self.commit_classifier.classify_many(commit_msgs)) == [CommitType.PATCH, CommitType.MINOR, CommitType.OTHER]
+        assert self.commit_classifier.get_highest_commit_type(commit_msgs) == CommitType.MINOR
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+from typing import Dict
+import unittest
+WORKSPACE_ROOT: str = os.path.abspath(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+sys.path.append(WORKSPACE_ROOT)
+from src.release_version_updater._types import CommitType
+from src.release_version_updater.commit_classifier import CommitClassifier
+from src.release_version_updater.commit_rules import CommitRules, load_commit_rules
+
+RULES: Dict[str, Dict[str, str]] = {
+    "types": {"deps": "patch", "security": "patch", "refactor": "other"},
+    "prefixes": {"[breaking]": "major", "[sec]": "patch", "[sec-feature]": "minor"},
+    "patterns": {r"^[A-Z]+-\d+ feature\b": "minor", r"(?i:hotfix)": "patch"},
+    "footers": {"Security-Impact": "patch", "Feature-Flag": "minor"}
+}
+
+
+class TestCommitRules(unittest.TestCase):
+    def setUp(self):
+        self.commit_classifier: CommitClassifier = CommitClassifier(rules=CommitRules.from_dict(RULES))
+
+    def test_types(self):
+        assert self.commit_classifier.classify("deps(npm): Bumped lodash") == CommitType.PATCH
+        assert self.commit_classifier.classify("Security: Rotated keys") == CommitType.PATCH
+        assert self.commit_classifier.classify("refactor: Renamed module") == CommitType.OTHER
+        # Built-in types are kept
+        assert self.commit_classifier.classify("feat: Added option") == CommitType.MINOR
+        assert self.commit_classifier.classify("refactor!: Removed module") == CommitType.MAJOR
+
+    def test_prefixes(self):
+        assert self.commit_classifier.classify("[BREAKING] Dropped Python 3.8") == CommitType.MAJOR
+        assert self.commit_classifier.classify("[sec] Escaped output") == CommitType.PATCH
+        # The most significant of several matching prefixes wins
+        assert self.commit_classifier.classify("[sec-feature] Added 2FA") == CommitType.MINOR
+        assert self.commit_classifier.classify("[se] Not a prefix") == CommitType.OTHER
+
+    def test_patterns(self):
+        assert self.commit_classifier.classify("PROJ-123 feature: Added export") == CommitType.MINOR
+        assert self.commit_classifier.classify("Urgent HOTFIX for login") == CommitType.PATCH
+        # Patterns only search the header
+        assert self.commit_classifier.classify("Updated docs\n\nPROJ-123 feature") == CommitType.OTHER
+
+    def test_footers(self):
+        assert self.commit_classifier.classify("chore: Bumped base image\n\nSecurity-Impact: high") == CommitType.PATCH
+        assert self.commit_classifier.classify("Updated flags\n\nRefs: #12\nfeature-flag #new-ui\n") == CommitType.MINOR
+        assert self.commit_classifier.classify("Security-Impact: none") == CommitType.OTHER
+
+    def test_rules_only_raise(self):
+        assert self.commit_classifier.classify("feat: Added page\n\nSecurity-Impact: low") == CommitType.MINOR
+        assert self.commit_classifier.classify("fix: Fixed crash\n\nFeature-Flag: crash-fix") == CommitType.MINOR
+
+    def test_many_rules(self):
+        rules: Dict[str, Dict[str, str]] = {
+            "prefixes": {f"[team-{i}]": ("patch", "minor")[i % 2] for i in range(500)},
+            "patterns": {f"^TEAM{i}-\\d+ breaking\\b": "major" for i in range(500)},
+            "footers": {f"Team-{i}-Impact": "minor" for i in range(500)}
+        }
+        commit_classifier: CommitClassifier = CommitClassifier(rules=CommitRules.from_dict(rules))
+
+        assert commit_classifier.classify("[team-498] Tuned cache") == CommitType.PATCH
+        assert commit_classifier.classify("[team-499] Added cache") == CommitType.MINOR
+        assert commit_classifier.classify("TEAM377-42 breaking change to the API") == CommitType.MAJOR
+        assert commit_classifier.classify("Tuned cache\n\nTeam-250-Impact: low") == CommitType.MINOR
+        assert commit_classifier.classify("[team-5000] Tuned cache") == CommitType.OTHER
+
+    def test_invalid_rules(self):
+        for rules in [
+            {"regexes": {}},
+            {"types": {"deps": "micro"}},
+            {"types": ["deps"]},
+            {"patterns": {"(unclosed": "patch"}},
+            {"patterns": {r"(a)\1": "patch"}},
+            {"patterns": {"(?i)hotfix": "patch"}},
+            {"patterns": {r"(?P<r0>hotfix)": "patch"}}
+        ]:
+            with self.assertRaises(ValueError):
+                CommitRules.from_dict(rules)
+
+    def test_named_groups(self):
+        # Patterns of different commit types are combined separately, so they can reuse group names
+        commit_classifier: CommitClassifier = CommitClassifier(rules=CommitRules.from_dict({
+            "patterns": {r"^(?P<ticket>[A-Z]+-\d+) fix\b": "patch", r"^(?P<ticket>[A-Z]+-\d+) feature\b": "minor"}
+        }))
+        assert commit_classifier.classify("PROJ-1 fix: Fixed export") == CommitType.PATCH
+        assert commit_classifier.classify("PROJ-1 feature: Added export") == CommitType.MINOR
+
+        with self.assertRaisesRegex(ValueError, r"Pattern '\(\?P<ticket>BUG-\\d\+\)' cannot be combined"):
+            CommitRules.from_dict({"patterns": {r"(?P<ticket>[A-Z]+-\d+) fix": "patch", r"hotfix": "patch", r"(?P<ticket>BUG-\d+)": "patch"}})
+
+    def test_invalid_rule_file(self):
+        rules_dir: str = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, rules_dir, ignore_errors=True)
+        rules_path: str = os.path.join(rules_dir, "rules.json")
+        with open(file=rules_path, mode="w") as rules_file:
+            json.dump({"patterns": {"(?P<id>A)": "patch", "(?P<id>B)": "patch"}}, rules_file)
+
+        with self.assertRaisesRegex(ValueError, f"Invalid rule file {re.escape(rules_path)}: Pattern '\\(\\?P<id>B\\)'"):
+            load_commit_rules(rules_path)
+
+    def test_load_commit_rules(self):
+        rules_dir: str = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, rules_dir, ignore_errors=True)
+        json_path: str = os.path.join(rules_dir, "rules.json")
+        with open(file=json_path, mode="w") as rules_file:
+            json.dump(RULES, rules_file)
+        yaml_path: str = os.path.join(rules_dir, "rules.yml")
+        with open(file=yaml_path, mode="w") as rules_file:
+            rules_file.write('types:\n  deps: patch\nfooters:\n  Security-Impact: PATCH\npatterns:\n  "^[A-Z]+-\\\\d+ feature\\\\b": minor\n')
+
+        for rules_path in [json_path, yaml_path]:
+            commit_classifier: CommitClassifier = CommitClassifier(rules=load_commit_rules(rules_path))
+            assert commit_classifier.classify("deps: Bumped lodash") == CommitType.PATCH
+            assert commit_classifier.classify("Bumped image\n\nSecurity-Impact: high") == CommitType.PATCH
+            assert commit_classifier.classify("PROJ-1 feature: Added export") == CommitType.MINOR
+
+
+if __name__ == "__main__":
+    unittest.main()
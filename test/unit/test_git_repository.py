@@ -0,0 +1,320 @@
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List
+import unittest
+from unittest.mock import patch
+WORKSPACE_ROOT: str = os.path.abspath(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+sys.path.append(WORKSPACE_ROOT)
+from src.clients.git._types import GitObjectType
+from src.clients.git.git_client import GitClient
+from src.clients.git.git_repository import GitRepository
+
+GIT_CMD: List[str] = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", "-c", "gc.auto=0"]
+
+
+class TestGitRepository(unittest.TestCase):
+    def setUp(self):
+        self.repo_dir: str = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.repo_dir, ignore_errors=True)
+        self._git("init", "-q", "-b", "main")
+        for i in range(30):
+            # Slightly different versions of a large file make `git gc` store most of them as deltas
+            with open(file=os.path.join(self.repo_dir, "file.txt"), mode="w") as file:
+                file.write("\n".join(f"line {j}" for j in range(500 + i)))
+            self._git("add", "file.txt")
+            self._git("commit", "-q", "-m", f"fix: Change {i}\n\nBody of change {i}")
+        self._git("tag", "-a", "v1.0.0", "-m", "Release 1.0.0", "HEAD~10")
+        self.git_client: GitClient = GitClient(repo_path=self.repo_dir)
+
+    def _git(self, *args: str) -> str:
+        return subprocess.run(GIT_CMD + list(args), cwd=self.repo_dir, check=True, capture_output=True).stdout.decode("utf-8")
+
+    def _assert_matches_git(self):
+        git_repository: GitRepository = GitRepository(self.repo_dir)
+        self.addCleanup(git_repository.close)
+
+        assert git_repository.get_latest_commit_msg() == self.git_client.get_latest_commit_msg()
+        for revision_range in ["v1.0.0..HEAD", "HEAD~3..main", "v1.0.0"]:
+            assert list(git_repository.iter_commit_msgs(revision_range)) == list(self.git_client.iter_commit_msgs(revision_range))
+            assert list(git_repository.iter_commit_shas(revision_range)) == self._git("rev-list", revision_range).split()
+            assert list(self.git_client.iter_commit_shas(revision_range)) == self._git("rev-list", revision_range).split()
+        for revision in ["HEAD", "HEAD~5", "HEAD^", "v1.0.0", "main~2^"]:
+            assert git_repository.rev_parse(revision) == self._git("rev-parse", f"{revision}^{{commit}}").strip()
+
+    def test_iter_commit_changes(self):
+        os.makedirs(os.path.join(self.repo_dir, "packages", "api", "src"))
+        with open(file=os.path.join(self.repo_dir, "packages", "api", "src", "main.py"), mode="w") as file:
+            file.write("print('api')\n")
+        self._git("add", "packages")
+        self._git("commit", "-q", "-m", "feat(api): Added api package")
+        self._git("mv", "file.txt", os.path.join("packages", "moved.txt"))
+        self._git("rm", "-q", "-r", os.path.join("packages", "api"))
+        self._git("commit", "-q", "-m", "refactor: Moved files")
+        self._git("commit", "-q", "--allow-empty", "-m", "chore: Empty commit")
+
+        for packed in [False, True]:
+            if packed:
+                self._git("gc", "-q")
+            git_repository: GitRepository = GitRepository(self.repo_dir)
+            self.addCleanup(git_repository.close)
+            native_changes = [(changes.message, sorted(changes.paths)) for changes in git_repository.iter_commit_changes("HEAD~5..HEAD")]
+            subprocess_changes = [(changes.message, sorted(changes.paths)) for changes in self.git_client.iter_commit_changes("HEAD~5..HEAD")]
+            assert native_changes == subprocess_changes
+            assert native_changes[1] == ("refactor: Moved files\n", ["file.txt", "packages/api/src/main.py", "packages/moved.txt"])
+            assert native_changes[0] == ("chore: Empty commit\n", [])
+
+    def test_iter_commits_same_commit_time(self):
+        # Rebases, `git fast-import` and bots create many commits within the same second
+        repo_dir: str = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, repo_dir, ignore_errors=True)
+        subprocess.run(GIT_CMD + ["init", "-q", "-b", "main", repo_dir], check=True)
+        commit_count: int = 300
+        stream: bytes = b"".join(
+            b"commit refs/heads/main\nmark :%d\ncommitter Bot <bot@example.com> 1700000000 +0000\ndata 12\nfix: Fix %03d\n%s\n" % (i, i, b"from :%d\n" % (i - 1) if i > 1 else b"")
+            for i in range(1, commit_count + 1)
+        )
+        subprocess.run(GIT_CMD + ["fast-import", "--quiet"], input=stream, cwd=repo_dir, check=True, capture_output=True)
+        expected_shas: List[str] = subprocess.run(GIT_CMD + ["rev-list", "HEAD~250..HEAD"], cwd=repo_dir, check=True, capture_output=True).stdout.decode("utf-8").split()
+
+        for has_commit_graph in [False, True]:
+            if has_commit_graph:
+                subprocess.run(GIT_CMD + ["commit-graph", "write", "--reachable"], cwd=repo_dir, check=True)
+            git_repository: GitRepository = GitRepository(repo_dir)
+            self.addCleanup(git_repository.close)
+            # Without a commit-graph, only a walk with nothing to exclude can tell early that a commit is final
+            exclude: List[str] = [git_repository.rev_parse("HEAD~250")] if has_commit_graph else []
+            with patch.object(git_repository, "read_commit", wraps=git_repository.read_commit) as read_commit:
+                commits = git_repository.iter_commits([expected_shas[0]], exclude)
+                assert next(commits).sha == expected_shas[0]
+                # The first commit is yielded without buffering the commits sharing its commit time
+                assert read_commit.call_count < 10
+                commits.close()
+            assert list(git_repository.iter_commit_shas("HEAD~250..HEAD")) == expected_shas
+
+    def test_is_ancestor(self):
+        self._git("checkout", "-q", "-b", "topic", "HEAD~3")
+        self._git("commit", "-q", "--allow-empty", "-m", "feat: Topic change")
+        self._git("checkout", "-q", "main")
+        git_repository: GitRepository = GitRepository(self.repo_dir)
+        self.addCleanup(git_repository.close)
+
+        for ancestor, descendant in [("HEAD~5", "HEAD"), ("HEAD", "HEAD"), ("HEAD", "HEAD~5"), ("topic", "main"), ("main~3", "topic"), ("0" * 40, "HEAD"), ("missing", "HEAD")]:
+            expected: bool = subprocess.run(GIT_CMD + ["merge-base", "--is-ancestor", ancestor, descendant], cwd=self.repo_dir, capture_output=True).returncode == 0
+            assert git_repository.is_ancestor(ancestor, descendant) == self.git_client.is_ancestor(ancestor, descendant) == expected
+        assert git_repository.rev_parse("topic") == self.git_client.rev_parse("topic")
+        # Unknown revisions, including well-formed names of missing commits, raise ValueError in both backends
+        for revision in ["missing", "0" * 40, "0" * 40 + "~1"]:
+            for backend in [git_repository, self.git_client]:
+                with self.assertRaises(ValueError):
+                    backend.rev_parse(revision)
+
+    def test_iter_commit_msgs_by_sha(self):
+        self._git("gc", "-q")
+        self._git("commit", "-q", "--allow-empty", "-m", "feat: Loose commit")
+        git_repository: GitRepository = GitRepository(self.repo_dir)
+        self.addCleanup(git_repository.close)
+        self.addCleanup(self.git_client.close)
+        # More lookups than fit into the pipelining window
+        shas: List[str] = self._git("rev-list", "HEAD").split() * 20
+
+        native_msgs = list(git_repository.iter_commit_msgs_by_sha(shas))
+        assert list(self.git_client.iter_commit_msgs_by_sha(shas)) == native_msgs
+        assert [sha for sha, _ in native_msgs] == shas
+        assert native_msgs[0][1] == "feat: Loose commit\n"
+        assert native_msgs[-1][1] == "fix: Change 0\n\nBody of change 0\n"
+
+        # Both lookups were served by the same process
+        pid: int = self.git_client._cat_file_reader._process.pid
+        assert [sha for sha, _ in self.git_client.iter_commit_msgs_by_sha(shas[:3])] == shas[:3]
+        assert self.git_client._cat_file_reader._process.pid == pid
+
+        for backend in [git_repository, self.git_client]:
+            with self.assertRaises(KeyError):
+                list(backend.iter_commit_msgs_by_sha([shas[0], "0" * 40, shas[1]]))
+            # Abandoned lookups do not leave responses behind for the next one
+            next(backend.iter_commit_msgs_by_sha(shas))
+            assert list(backend.iter_commit_msgs_by_sha(shas[:2])) == native_msgs[:2]
+
+    def test_get_nearest_tags(self):
+        self._git("tag", "v1.1.0", "HEAD~4")
+        self._git("tag", "-a", "v1.1.0-rc.1", "-m", "Release candidate", "HEAD~4")
+        self._git("tag", "latest", "HEAD~1")
+
+        def _is_version(tag: str) -> bool:
+            return tag.startswith("v")
+
+        for packed in [False, True]:
+            if packed:
+                self._git("pack-refs", "--all")
+            git_repository: GitRepository = GitRepository(self.repo_dir)
+            self.addCleanup(git_repository.close)
+            for revision, expected_tags in [("HEAD", ["v1.1.0", "v1.1.0-rc.1"]), ("HEAD~5", ["v1.0.0"]), ("HEAD~25", [])]:
+                assert git_repository.get_nearest_tags(_is_version, revision) == expected_tags
+                assert sorted(self.git_client.get_nearest_tags(_is_version, revision)) == expected_tags
+            assert git_repository.get_nearest_tags(lambda tag: tag == "latest") == ["latest"]
+
+    def test_get_nearest_tags_after_merge(self):
+        # v1.0.5 is released from a maintenance branch, which is merged into main after v2.0.0
+        self._git("checkout", "-q", "-b", "maintenance", "HEAD~10")
+        self._git("commit", "-q", "--allow-empty", "-m", "fix: Maintenance fix")
+        self._git("tag", "v1.0.5")
+        self._git("checkout", "-q", "main")
+        self._git("tag", "v2.0.0", "HEAD~2")
+        self._git("merge", "-q", "--no-ff", "-m", "Merge branch 'maintenance'", "maintenance")
+        self._git("commit", "-q", "--allow-empty", "-m", "fix: After the merge")
+
+        git_repository: GitRepository = GitRepository(self.repo_dir)
+        self.addCleanup(git_repository.close)
+        for backend in [git_repository, self.git_client]:
+            assert backend.get_nearest_tags(lambda tag: tag.startswith("v")) == ["v1.0.5", "v2.0.0"]
+            # v1.0.0 is only reachable through the tagged commits
+            assert backend.get_nearest_tags(lambda tag: tag.startswith("v"), "HEAD~1^2") == ["v1.0.5"]
+            assert backend.get_nearest_tags(lambda tag: tag.startswith("v"), "HEAD~1^1") == ["v2.0.0"]
+
+    def test_get_nearest_tags_stops_below_tags(self):
+        # A topic branch from before v1.0.0 leads past the tag to the root commit
+        self._git("checkout", "-q", "-b", "topic", "HEAD~15")
+        self._git("commit", "-q", "--allow-empty", "-m", "feat: Topic change")
+        self._git("checkout", "-q", "main")
+        self._git("merge", "-q", "--no-ff", "-m", "Merge topic", "topic")
+        self._git("commit-graph", "write", "--reachable")
+
+        git_repository: GitRepository = GitRepository(self.repo_dir)
+        self.addCleanup(git_repository.close)
+        with patch.object(git_repository, "_read_commit_graph_entry", wraps=git_repository._read_commit_graph_entry) as read_commit_graph_entry:
+            assert git_repository.get_nearest_tags(lambda tag: tag.startswith("v")) == ["v1.0.0"]
+        # The commits older than the topic commit are never read, since none of them can lead to v1.0.0
+        assert read_commit_graph_entry.call_count <= 15
+
+    def test_get_nearest_tags_commit_graph(self):
+        # A side branch with a commit date in the future, merged after the v1.1.0 release
+        self._git("tag", "v1.1.0", "HEAD~4")
+        self._git("checkout", "-q", "-b", "topic", "HEAD~8")
+        subprocess.run(GIT_CMD + ["commit", "-q", "--allow-empty", "-m", "fix: Skewed"], cwd=self.repo_dir, check=True, env={**os.environ, "GIT_COMMITTER_DATE": "@4000000000 +0000"})
+        self._git("tag", "v0.9.0")
+        self._git("checkout", "-q", "main")
+        self._git("merge", "-q", "--no-ff", "-m", "Merge topic", "topic")
+        self._git("commit-graph", "write", "--reachable")
+        # Commits made after the commit-graph was written are not in it
+        self._git("commit", "-q", "--allow-empty", "-m", "chore: After the graph")
+
+        git_repository: GitRepository = GitRepository(self.repo_dir)
+        self.addCleanup(git_repository.close)
+
+        assert git_repository._get_commit_graph() is not None
+        # The skewed date does not hide either branch's tag
+        assert git_repository.get_nearest_tags(lambda tag: tag.startswith("v")) == ["v0.9.0", "v1.1.0"]
+        assert self.git_client.get_nearest_tags(lambda tag: tag.startswith("v")) == ["v0.9.0", "v1.1.0"]
+        for sha in [self._git("rev-parse", "HEAD~1").strip(), self._git("rev-parse", "v1.0.0^{commit}").strip()]:
+            entry = git_repository._get_commit_graph().read_commit(sha)
+            commit = git_repository.read_commit(sha)
+            assert (entry.parents, entry.commit_time) == (commit.parents, commit.commit_time)
+        assert git_repository._get_commit_graph().read_commit(self._git("rev-parse", "HEAD").strip()) is None
+
+    def test_loose_objects(self):
+        self._assert_matches_git()
+
+    def test_packed_objects(self):
+        self._git("gc", "-q", "--aggressive")
+        assert not os.path.exists(os.path.join(self.repo_dir, ".git", "refs", "tags", "v1.0.0"))
+
+        self._assert_matches_git()
+
+    def test_packed_blob_deltas(self):
+        self._git("gc", "-q", "--aggressive")
+        git_repository: GitRepository = GitRepository(self.repo_dir)
+        self.addCleanup(git_repository.close)
+
+        for revision in ["HEAD", "HEAD~15", "HEAD~29"]:
+            blob_sha: str = self._git("rev-parse", f"{revision}:file.txt").strip()
+            object_type, data = git_repository.read_object(blob_sha)
+            assert object_type == GitObjectType.BLOB
+            assert data.decode("utf-8") == self._git("cat-file", "blob", blob_sha)
+
+    def test_abbreviated_sha(self):
+        self._git("gc", "-q")
+        head_sha: str = self._git("rev-parse", "HEAD").strip()
+        git_repository: GitRepository = GitRepository(self.repo_dir)
+        self.addCleanup(git_repository.close)
+
+        assert git_repository.rev_parse(head_sha[:10]) == head_sha
+
+    def test_merge_history(self):
+        self._git("checkout", "-q", "-b", "topic", "HEAD~3")
+        self._git("commit", "-q", "--allow-empty", "-m", "feat: Topic change")
+        self._git("checkout", "-q", "main")
+        self._git("merge", "-q", "--no-ff", "-m", "Merge branch 'topic'", "topic")
+
+        self._assert_matches_git()
+        git_repository: GitRepository = GitRepository(self.repo_dir)
+        self.addCleanup(git_repository.close)
+        assert sorted(git_repository.iter_commit_msgs("HEAD~1..HEAD")) == sorted(self.git_client.iter_commit_msgs("HEAD~1..HEAD"))
+
+    def test_equal_commit_times(self):
+        # Within one second, the walk from "topic" reaches the branch point before the longer walk from "main" marks it as excluded
+        date_env: Dict[str, str] = {**os.environ, "GIT_COMMITTER_DATE": "1700000000 +0000", "GIT_AUTHOR_DATE": "1700000000 +0000"}
+        for args in [("commit", "-q", "--allow-empty", "-m", "fix: Branch point"), ("checkout", "-q", "-b", "topic"),
+                     ("commit", "-q", "--allow-empty", "-m", "feat: Topic change"), ("checkout", "-q", "main"),
+                     *[("commit", "-q", "--allow-empty", "-m", f"fix: Main change {i}") for i in range(5)],
+                     ("checkout", "-q", "topic"), ("merge", "-q", "--no-ff", "-m", "Merge branch 'main'", "main")]:
+            subprocess.run(GIT_CMD + list(args), cwd=self.repo_dir, check=True, capture_output=True, env=date_env)
+        git_repository: GitRepository = GitRepository(self.repo_dir)
+        self.addCleanup(git_repository.close)
+
+        assert sorted(git_repository.iter_commit_msgs("main..topic")) == ["Merge branch 'main'\n", "feat: Topic change\n"]
+        assert sorted(git_repository.iter_commit_msgs("main..topic")) == sorted(self.git_client.iter_commit_msgs("main..topic"))
+
+    def test_linked_worktree(self):
+        worktree_dir: str = os.path.join(self.repo_dir, "worktree")
+        self._git("worktree", "add", "-q", worktree_dir, "HEAD~4")
+        git_repository: GitRepository = GitRepository(worktree_dir)
+        self.addCleanup(git_repository.close)
+
+        assert git_repository.get_latest_commit_msg() == GitClient(repo_path=worktree_dir).get_latest_commit_msg()
+
+    def test_deepen_until_complete(self):
+        clone_dir: str = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, clone_dir, ignore_errors=True)
+        subprocess.run(GIT_CMD + ["clone", "-q", "--depth", "1", f"file://{self.repo_dir}", clone_dir], check=True, capture_output=True)
+        git_client: GitClient = GitClient(repo_path=clone_dir, logger=logging.getLogger(__name__))
+        git_repository: GitRepository = GitRepository(clone_dir)
+        self.addCleanup(git_repository.close)
+
+        assert not git_client.is_range_complete("v1.0.0..HEAD")
+        with self.assertLogs(__name__, level="INFO") as logs:
+            assert git_client.deepen_until_complete("v1.0.0..HEAD", initial_depth=2)
+        git_repository.refresh()
+
+        assert any("Deepening the shallow clone by 8 commits" in line for line in logs.output)
+        assert any("remote: Total" in line for line in logs.output)
+        # Deepening stopped before the full 30 commits were fetched
+        assert git_client.get_shallow_commits()
+        assert git_repository.shallow == git_client.get_shallow_commits()
+        assert list(git_repository.iter_commit_msgs("v1.0.0..HEAD")) == list(self.git_client.iter_commit_msgs("v1.0.0..HEAD"))
+        assert not git_client.deepen_until_complete("no-such-tag..HEAD", initial_depth=2)
+        assert not git_client.get_shallow_commits()
+
+    def test_not_a_repository(self):
+        empty_dir: str = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, empty_dir, ignore_errors=True)
+
+        with self.assertRaises(FileNotFoundError):
+            GitRepository(empty_dir)
+
+    def test_stream_records_with_large_stderr(self):
+        # Far more warnings than fit into a pipe buffer, written before any output
+        noisy_cmd: List[str] = [sys.executable, "-c", "import sys; sys.stderr.write('warning: noisy\\n' * 100000); sys.stdout.write('a\\0b\\0'); sys.exit(int(sys.argv[1]))"]
+
+        assert list(self.git_client._stream_records(noisy_cmd + ["0"], b"\0")) == [b"a", b"b"]
+        with self.assertRaises(ChildProcessError) as context:
+            list(self.git_client._stream_records(noisy_cmd + ["1"], b"\0"))
+        assert str(context.exception).startswith("warning: noisy\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,500 @@
+import asyncio
+import itertools
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+import unittest
+from email.message import Message
+from unittest.mock import MagicMock, patch
+WORKSPACE_ROOT: str = os.path.abspath(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+sys.path.append(WORKSPACE_ROOT)
+sys.path.append(os.path.join(WORKSPACE_ROOT, "test"))
+from src.clients.github._types import HTTPError, HttpResponse, HttpTransportType, TransportError
+from src.clients.github.async_github_client import AsyncGitHubClient
+from src.clients.github.github_client import GitHubClient
+from src.clients.github.http_transport import create_transport
+from src.clients.github.requests_transport import RequestsTransport
+from src.clients.github.constants import POOL_MAXSIZE
+from src.clients.github.rate_limit_governor import RateLimitGovernor
+from src.clients.github.response_cache import ResponseCache
+from src.tracing.tracer import Tracer
+from stubs.github_api_stub import GitHubApiStub
+
+MOCK_REPO_OWNER: str = "test-user"
+MOCK_REPO_NAME: str = "test-repo"
+MOCK_REPO_VARIABLE: str = "VERSION_NUMBER"
+MOCK_GITHUB_TOKEN: str = "abcdefghij-1234567890"
+
+
+def _create_response(status_code: int, headers: Optional[Dict[str, str]] = None, body: Optional[Dict] = None) -> HttpResponse:
+    response_headers: Message = Message()
+    for header, value in (headers or {}).items():
+        response_headers[header] = value
+
+    return HttpResponse(
+        status_code=status_code,
+        reason="Mock",
+        headers=response_headers,
+        content=json.dumps(body or {}).encode("utf-8"),
+        url=""
+    )
+
+
+class TestGitHubClient(unittest.TestCase):
+    def setUp(self):
+        self.github_client: GitHubClient = GitHubClient(github_token=MOCK_GITHUB_TOKEN, max_retries=3)
+        self.github_client.transport = MagicMock()
+        self.sleeps: List[float] = []
+        self.github_client._sleep = self.sleeps.append
+
+    def test_default_transport(self):
+        github_client: GitHubClient = GitHubClient(github_token=MOCK_GITHUB_TOKEN)
+
+        assert isinstance(github_client.transport, RequestsTransport)
+        assert github_client.transport.session.get_adapter(github_client.base_uri)._pool_maxsize == POOL_MAXSIZE
+
+    def test_session_created_once(self):
+        import requests
+        transport: RequestsTransport = RequestsTransport(pool_maxsize=POOL_MAXSIZE)
+        self.addCleanup(transport.close)
+        create_session = requests.Session
+        barrier: threading.Barrier = threading.Barrier(8)
+        sessions: List[requests.Session] = []
+
+        def _create_session() -> requests.Session:
+            # Leaves time for the other threads to find no session yet
+            time.sleep(0.05)
+            return create_session()
+
+        with patch("requests.Session", side_effect=_create_session) as session_class:
+            threads: List[threading.Thread] = [threading.Thread(target=lambda: (barrier.wait(), sessions.append(transport.session))) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert session_class.call_count == 1
+        assert all(session is sessions[0] for session in sessions)
+
+    def test_get_repository_variable_uses_transport(self):
+        self.github_client.transport.request.return_value = _create_response(200, body={"name": MOCK_REPO_VARIABLE, "value": "1.0.0"})
+
+        response: HttpResponse = self.github_client.get_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE)
+
+        assert json.loads(response.content)["value"] == "1.0.0"
+        self.github_client.transport.request.assert_called_once_with(
+            method="GET",
+            url=f"{self.github_client.base_uri}/repos/{MOCK_REPO_OWNER}/{MOCK_REPO_NAME}/actions/variables/{MOCK_REPO_VARIABLE}",
+            headers=self.github_client.headers,
+            body=None,
+            timeout=self.github_client.timeout
+        )
+        assert self.github_client.headers["Authorization"] == f"Bearer {MOCK_GITHUB_TOKEN}"
+        assert self.sleeps == []
+
+    def test_retry_on_server_error(self):
+        self.github_client.transport.request.side_effect = [_create_response(502), _create_response(503), _create_response(204)]
+
+        response: HttpResponse = self.github_client.update_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE, "1.0.1")
+
+        assert response.status_code == 204
+        assert len(self.sleeps) == 2
+        assert all(0 <= sleep <= self.github_client.backoff_factor * 2 ** attempt for attempt, sleep in enumerate(self.sleeps))
+
+    def test_retry_after_header(self):
+        self.github_client.transport.request.side_effect = [_create_response(429, headers={"Retry-After": "7"}), _create_response(200)]
+
+        self.github_client.get_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE)
+
+        assert self.sleeps == [7.0]
+
+    def test_rate_limit_reset_header(self):
+        reset: int = int(time.time()) + 10
+        rate_limited: HttpResponse = _create_response(403, headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(reset)})
+        self.github_client.transport.request.side_effect = [rate_limited, _create_response(200)]
+
+        self.github_client.get_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE)
+
+        assert len(self.sleeps) == 1
+        assert 9 <= self.sleeps[0] <= 11
+
+    def test_no_retry_when_wait_too_long(self):
+        self.github_client.max_retry_wait = 60
+        self.github_client.transport.request.return_value = _create_response(429, headers={"Retry-After": "3600"})
+
+        with self.assertRaises(HTTPError):
+            self.github_client.get_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE)
+        assert self.sleeps == []
+
+    def test_no_retry_on_client_error(self):
+        self.github_client.transport.request.return_value = _create_response(404)
+
+        with self.assertRaises(HTTPError):
+            self.github_client.get_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE)
+        assert self.github_client.transport.request.call_count == 1
+
+    def test_retries_exhausted(self):
+        self.github_client.transport.request.return_value = _create_response(500)
+
+        with self.assertRaises(HTTPError):
+            self.github_client.get_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE)
+        assert self.github_client.transport.request.call_count == self.github_client.max_retries + 1
+
+    def test_retry_on_connection_error(self):
+        self.github_client.transport.request.side_effect = [TransportError("Connection reset"), _create_response(200)]
+
+        response: HttpResponse = self.github_client.get_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE)
+
+        assert response.status_code == 200
+        assert len(self.sleeps) == 1
+
+    def test_no_retry_on_invalid_url(self):
+        github_client: GitHubClient = GitHubClient(github_token=MOCK_GITHUB_TOKEN, base_uri="invalid://api.github.com")
+        self.addCleanup(github_client.close)
+        github_client._sleep = self.sleeps.append
+
+        with self.assertRaises(ValueError):
+            github_client.get_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE)
+        assert self.sleeps == []
+
+    def test_no_retry_on_ambiguous_create_failure(self):
+        for failure in [_create_response(503), TransportError("Connection reset")]:
+            self.github_client.transport.request.reset_mock()
+            self.github_client.transport.request.side_effect = [failure, _create_response(201)]
+
+            with self.assertRaises((HTTPError, TransportError)):
+                self.github_client.create_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE, "1.0.0")
+            assert self.github_client.transport.request.call_count == 1
+        assert self.sleeps == []
+
+        self.github_client.transport.request.side_effect = [_create_response(429, headers={"Retry-After": "1"}), _create_response(201)]
+        assert self.github_client.create_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE, "1.0.0").status_code == 201
+        assert self.sleeps == [1.0]
+
+
+class TestGitHubClientCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir: str = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+        self.github_client: GitHubClient = GitHubClient(github_token=MOCK_GITHUB_TOKEN, cache=ResponseCache(self.cache_dir, max_entries=2))
+        self.github_client.transport = MagicMock()
+
+    def test_conditional_get(self):
+        body: Dict = {"name": MOCK_REPO_VARIABLE, "value": "1.0.0"}
+        self.github_client.transport.request.side_effect = [_create_response(200, headers={"ETag": '"abc"'}, body=body), _create_response(304)]
+
+        first_response: HttpResponse = self.github_client.get_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE)
+        second_response: HttpResponse = self.github_client.get_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE)
+
+        assert "If-None-Match" not in self.github_client.transport.request.call_args_list[0].kwargs["headers"]
+        assert self.github_client.transport.request.call_args_list[1].kwargs["headers"]["If-None-Match"] == '"abc"'
+        assert second_response.status_code == 200
+        assert json.loads(second_response.content) == json.loads(first_response.content) == body
+
+    def test_update_invalidates_cache(self):
+        self.github_client.transport.request.side_effect = [_create_response(200, headers={"ETag": '"abc"'}), _create_response(204), _create_response(200, headers={"ETag": '"def"'})]
+
+        self.github_client.get_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE)
+        self.github_client.update_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE, "1.0.1")
+        self.github_client.get_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE)
+
+        assert "If-None-Match" not in self.github_client.transport.request.call_args_list[2].kwargs["headers"]
+
+    def test_lru_eviction(self):
+        cache: ResponseCache = self.github_client.cache
+        cache.put("a", '"1"', b"{}")
+        cache.put("b", '"2"', b"{}")
+        os.utime(cache._get_path("a"), ns=(0, 0))
+        os.utime(cache._get_path("b"), ns=(1, 1))
+        # Reading "a" makes "b" the least recently used entry
+        assert cache.get("a") is not None
+        cache.put("c", '"3"', b"{}")
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+
+    def test_eviction_above_high_water_mark(self):
+        cache: ResponseCache = ResponseCache(os.path.join(self.cache_dir, "large"), max_entries=16)
+        assert cache.high_water_mark == 18
+
+        with patch("os.listdir", wraps=os.listdir) as listdir:
+            for i in range(cache.high_water_mark):
+                cache.put(str(i), f'"{i}"', b"{}")
+            cache.put("0", '"0"', b"{}")
+            cache.invalidate("1")
+            cache.put("1", '"1"', b"{}")
+            # Nothing is evicted, so the directory is never listed
+            assert listdir.call_count == 0
+
+            cache.put(str(cache.high_water_mark), '"x"', b"{}")
+            assert listdir.call_count == 1
+        assert len(os.listdir(cache.cache_dir)) == 16
+
+    def test_cache_key_includes_base_uri(self):
+        body: Dict = {"name": MOCK_REPO_VARIABLE, "value": "1.0.0"}
+        self.github_client.transport.request.side_effect = [_create_response(200, headers={"ETag": '"abc"'}, body=body)] * 2
+        self.github_client.get_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE)
+        github_client: GitHubClient = GitHubClient(github_token=MOCK_GITHUB_TOKEN, cache=self.github_client.cache, base_uri="https://github.example.com/api/v3")
+        github_client.transport = self.github_client.transport
+
+        github_client.get_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE)
+
+        # Another API host does not revalidate the first host's entry
+        assert "If-None-Match" not in self.github_client.transport.request.call_args_list[1].kwargs["headers"]
+
+
+class TestGitHubClientWithStub(unittest.TestCase):
+    transport_type: HttpTransportType = HttpTransportType.REQUESTS
+
+    def setUp(self):
+        self.github_api_stub: GitHubApiStub = GitHubApiStub().start()
+        self.addCleanup(self.github_api_stub.stop)
+        self.github_api_stub.set_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE, "1.0.0")
+        self.cache_dir: str = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+        self.github_client: GitHubClient = GitHubClient(github_token=MOCK_GITHUB_TOKEN, max_retries=3, cache=ResponseCache(self.cache_dir), base_uri=self.github_api_stub.base_uri, transport=create_transport(self.transport_type, POOL_MAXSIZE))
+        self.addCleanup(self.github_client.close)
+        self.sleeps: List[float] = []
+        self.github_client._sleep = self.sleeps.append
+
+    def test_injected_faults_are_retried(self):
+        self.github_api_stub.fail_next(503)
+        self.github_api_stub.fail_next(429, retry_after="7")
+        self.github_client.tracer = Tracer()
+
+        self.github_client.update_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE, "1.0.1")
+
+        assert self.github_api_stub.get_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE) == "1.0.1"
+        assert self.github_api_stub.request_counts["PATCH"] == 3
+        assert self.sleeps[1] == 7
+        assert [(span.name, span.attributes) for span in self.github_client.tracer.spans] == [
+            ("github.request", {"operation": "update_repository_variable", "status_code": 204, "retries": 2})
+        ]
+
+    def test_truncated_response_is_retried(self):
+        self.github_api_stub.truncate_next()
+
+        response: HttpResponse = self.github_client.get_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE)
+
+        assert json.loads(response.content)["value"] == "1.0.0"
+        assert self.github_api_stub.request_counts["GET"] == 2
+        assert len(self.sleeps) == 1
+
+    def test_etag_revalidation(self):
+        for _ in range(2):
+            response: HttpResponse = self.github_client.get_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE)
+            assert json.loads(response.content)["value"] == "1.0.0"
+        self.github_api_stub.set_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE, "2.0.0")
+        response = self.github_client.get_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE)
+
+        assert json.loads(response.content)["value"] == "2.0.0"
+        assert self.github_api_stub.status_code_counts == {200: 2, 304: 1}
+
+    def test_get_if_modified(self):
+        etag: str = self.github_client.get_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE).headers["ETag"]
+        assert self.github_client.get_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE, etag=etag).status_code == 304
+
+        self.github_api_stub.set_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE, "2.0.0")
+        response: HttpResponse = self.github_client.get_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE, etag=etag)
+
+        assert response.status_code == 200
+        assert json.loads(response.content)["value"] == "2.0.0"
+
+    def test_list_repository_variables(self):
+        for i in range(64):
+            self.github_api_stub.set_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, f"VARIABLE_{i}", str(i))
+
+        variables: List[Dict[str, str]] = list(self.github_client.list_repository_variables(MOCK_REPO_OWNER, MOCK_REPO_NAME, per_page=30))
+        assert len(variables) == 65
+        assert {variable["name"]: variable["value"] for variable in variables}["VARIABLE_63"] == "63"
+        assert self.github_api_stub.request_counts["GET"] == 3
+
+        # Pages are only requested as they are consumed
+        self.github_api_stub.reset_stats()
+        first_variables: List[Dict[str, str]] = list(itertools.islice(self.github_client.list_repository_variables(MOCK_REPO_OWNER, MOCK_REPO_NAME, per_page=10), 5))
+        assert len(first_variables) == 5
+        assert self.github_api_stub.request_counts["GET"] == 1
+
+    def test_retries_exhausted_with_error_rate(self):
+        self.github_api_stub.error_rate = 1.0
+
+        with self.assertRaises(HTTPError):
+            self.github_client.get_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE)
+        assert self.github_api_stub.request_counts["GET"] == 4
+
+
+class TestGitHubClientWithStubHttpClient(TestGitHubClientWithStub):
+    transport_type: HttpTransportType = HttpTransportType.HTTP_CLIENT
+
+    def _break_pooled_connections(self):
+        for pool in self.github_client.transport._pools.values():
+            for connection in pool.queue:
+                # Like a server closing an idle keep-alive connection
+                connection.sock.shutdown(socket.SHUT_RDWR)
+
+    def test_closed_connection_is_only_resent_if_idempotent(self):
+        self.github_client.get_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE)
+        self._break_pooled_connections()
+        self.github_client.update_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE, "1.0.1")
+
+        assert self.github_api_stub.get_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE) == "1.0.1"
+        # Resent by the transport rather than retried by the client
+        assert self.sleeps == []
+
+        self._break_pooled_connections()
+        with self.assertRaises(TransportError):
+            self.github_client.create_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, "NEW_VARIABLE", "1.0.0")
+        assert self.github_api_stub.request_counts["POST"] == 0
+
+
+class TestRateLimitGovernor(unittest.TestCase):
+    def setUp(self):
+        self.state_dir: str = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.state_dir, ignore_errors=True)
+        self.state_path: str = os.path.join(self.state_dir, "rate-limit.json")
+
+    def test_token_bucket(self):
+        now: float = 1000.0
+        rate_limit_governor: RateLimitGovernor = RateLimitGovernor(self.state_path, burst=2, reserve=5, max_wait=60)
+        rate_limit_governor._clock = lambda: now
+
+        # Nothing is known about the budget yet
+        assert rate_limit_governor.try_acquire() == 0
+        # 10 requests may be spent over the 10 seconds until the reset
+        rate_limit_governor.update({"X-RateLimit-Remaining": "15", "X-RateLimit-Reset": "1010"})
+        assert [rate_limit_governor.try_acquire() for _ in range(2)] == [0, 0]
+        # The 8 requests left are spread over the 10 seconds, so the next one is due in 1.25 seconds
+        assert rate_limit_governor.try_acquire() == 1.25
+        now += 0.5
+        assert 0 < rate_limit_governor.try_acquire() < 0.75
+
+        # Another process using the same file shares the bucket
+        other_governor: RateLimitGovernor = RateLimitGovernor(self.state_path, burst=2, reserve=5, max_wait=60)
+        other_governor._clock = lambda: now
+        now += 1.0
+        assert other_governor.try_acquire() == 0
+        assert rate_limit_governor.try_acquire() > 0
+
+        # Earlier responses of the same window cannot raise the budget again, but a new window replaces it
+        rate_limit_governor.update({"X-RateLimit-Remaining": "14", "X-RateLimit-Reset": "1010"})
+        rate_limit_governor.update({"X-RateLimit-Remaining": "5", "X-RateLimit-Reset": "1010"})
+        assert rate_limit_governor.try_acquire() == 8.5
+        rate_limit_governor.update({"X-RateLimit-Remaining": "5", "X-RateLimit-Reset": "1100"})
+        # Waiting longer than max_wait would not help
+        assert rate_limit_governor.try_acquire() == 0
+        rate_limit_governor.update({"X-RateLimit-Remaining": "1000", "X-RateLimit-Reset": "1090"})
+        now += 100
+        assert rate_limit_governor.try_acquire() == 0
+
+    def test_shared_budget(self):
+        github_api_stub: GitHubApiStub = GitHubApiStub(rate_limit=12, rate_limit_window=2.0).start()
+        self.addCleanup(github_api_stub.stop)
+        github_api_stub.set_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE, "1.0.0")
+        tracers: List[Tracer] = []
+
+        def _get_repository_variables():
+            # Every client has its own governor, as if it ran in its own process
+            tracer: Tracer = Tracer()
+            tracers.append(tracer)
+            github_client: GitHubClient = GitHubClient(
+                github_token=MOCK_GITHUB_TOKEN,
+                base_uri=github_api_stub.base_uri,
+                tracer=tracer,
+                rate_limit_governor=RateLimitGovernor(self.state_path, burst=2, reserve=0)
+            )
+            try:
+                for _ in range(6):
+                    github_client.get_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE)
+            finally:
+                github_client.close()
+
+        threads: List[threading.Thread] = [threading.Thread(target=_get_repository_variables) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # More requests than the limit allows per window were paced across two windows instead of being rejected
+        assert github_api_stub.status_code_counts == {200: 18}
+        rate_limit_waits: List[float] = [span.attributes["rate_limit_wait"] for tracer in tracers for span in tracer.spans]
+        assert len(rate_limit_waits) == 18
+        assert max(rate_limit_waits) > 0.5
+
+
+class TestAsyncGitHubClient(unittest.TestCase):
+    def setUp(self):
+        self.github_api_stub: GitHubApiStub = GitHubApiStub(latency=0.05).start()
+        self.addCleanup(self.github_api_stub.stop)
+        for i in range(20):
+            self.github_api_stub.set_variable(MOCK_REPO_OWNER, f"{MOCK_REPO_NAME}-{i}", MOCK_REPO_VARIABLE, f"1.0.{i}")
+
+    async def _update_repository_variables(self) -> List[str]:
+        async with AsyncGitHubClient(github_token=MOCK_GITHUB_TOKEN, base_uri=self.github_api_stub.base_uri, backoff_factor=0) as github_client:
+            await asyncio.gather(*(
+                github_client.update_repository_variable(MOCK_REPO_OWNER, f"{MOCK_REPO_NAME}-{i}", MOCK_REPO_VARIABLE, f"2.0.{i}") for i in range(20)
+            ))
+            responses: List[HttpResponse] = await asyncio.gather(*(
+                github_client.get_repository_variable(MOCK_REPO_OWNER, f"{MOCK_REPO_NAME}-{i}", MOCK_REPO_VARIABLE) for i in range(20)
+            ))
+
+        return [json.loads(response.content)["value"] for response in responses]
+
+    def test_concurrent_requests(self):
+        self.github_api_stub.fail_next(503, count=2)
+
+        values: List[str] = asyncio.run(self._update_repository_variables())
+
+        assert values == [f"2.0.{i}" for i in range(20)]
+        assert self.github_api_stub.request_counts == {"PATCH": 22, "GET": 20}
+        assert self.github_api_stub.max_concurrent_requests > 1
+
+    def test_list_repository_variables(self):
+        for i in range(5):
+            self.github_api_stub.set_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, f"VARIABLE_{i}", str(i))
+
+        async def _list_repository_variables() -> List[Dict[str, str]]:
+            async with AsyncGitHubClient(github_token=MOCK_GITHUB_TOKEN, base_uri=self.github_api_stub.base_uri) as github_client:
+                return [variable async for variable in github_client.list_repository_variables(MOCK_REPO_OWNER, MOCK_REPO_NAME, per_page=2)]
+
+        assert [variable["name"] for variable in asyncio.run(_list_repository_variables())] == [f"VARIABLE_{i}" for i in range(5)]
+        assert self.github_api_stub.request_counts["GET"] == 3
+
+    def test_client_error(self):
+        async def _get_missing_variable():
+            async with AsyncGitHubClient(github_token=MOCK_GITHUB_TOKEN, base_uri=self.github_api_stub.base_uri) as github_client:
+                await github_client.get_repository_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, "MISSING")
+
+        with self.assertRaises(HTTPError):
+            asyncio.run(_get_missing_variable())
+
+    def test_etag_revalidation(self):
+        cache_dir: str = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+
+        async def _get_variable_values() -> List[str]:
+            async with AsyncGitHubClient(github_token=MOCK_GITHUB_TOKEN, base_uri=self.github_api_stub.base_uri, cache=ResponseCache(cache_dir)) as github_client:
+                assert not isinstance(github_client, GitHubClient)
+                values: List[str] = []
+                for _ in range(2):
+                    response: HttpResponse = await github_client.get_repository_variable(MOCK_REPO_OWNER, f"{MOCK_REPO_NAME}-0", MOCK_REPO_VARIABLE)
+                    values.append(json.loads(response.content)["value"])
+                etag: str = response.headers["ETag"]
+                not_modified_response: HttpResponse = await github_client.get_repository_variable(MOCK_REPO_OWNER, f"{MOCK_REPO_NAME}-0", MOCK_REPO_VARIABLE, etag=etag)
+                assert not_modified_response.status_code == 304
+
+                return values
+
+        assert asyncio.run(_get_variable_values()) == ["1.0.0", "1.0.0"]
+        assert self.github_api_stub.status_code_counts == {200: 1, 304: 2}
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import os
+import sys
+import unittest
+WORKSPACE_ROOT: str = os.path.abspath(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+sys.path.append(WORKSPACE_ROOT)
+from src.release_version_updater.path_prefix_trie import PathPrefixTrie
+
+
+class TestPathPrefixTrie(unittest.TestCase):
+    def setUp(self):
+        self.trie: PathPrefixTrie[str] = PathPrefixTrie()
+        self.trie.insert("packages/api", "API_VERSION")
+        self.trie.insert("packages/api/", "API_VERSION_2")
+        self.trie.insert("./packages/web", "WEB_VERSION")
+        self.trie.insert("packages", "ALL_PACKAGES_VERSION")
+
+    def test_match_nested_prefixes(self):
+        assert list(self.trie.match("packages/api/src/main.py")) == ["ALL_PACKAGES_VERSION", "API_VERSION", "API_VERSION_2"]
+
+    def test_match_component_boundary(self):
+        assert list(self.trie.match("packages/api-client/setup.py")) == ["ALL_PACKAGES_VERSION"]
+        assert list(self.trie.match("packagesfoo/api/setup.py")) == []
+
+    def test_match_normalized_prefix(self):
+        assert list(self.trie.match("packages/web/index.ts")) == ["ALL_PACKAGES_VERSION", "WEB_VERSION"]
+
+    def test_empty_prefix_matches_everything(self):
+        self.trie.insert("", "ROOT_VERSION")
+
+        assert list(self.trie.match("README.md")) == ["ROOT_VERSION"]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, List, Tuple
+import unittest
+from unittest.mock import patch
+WORKSPACE_ROOT: str = os.path.abspath(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+sys.path.append(WORKSPACE_ROOT)
+from src.clients.git._types import PushEvent
+from src.clients.git.constants import PUSH_EVENT_MAX_COMMITS
+from src.clients.git.git_backend import GitBackend
+from src.clients.git.git_repository import GitRepository
+from src.clients.git.push_event_backend import PushEventBackend, read_push_event
+
+GIT_CMD: List[str] = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+
+
+class TestPushEventBackend(unittest.TestCase):
+    def setUp(self):
+        self.repo_dir: str = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.repo_dir, ignore_errors=True)
+        self._git("init", "-q", "-b", "main")
+        self._git("commit", "-q", "--allow-empty", "-m", "chore: Initial commit")
+        self.before: str = self._git("rev-parse", "HEAD").strip()
+        commits: List[Dict[str, Any]] = []
+        for i, commit_msg in enumerate(["fix: Fixed bug", "feat(api): Added endpoint\n\nWith a body", "docs: Updated readme"]):
+            path: str = f"packages/{'api' if i % 2 else 'web'}/file{i}.txt"
+            os.makedirs(os.path.join(self.repo_dir, os.path.dirname(path)), exist_ok=True)
+            with open(file=os.path.join(self.repo_dir, path), mode="w") as file:
+                file.write(commit_msg)
+            self._git("add", path)
+            self._git("commit", "-q", "-m", commit_msg)
+            # GitHub strips the trailing newline of messages
+            commits.append({"id": self._git("rev-parse", "HEAD").strip(), "message": commit_msg, "added": [path], "removed": [], "modified": [], "author": {"name": "test"}})
+        self.after: str = commits[-1]["id"]
+        self.event: Dict[str, Any] = {
+            "ref": "refs/heads/main",
+            "before": self.before,
+            "after": self.after,
+            "created": False,
+            "deleted": False,
+            "forced": False,
+            "commits": commits,
+            "head_commit": commits[-1],
+            "repository": {"full_name": "test-user/test-repo", "size": 12345}
+        }
+        self.git_repository: GitRepository = GitRepository(self.repo_dir)
+        self.addCleanup(self.git_repository.close)
+        self.fallback_count: int = 0
+
+    def _git(self, *args: str) -> str:
+        return subprocess.run(GIT_CMD + list(args), cwd=self.repo_dir, check=True, capture_output=True).stdout.decode("utf-8")
+
+    def _create_fallback(self) -> GitBackend:
+        self.fallback_count += 1
+
+        return self.git_repository
+
+    def _create_backend(self, event: Dict[str, Any]) -> PushEventBackend:
+        event_path: str = os.path.join(self.repo_dir, "event.json")
+        with open(file=event_path, mode="w") as event_file:
+            json.dump(event, event_file, indent=2)
+        push_event_backend: PushEventBackend = PushEventBackend(event_path=event_path, fallback=self._create_fallback)
+        self.addCleanup(push_event_backend.close)
+
+        return push_event_backend
+
+    def test_read_push_event(self):
+        commits: List[Dict[str, Any]] = [
+            {"id": f"{i:040x}", "message": f"fix: Change {i}\n\n{'Long body. ' * 20}", "modified": [f"file{i}.txt", "shared.txt"], "added": [], "removed": [f"old{i}.txt"]}
+            for i in range(PUSH_EVENT_MAX_COMMITS)
+        ]
+        event_json: str = json.dumps({**self.event, "commits": commits, "size": 1.5e3, "pusher": None})
+
+        # Reads much smaller than a commit make every value span several of them
+        for read_size in [7, 64 * 1024]:
+            event: PushEvent = read_push_event(io.StringIO(event_json), read_size=read_size)
+            assert (event.ref, event.before, event.after, event.forced) == ("refs/heads/main", self.before, self.after, False)
+            assert len(event.commits) == PUSH_EVENT_MAX_COMMITS
+            assert event.commits[-1].sha == commits[-1]["id"]
+            assert event.commits[5].message == commits[5]["message"] + "\n"
+            assert event.commits[5].paths == ("old5.txt", "file5.txt", "shared.txt")
+            assert event.head_commit.sha == self.after
+
+        assert read_push_event(io.StringIO('{"commits": [], "after": "abc"}')).commits == ()
+        for invalid_json in ['{"commits": [1, 2}', '{"ref": "main"', "[]"]:
+            with self.assertRaises(ValueError):
+                read_push_event(io.StringIO(invalid_json), read_size=3)
+
+    def test_commits_from_event(self):
+        push_event_backend: PushEventBackend = self._create_backend(self.event)
+
+        assert push_event_backend.get_latest_commit_msg() == self.git_repository.get_latest_commit_msg()
+        assert push_event_backend.rev_parse("HEAD") == push_event_backend.rev_parse("main") == self.after
+        for revision_range in [f"{self.before}..HEAD", f"{self.before}..{self.after}", f"{self.after}..HEAD"]:
+            assert list(push_event_backend.iter_commit_msgs(revision_range)) == list(self.git_repository.iter_commit_msgs(revision_range))
+            assert list(push_event_backend.iter_commit_changes(revision_range)) == list(self.git_repository.iter_commit_changes(revision_range))
+            assert list(push_event_backend.iter_commit_shas(revision_range)) == list(self.git_repository.iter_commit_shas(revision_range))
+        assert push_event_backend.is_ancestor(self.before, self.after)
+        assert push_event_backend.is_ancestor(self.event["commits"][0]["id"])
+        assert list(push_event_backend.iter_commit_msgs_by_sha([self.after])) == list(self.git_repository.iter_commit_msgs_by_sha([self.after]))
+        # The repository was never opened
+        assert self.fallback_count == 0
+
+        # Ranges reaching further back than the push are read from the repository
+        assert list(push_event_backend.iter_commit_msgs("HEAD~3..HEAD~1")) == ["feat(api): Added endpoint\n\nWith a body\n", "fix: Fixed bug\n"]
+        assert push_event_backend.is_ancestor("HEAD~3") and not push_event_backend.is_ancestor(self.after, self.before)
+        assert self.fallback_count == 1
+
+    def test_commit_msgs_by_sha_with_missing_commits(self):
+        push_event_backend: PushEventBackend = self._create_backend(self.event)
+        shas: List[str] = [self.after, self.before, self.event["commits"][0]["id"], self._git("rev-parse", "HEAD~3").strip()]
+
+        with patch.object(self.git_repository, "iter_commit_msgs_by_sha", wraps=self.git_repository.iter_commit_msgs_by_sha) as iter_commit_msgs_by_sha:
+            commit_msgs: List[Tuple[str, str]] = list(push_event_backend.iter_commit_msgs_by_sha(shas))
+
+        assert commit_msgs == list(self.git_repository.iter_commit_msgs_by_sha(shas))
+        # Commits missing from the event are read from the repository in one lookup
+        iter_commit_msgs_by_sha.assert_called_once_with([self.before, shas[3]])
+
+    def test_unusable_events(self):
+        for event in [
+            {**self.event, "forced": True},
+            {**self.event, "created": True, "before": "0" * 40},
+            {**self.event, "commits": self.event["commits"] * (PUSH_EVENT_MAX_COMMITS // 3 + 1)}
+        ]:
+            self.fallback_count = 0
+            push_event_backend: PushEventBackend = self._create_backend(event)
+            assert push_event_backend.event is None
+            assert list(push_event_backend.iter_commit_msgs(f"{self.before}..HEAD")) == list(self.git_repository.iter_commit_msgs(f"{self.before}..HEAD"))
+            assert self.fallback_count == 1
+
+        push_event_backend: PushEventBackend = PushEventBackend(event_path=os.path.join(self.repo_dir, "missing.json"), fallback=self._create_fallback)
+        assert push_event_backend.get_latest_commit_msg() == self.git_repository.get_latest_commit_msg()
+
+
+if __name__ == "__main__":
+    unittest.main()
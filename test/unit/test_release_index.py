@@ -0,0 +1,138 @@
+import fcntl
+import hashlib
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import List
+import unittest
+WORKSPACE_ROOT: str = os.path.abspath(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+sys.path.append(WORKSPACE_ROOT)
+from src.release_version_updater._types import ReleaseIndexRecord
+from src.release_version_updater.release_index import RECORD_SIZE, ReleaseIndex, append_to_release_index
+
+RELEASE_INDEX_PATH: str = os.path.join(WORKSPACE_ROOT, "src", "release_version_updater", "release_index.py")
+
+
+def _sha(i: int) -> str:
+    return hashlib.sha1(str(i).encode("utf-8")).hexdigest()
+
+
+class TestReleaseIndex(unittest.TestCase):
+    def setUp(self):
+        self.index_dir: str = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.index_dir, ignore_errors=True)
+        self.index_path: str = os.path.join(self.index_dir, "cache", "release-index.bin")
+
+    def _open(self) -> ReleaseIndex:
+        release_index: ReleaseIndex = ReleaseIndex(self.index_path)
+        self.addCleanup(release_index.close)
+
+        return release_index
+
+    def test_append_and_find(self):
+        assert self._open().find(_sha(0)) is None
+
+        assert append_to_release_index(self.index_path, [_sha(0), _sha(1)], "1.0.0") == 2
+        # Commits analyzed again keep their first version
+        assert append_to_release_index(self.index_path, [_sha(1), _sha(2), _sha(2)], "1.1.0") == 1
+        assert append_to_release_index(self.index_path, [_sha(0)], "2.0.0") == 0
+
+        release_index: ReleaseIndex = self._open()
+        assert release_index.find(_sha(0)) == ReleaseIndexRecord(position=0, sha=_sha(0), version="1.0.0")
+        assert release_index.find(_sha(1)) == ReleaseIndexRecord(position=1, sha=_sha(1), version="1.0.0")
+        assert release_index.find(_sha(2)[:7].upper()) == ReleaseIndexRecord(position=2, sha=_sha(2), version="1.1.0")
+        assert release_index.find(_sha(3)) is None
+        assert os.path.getsize(self.index_path) == RECORD_SIZE * (release_index.record_count + len(release_index.segments))
+        for invalid_sha in ["abc", "xyz12345", _sha(0) + "0"]:
+            with self.assertRaises(ValueError):
+                release_index.find(invalid_sha)
+        with self.assertRaises(ValueError):
+            append_to_release_index(self.index_path, [_sha(4)], "1.2.0-rc.1")
+
+    def test_segments_stay_logarithmic(self):
+        commit_count: int = 0
+        for run in range(300):
+            # Mostly single-commit runs, with the occasional large range
+            run_size: int = 50 if run % 60 == 0 else 1
+            append_to_release_index(self.index_path, [_sha(commit_count + i) for i in range(run_size)], f"1.{run}.0")
+            commit_count += run_size
+
+        release_index: ReleaseIndex = self._open()
+        assert release_index.record_count == commit_count
+        assert len(release_index.segments) <= math.log2(commit_count) + 1
+        for i in range(0, commit_count, 7):
+            assert release_index.find(_sha(i)).position == i
+        assert release_index.find(_sha(commit_count - 1)).version == "1.299.0"
+
+        start_time: float = time.perf_counter()
+        for i in range(commit_count):
+            release_index.find(_sha(i))
+        assert (time.perf_counter() - start_time) / commit_count < 1e-3
+
+    def test_reads_wait_for_appends(self):
+        append_to_release_index(self.index_path, [_sha(0), _sha(1)], "1.0.0")
+        with open(file=self.index_path, mode="r+b") as index_file:
+            index_file_content: bytes = index_file.read()
+            # An append in progress, which has written the records of the merged segment but not its trailer yet
+            fcntl.flock(index_file, fcntl.LOCK_EX)
+            index_file.truncate(RECORD_SIZE * 2)
+            release_indexes: List[ReleaseIndex] = []
+            reader: threading.Thread = threading.Thread(target=lambda: release_indexes.append(self._open()))
+            reader.start()
+            reader.join(timeout=0.2)
+            assert reader.is_alive()
+
+            index_file.seek(0)
+            index_file.write(index_file_content)
+            index_file.flush()
+            fcntl.flock(index_file, fcntl.LOCK_UN)
+        reader.join(timeout=10)
+        assert release_indexes[0].find(_sha(1)).version == "1.0.0"
+
+        # While the index is open, appends wait for it to be closed
+        writer: threading.Thread = threading.Thread(target=append_to_release_index, args=(self.index_path, [_sha(2)], "1.1.0"))
+        writer.start()
+        writer.join(timeout=0.2)
+        assert writer.is_alive()
+        assert release_indexes[0].find(_sha(2)) is None
+
+        release_indexes[0].close()
+        writer.join(timeout=10)
+        assert self._open().find(_sha(2)).version == "1.1.0"
+
+    def test_invalid_index(self):
+        append_to_release_index(self.index_path, [_sha(0)], "1.0.0")
+        with open(file=self.index_path, mode="r+b") as index_file:
+            index_file.truncate(RECORD_SIZE + 3)
+        with self.assertRaises(ValueError):
+            ReleaseIndex(self.index_path)
+
+        with open(file=self.index_path, mode="wb") as index_file:
+            index_file.write(b"\0" * RECORD_SIZE * 2)
+        with self.assertRaises(ValueError):
+            ReleaseIndex(self.index_path)
+
+    def test_query_command(self):
+        append_to_release_index(self.index_path, [_sha(0), _sha(1)], "1.4.0")
+
+        def _query(*shas: str) -> subprocess.CompletedProcess:
+            return subprocess.run([sys.executable, RELEASE_INDEX_PATH, self.index_path, *shas], capture_output=True)
+
+        process: subprocess.CompletedProcess = _query(_sha(1)[:8], _sha(0))
+        assert process.returncode == 0
+        assert process.stdout.decode("utf-8").splitlines() == [f"{_sha(1)} 1.4.0", f"{_sha(0)} 1.4.0"]
+
+        process = _query(_sha(0), _sha(5))
+        assert process.returncode == 1
+        assert process.stdout.decode("utf-8").splitlines() == [f"{_sha(0)} 1.4.0"]
+        assert _sha(5) in process.stderr.decode("utf-8")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,11 @@
 import json
 import os
+import shutil
+import subprocess
 import sys
+import tempfile
 import time
-from typing import List
+from typing import Dict, Iterator, List
 import unittest
 from unittest.mock import MagicMock
 from logging import Logger, StreamHandler, Formatter, INFO
@@ -10,8 +13,15 @@ from requests import Response
 WORKSPACE_ROOT: str = os.path.abspath(
     os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 sys.path.append(WORKSPACE_ROOT)
+sys.path.append(os.path.join(WORKSPACE_ROOT, "test"))
+from src.clients.git.git_client import GitClient
+from src.clients.git.git_repository import GitRepository
+from src.clients.github.github_client import GitHubClient
+from src.release_version_updater.release_index import ReleaseIndex
 from src.release_version_updater.release_version_updater import ReleaseVersionUpdater
-from src.release_version_updater._types import CommitType
+from src.clients.github._types import HttpResponse
+from src.release_version_updater._types import CommitType, ReleaseVersionConflictError, ReleaseVersionUpdate, VersionSource
+from stubs.github_api_stub import GitHubApiStub
 
 LOGGER: Logger = Logger("test_release_version_updater")
 LOGGER.setLevel(INFO)
@@ -83,6 +93,357 @@ class TestReleaseVersionUpdater(unittest.TestCase):
 
         assert commit_type == CommitType.OTHER
 
+    def test_get_highest_commit_type(self):
+        commit_msgs: List[str] = ["docs: Updated README", "fix: Fixed bug", "feat: Added option", "chore: Bumped dependency"]
+        commit_type: CommitType = self.release_version_updater._get_highest_commit_type(commit_msgs)
+
+        assert commit_type == CommitType.MINOR
+
+    def test_get_highest_commit_type_stops_at_major(self):
+        consumed: List[str] = []
+
+        def _commit_msgs() -> Iterator[str]:
+            for commit_msg in ["fix: Fixed bug", "BREAKING CHANGE: Removed endpoint", "feat: Added option"]:
+                consumed.append(commit_msg)
+                yield commit_msg
+
+        commit_type: CommitType = self.release_version_updater._get_highest_commit_type(_commit_msgs())
+
+        assert commit_type == CommitType.MAJOR
+        assert len(consumed) == 2
+
+    def _create_git_repo(self, commit_msgs: List[str]) -> str:
+        repo_dir: str = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, repo_dir, ignore_errors=True)
+        git_cmd: List[str] = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+        subprocess.run(["git", "init", "-q", repo_dir], check=True)
+        for commit_msg in commit_msgs:
+            subprocess.run(git_cmd + ["commit", "-q", "--allow-empty", "-m", commit_msg], cwd=repo_dir, check=True)
+
+        return repo_dir
+
+    def test_iter_commit_msgs(self):
+        repo_dir: str = self._create_git_repo(["chore: Initial commit", "feat: Added option\n\nWith a body", "fix: Fixed bug"])
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(repo_dir)
+
+        commit_msgs: List[str] = list(self.release_version_updater._iter_commit_msgs("HEAD~2..HEAD"))
+
+        assert commit_msgs == ["fix: Fixed bug\n", "feat: Added option\n\nWith a body\n"]
+
+    def test_update_release_version_since_ref(self):
+        repo_dir: str = self._create_git_repo(["chore: Initial commit", "feat: Added option", "fix: Fixed bug"])
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(repo_dir)
+        self.release_version_updater.since_ref = "HEAD~2"
+        self.release_version_updater.github_output = os.path.join(repo_dir, MOCK_GITHUB_OUTPUT)
+
+        mock_response: Response = Response()
+        mock_response.status_code = 200
+        mock_response._content = json.dumps({"name": MOCK_REPO_VARIABLE, "value": "1.0.0"})
+        self.release_version_updater.github_client.get_repository_variable.return_value = mock_response
+
+        self.release_version_updater.update_release_version()
+
+        self.release_version_updater.github_client.update_repository_variable.assert_called_once_with(
+            repo_owner=MOCK_REPO_OWNER,
+            repo_name=MOCK_REPO_NAME,
+            variable=MOCK_REPO_VARIABLE,
+            new_value="1.1.0"
+        )
+
+    def test_update_release_version_changelog(self):
+        repo_dir: str = self._create_git_repo(["chore: Initial commit", "feat!: Removed option", "feat(api): Added endpoint", "fix: Fixed bug"])
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(repo_dir)
+        self.release_version_updater.since_ref = "HEAD~3"
+        self.release_version_updater.github_output = os.path.join(repo_dir, MOCK_GITHUB_OUTPUT)
+        self.release_version_updater.changelog_file = os.path.join(repo_dir, "CHANGELOG.md")
+
+        mock_response: Response = Response()
+        mock_response.status_code = 200
+        mock_response._content = json.dumps({"name": MOCK_REPO_VARIABLE, "value": "1.0.0"})
+        self.release_version_updater.github_client.get_repository_variable.return_value = mock_response
+
+        self.release_version_updater.update_release_version()
+
+        expected_changelog: str = "### Breaking changes\n- Removed option\n\n### Features\n- **api:** Added endpoint\n\n### Fixes\n- Fixed bug\n"
+        with open(file=self.release_version_updater.changelog_file, mode="r") as changelog_file:
+            assert changelog_file.read() == expected_changelog
+        with open(file=self.release_version_updater.github_output, mode="r") as github_output:
+            lines: List[str] = github_output.read().splitlines(keepends=True)
+        assert lines[0] == "release_version=2.0.0\n"
+        key, delimiter = lines[1].rstrip("\n").split("<<")
+        assert key == "changelog"
+        assert lines[-1] == f"{delimiter}\n"
+        assert "".join(lines[2:-1]) == expected_changelog
+
+    def test_update_release_version_checkpoint(self):
+        repo_dir: str = self._create_git_repo(["chore: Initial commit", "feat: Added option"])
+        git_cmd: List[str] = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+        github_api_stub: GitHubApiStub = GitHubApiStub().start()
+        self.addCleanup(github_api_stub.stop)
+        github_api_stub.set_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE, "1.0.0")
+        git_repository: GitRepository = GitRepository(repo_dir)
+        self.addCleanup(git_repository.close)
+        self.release_version_updater.github_client = GitHubClient(github_token=MOCK_GITHUB_TOKEN, base_uri=github_api_stub.base_uri)
+        self.release_version_updater.git_backend = git_repository
+        self.release_version_updater.checkpoint_variable = f"{MOCK_REPO_VARIABLE}_CHECKPOINT"
+
+        def _get_variables() -> List[str]:
+            return [github_api_stub.get_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, variable) for variable in [MOCK_REPO_VARIABLE, f"{MOCK_REPO_VARIABLE}_CHECKPOINT"]]
+
+        # Without a checkpoint the latest commit is analyzed, and the checkpoint is created
+        self.release_version_updater.update_release_version()
+        assert _get_variables() == ["1.1.0", git_repository.rev_parse("HEAD")]
+
+        # Re-running on the same commit does not bump again
+        self.release_version_updater.update_release_version()
+        assert _get_variables() == ["1.1.0", git_repository.rev_parse("HEAD")]
+
+        # Only commits after the checkpoint are analyzed
+        for commit_msg in ["fix: Fixed bug", "chore: Tidied up"]:
+            subprocess.run(git_cmd + ["commit", "-q", "--allow-empty", "-m", commit_msg], cwd=repo_dir, check=True)
+        self.release_version_updater.update_release_version()
+        assert _get_variables() == ["1.1.1", git_repository.rev_parse("HEAD")]
+
+        # A checkpoint that is not an ancestor of HEAD falls back to the latest commit
+        github_api_stub.set_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, f"{MOCK_REPO_VARIABLE}_CHECKPOINT", "0" * 40)
+        subprocess.run(git_cmd + ["commit", "-q", "--allow-empty", "-m", "fix: Fixed another bug"], cwd=repo_dir, check=True)
+        self.release_version_updater.update_release_version()
+        assert _get_variables() == ["1.1.2", git_repository.rev_parse("HEAD")]
+
+    def test_update_release_version_release_index(self):
+        repo_dir: str = self._create_git_repo(["chore: Initial commit", "feat: Added option", "fix: Fixed bug"])
+        git_cmd: List[str] = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+        github_api_stub: GitHubApiStub = GitHubApiStub().start()
+        self.addCleanup(github_api_stub.stop)
+        github_api_stub.set_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE, "1.0.0")
+        git_repository: GitRepository = GitRepository(repo_dir)
+        self.addCleanup(git_repository.close)
+        self.release_version_updater.github_client = GitHubClient(github_token=MOCK_GITHUB_TOKEN, base_uri=github_api_stub.base_uri)
+        self.release_version_updater.git_backend = git_repository
+        self.release_version_updater.github_output = None
+        self.release_version_updater.since_ref = "HEAD~2"
+        self.release_version_updater.release_index_file = os.path.join(repo_dir, "release-index.bin")
+        shas: List[str] = [git_repository.rev_parse(f"HEAD~{i}") for i in range(3)]
+
+        self.release_version_updater.update_release_version()
+        # The commits of the range stay mapped to the first version that contained them
+        subprocess.run(git_cmd + ["commit", "-q", "--allow-empty", "-m", "docs: Updated readme"], cwd=repo_dir, check=True)
+        self.release_version_updater.since_ref = "HEAD~3"
+        self.release_version_updater.update_release_version()
+
+        with ReleaseIndex(self.release_version_updater.release_index_file) as release_index:
+            assert [(release_index.find(sha).position, release_index.find(sha).version) for sha in shas[:2]] == [(1, "1.1.0"), (0, "1.1.0")]
+            assert release_index.find(shas[2]) is None
+            assert release_index.find(git_repository.rev_parse("HEAD")).version == "1.2.0"
+        assert github_api_stub.get_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE) == "1.2.0"
+
+    def test_update_release_version_from_tags(self):
+        repo_dir: str = self._create_git_repo(["chore: Initial commit", "feat: Added option"])
+        git_cmd: List[str] = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+        subprocess.run(git_cmd + ["tag", "v1.4.0", "HEAD~1"], cwd=repo_dir, check=True)
+        subprocess.run(git_cmd + ["tag", "nightly"], cwd=repo_dir, check=True)
+        github_api_stub: GitHubApiStub = GitHubApiStub().start()
+        self.addCleanup(github_api_stub.stop)
+        github_api_stub.set_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE, "1.0.0")
+        git_repository: GitRepository = GitRepository(repo_dir)
+        self.addCleanup(git_repository.close)
+        self.release_version_updater.github_client = GitHubClient(github_token=MOCK_GITHUB_TOKEN, base_uri=github_api_stub.base_uri)
+        self.release_version_updater.git_backend = git_repository
+        self.release_version_updater.version_source = VersionSource.TAGS
+
+        update: ReleaseVersionUpdate = self.release_version_updater.update_release_version()
+
+        assert update.previous_version == "1.4.0"
+        assert github_api_stub.get_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE) == "1.5.0"
+        assert github_api_stub.request_counts == {"PATCH": 1, "GET": 1}
+
+        # Without a version tag, the repository variable is incremented
+        subprocess.run(git_cmd + ["tag", "-d", "v1.4.0"], cwd=repo_dir, check=True, capture_output=True)
+        update = self.release_version_updater.update_release_version()
+
+        assert update.previous_version == "1.5.0"
+        assert github_api_stub.request_counts == {"PATCH": 2, "GET": 2}
+
+        # A tag older than the repository variable does not lower it
+        subprocess.run(git_cmd + ["tag", "v1.4.0", "HEAD~1"], cwd=repo_dir, check=True)
+        update = self.release_version_updater.update_release_version()
+
+        assert update.previous_version == "1.6.0"
+        assert github_api_stub.get_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE) == "1.7.0"
+
+    def test_update_release_version_from_tags_after_merge(self):
+        # v1.0.5 is released from a maintenance branch, which is merged into main after v2.0.0
+        repo_dir: str = self._create_git_repo(["chore: Initial commit"])
+        git_cmd: List[str] = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+        for args in [
+            ["checkout", "-q", "-b", "maintenance"],
+            ["commit", "-q", "--allow-empty", "-m", "fix: Fixed bug"],
+            ["tag", "v1.0.5"],
+            ["checkout", "-q", "-"],
+            ["commit", "-q", "--allow-empty", "-m", "feat!: Breaking change"],
+            ["tag", "v2.0.0"],
+            ["merge", "-q", "--no-ff", "-m", "Merge branch 'maintenance'", "maintenance"],
+            ["commit", "-q", "--allow-empty", "-m", "fix: Fixed another bug"]
+        ]:
+            subprocess.run(git_cmd + args, cwd=repo_dir, check=True, capture_output=True)
+        github_api_stub: GitHubApiStub = GitHubApiStub().start()
+        self.addCleanup(github_api_stub.stop)
+        self.release_version_updater.github_client = GitHubClient(github_token=MOCK_GITHUB_TOKEN, base_uri=github_api_stub.base_uri)
+        self.release_version_updater.version_source = VersionSource.TAGS
+        git_repository: GitRepository = GitRepository(repo_dir)
+        self.addCleanup(git_repository.close)
+
+        for git_backend in [git_repository, GitClient(repo_path=repo_dir)]:
+            github_api_stub.set_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE, "1.0.5")
+            self.release_version_updater.git_backend = git_backend
+
+            update: ReleaseVersionUpdate = self.release_version_updater.update_release_version()
+
+            assert update.previous_version == "2.0.0"
+            assert github_api_stub.get_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE) == "2.0.1"
+
+    def _use_github_api_stub(self, release_version: str) -> GitHubApiStub:
+        github_api_stub: GitHubApiStub = GitHubApiStub().start()
+        self.addCleanup(github_api_stub.stop)
+        github_api_stub.set_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE, release_version)
+        self.release_version_updater.github_client = GitHubClient(github_token=MOCK_GITHUB_TOKEN, base_uri=github_api_stub.base_uri)
+        self.release_version_updater.compare_and_swap = True
+        self.sleeps: List[float] = []
+        self.release_version_updater._sleep = self.sleeps.append
+
+        return github_api_stub
+
+    def test_compare_and_swap_changed_before_write(self):
+        github_api_stub: GitHubApiStub = self._use_github_api_stub("1.0.0")
+        github_client: GitHubClient = self.release_version_updater.github_client
+        get_repository_variable = github_client.get_repository_variable
+
+        def _get_repository_variable(*args, **kwargs) -> HttpResponse:
+            response: HttpResponse = get_repository_variable(*args, **kwargs)
+            if github_api_stub.request_counts["GET"] == 1:
+                # Another run increments the version between this run's read and write
+                github_api_stub.set_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE, "1.0.1")
+            return response
+        github_client.get_repository_variable = _get_repository_variable
+
+        update: ReleaseVersionUpdate = self.release_version_updater._apply_commit_type(MOCK_REPO_VARIABLE, CommitType.PATCH)
+
+        assert update == ReleaseVersionUpdate(previous_version="1.0.1", release_version="1.0.2", commit_type=CommitType.PATCH)
+        assert github_api_stub.get_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE) == "1.0.2"
+        assert github_api_stub.request_counts["PATCH"] == 1
+        assert len(self.sleeps) == 1
+
+    def test_compare_and_swap_overwritten_after_write(self):
+        github_api_stub: GitHubApiStub = self._use_github_api_stub("1.0.0")
+        github_client: GitHubClient = self.release_version_updater.github_client
+        update_repository_variable = github_client.update_repository_variable
+
+        def _update_repository_variable(*args, **kwargs) -> HttpResponse:
+            response: HttpResponse = update_repository_variable(*args, **kwargs)
+            if github_api_stub.request_counts["PATCH"] == 1:
+                # Another run that read the version before this run's write overwrites it
+                github_api_stub.set_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE, "1.0.1")
+            return response
+        github_client.update_repository_variable = _update_repository_variable
+
+        update: ReleaseVersionUpdate = self.release_version_updater._apply_commit_type(MOCK_REPO_VARIABLE, CommitType.MINOR)
+
+        assert update == ReleaseVersionUpdate(previous_version="1.0.1", release_version="1.1.0", commit_type=CommitType.MINOR)
+        assert github_api_stub.get_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE) == "1.1.0"
+        assert github_api_stub.request_counts["PATCH"] == 2
+
+    def test_compare_and_swap_gives_up(self):
+        github_api_stub: GitHubApiStub = self._use_github_api_stub("1.0.0")
+        github_client: GitHubClient = self.release_version_updater.github_client
+        get_repository_variable = github_client.get_repository_variable
+
+        def _get_repository_variable(*args, **kwargs) -> HttpResponse:
+            response: HttpResponse = get_repository_variable(*args, **kwargs)
+            github_api_stub.set_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE, f"1.0.{github_api_stub.request_counts['GET']}")
+            return response
+        github_client.get_repository_variable = _get_repository_variable
+
+        with self.assertRaises(ReleaseVersionConflictError):
+            self.release_version_updater._apply_commit_type(MOCK_REPO_VARIABLE, CommitType.PATCH)
+        assert github_api_stub.request_counts["PATCH"] == 0
+
+    def test_update_package_release_versions(self):
+        repo_dir: str = self._create_git_repo(["chore: Initial commit"])
+        git_cmd: List[str] = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+        for path, commit_msg in [("packages/api/a.py", "fix(api): Fixed bug"), ("packages/web/b.ts", "feat(web): Added page"), ("packages/api/c.py", "feat(api): Added endpoint"), ("docs/d.md", "feat: Documented everything")]:
+            os.makedirs(os.path.join(repo_dir, os.path.dirname(path)), exist_ok=True)
+            with open(file=os.path.join(repo_dir, path), mode="w") as file:
+                file.write(commit_msg)
+            subprocess.run(git_cmd + ["add", path], cwd=repo_dir, check=True)
+            subprocess.run(git_cmd + ["commit", "-q", "-m", commit_msg], cwd=repo_dir, check=True)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(repo_dir)
+        self.release_version_updater.since_ref = "HEAD~4"
+        self.release_version_updater.github_output = os.path.join(repo_dir, MOCK_GITHUB_OUTPUT)
+        self.release_version_updater.package_variables = {"packages/api": "API_VERSION", "packages/web": "WEB_VERSION", "packages/cli": "CLI_VERSION"}
+
+        def _get_repository_variable(repo_owner: str, repo_name: str, variable: str) -> Response:
+            mock_response: Response = Response()
+            mock_response.status_code = 200
+            mock_response._content = json.dumps({"name": variable, "value": "1.0.0"})
+            return mock_response
+
+        self.release_version_updater.github_client.get_repository_variable.side_effect = _get_repository_variable
+
+        self.release_version_updater.update_package_release_versions()
+
+        # CLI_VERSION had no changes, so it is neither read nor written
+        requested_variables: List[str] = [call.kwargs["variable"] for call in self.release_version_updater.github_client.get_repository_variable.call_args_list]
+        assert sorted(requested_variables) == ["API_VERSION", "WEB_VERSION"]
+        updated_versions: Dict[str, str] = {call.kwargs["variable"]: call.kwargs["new_value"] for call in self.release_version_updater.github_client.update_repository_variable.call_args_list}
+        assert updated_versions == {"API_VERSION": "1.1.0", "WEB_VERSION": "1.1.0"}
+        with open(file=self.release_version_updater.github_output, mode="r") as github_output:
+            assert json.loads(github_output.read().split("=", 1)[1]) == updated_versions
+
+    def test_update_package_release_versions_lists_variables(self):
+        repo_dir: str = self._create_git_repo(["chore: Initial commit"])
+        git_cmd: List[str] = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+        for path, commit_msg in [("packages/api/a.py", "fix(api): Fixed bug"), ("packages/web/b.ts", "feat(web): Added page")]:
+            os.makedirs(os.path.join(repo_dir, os.path.dirname(path)), exist_ok=True)
+            with open(file=os.path.join(repo_dir, path), mode="w") as file:
+                file.write(commit_msg)
+            subprocess.run(git_cmd + ["add", path], cwd=repo_dir, check=True)
+            subprocess.run(git_cmd + ["commit", "-q", "-m", commit_msg], cwd=repo_dir, check=True)
+        github_api_stub: GitHubApiStub = GitHubApiStub().start()
+        self.addCleanup(github_api_stub.stop)
+        for variable in ["API_VERSION", "WEB_VERSION", "CLI_VERSION"]:
+            github_api_stub.set_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, variable, "1.0.0")
+        git_repository: GitRepository = GitRepository(repo_dir)
+        self.addCleanup(git_repository.close)
+        self.release_version_updater.github_client = GitHubClient(github_token=MOCK_GITHUB_TOKEN, base_uri=github_api_stub.base_uri)
+        self.release_version_updater.git_backend = git_repository
+        self.release_version_updater.since_ref = "HEAD~2"
+        self.release_version_updater.package_variables = {"packages/api": "API_VERSION", "packages/web": "WEB_VERSION", "packages/cli": "CLI_VERSION"}
+
+        # Both changed package versions are read with one request instead of one each
+        self.release_version_updater.update_package_release_versions()
+        assert github_api_stub.request_counts == {"GET": 1, "PATCH": 2}
+        assert [github_api_stub.get_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, variable) for variable in ["API_VERSION", "WEB_VERSION", "CLI_VERSION"]] == ["1.0.1", "1.1.0", "1.0.0"]
+
+        # The checkpoint is read in the same request, and a missing one is known not to exist without a GET of its own
+        github_api_stub.reset_stats()
+        self.release_version_updater.checkpoint_variable = "PACKAGES_CHECKPOINT"
+        self.release_version_updater.update_package_release_versions()
+        assert github_api_stub.request_counts == {"GET": 1, "PATCH": 2, "POST": 1}
+        assert [github_api_stub.get_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, variable) for variable in ["API_VERSION", "WEB_VERSION", "CLI_VERSION"]] == ["1.0.2", "1.2.0", "1.0.0"]
+
+        # When the rest of the listing would take more pages than there are variables left to find, those are read one at a time.
+        # API_VERSION is on the first page, and WEB_VERSION is read with a GET instead of the three pages after it
+        for i in range(100):
+            github_api_stub.set_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, f"OTHER_{i}", "value")
+        github_api_stub.reset_stats()
+        self.release_version_updater.checkpoint_variable = None
+        self.release_version_updater.update_package_release_versions()
+        assert github_api_stub.request_counts == {"GET": 2, "PATCH": 2}
+
     def test_get_current_release_version(self):
         mock_response: Response = Response()
         mock_response.status_code = 200
@@ -132,6 +493,15 @@ class TestReleaseVersionUpdater(unittest.TestCase):
 
         assert new_release_version == "1.0.0"
 
+    def test_increment_release_version_resets_lower_fields(self):
+        assert self.release_version_updater._increment_release_version("1.2.3", CommitType.MAJOR) == "2.0.0"
+        assert self.release_version_updater._increment_release_version("1.2.3", CommitType.MINOR) == "1.3.0"
+
+    def test_increment_release_version_prerelease(self):
+        assert self.release_version_updater._increment_release_version("1.4.0-rc.1+build.7", CommitType.PATCH) == "1.4.0"
+        assert self.release_version_updater._increment_release_version("1.4.0-rc.1+build.7", CommitType.MAJOR) == "2.0.0"
+        assert self.release_version_updater._increment_release_version("1.4.0-rc.1+build.7", CommitType.OTHER) == "1.4.0-rc.1+build.7"
+
     def test_write_to_github_output(self):
         curr_unix_time: int = int(time.time())
         self.release_version_updater._write_to_github_output(f"test_key_{curr_unix_time}", f"TEST_VALUE_{curr_unix_time}")
@@ -139,7 +509,7 @@ class TestReleaseVersionUpdater(unittest.TestCase):
         with open(file=self.release_version_updater.github_output, mode="r") as github_output:
             lines: List[str] = github_output.readlines()
         
-        assert lines[-1] == f"test_key_{curr_unix_time}=TEST_VALUE_{curr_unix_time}"
+        assert lines[-1] == f"test_key_{curr_unix_time}=TEST_VALUE_{curr_unix_time}\n"
 
     def test_update_release_version(self):
         latest_commit_msg: str = self.release_version_updater._get_latest_commit_msg()
@@ -168,7 +538,7 @@ class TestReleaseVersionUpdater(unittest.TestCase):
                     variable=MOCK_REPO_VARIABLE,
                     new_value="2.0.0"
                 )
-                assert lines[-1] == "release_version=2.0.0"
+                assert lines[-1] == "release_version=2.0.0\n"
             elif latest_commit_type == CommitType.MINOR:
                 self.release_version_updater.github_client.update_repository_variable.assert_called_once_with(
                     repo_owner=MOCK_REPO_OWNER,
@@ -176,7 +546,7 @@ class TestReleaseVersionUpdater(unittest.TestCase):
                     variable=MOCK_REPO_VARIABLE,
                     new_value="1.1.0"
                 )
-                assert lines[-1] == "release_version=1.1.0"
+                assert lines[-1] == "release_version=1.1.0\n"
             elif latest_commit_type == CommitType.PATCH:
                 self.release_version_updater.github_client.update_repository_variable.assert_called_once_with(
                     repo_owner=MOCK_REPO_OWNER,
@@ -184,10 +554,10 @@ class TestReleaseVersionUpdater(unittest.TestCase):
                     variable=MOCK_REPO_VARIABLE,
                     new_value="1.0.1"
                 )
-                assert lines[-1] == "release_version=1.0.1"
+                assert lines[-1] == "release_version=1.0.1\n"
             elif latest_commit_type == CommitType.OTHER:
                 self.release_version_updater.github_client.update_repository_variable.assert_not_called()
-                assert lines[-1] == "release_version=1.0.0"
+                assert lines[-1] == "release_version=1.0.0\n"
 
 
 if __name__ == "__main__":
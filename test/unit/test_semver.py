@@ -0,0 +1,78 @@
+import os
+import pickle
+import random
+import sys
+from typing import List
+import unittest
+WORKSPACE_ROOT: str = os.path.abspath(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+sys.path.append(WORKSPACE_ROOT)
+from src.release_version_updater._types import CommitType
+from src.release_version_updater.semver import SemVer, max_version, parse_versions, sort_versions
+
+# Ascending precedence, from https://semver.org/#spec-item-11
+PRECEDENCE_ORDER: List[str] = [
+    "1.0.0-alpha", "1.0.0-alpha.1", "1.0.0-alpha.beta", "1.0.0-beta", "1.0.0-beta.2", "1.0.0-beta.11", "1.0.0-rc.1", "1.0.0",
+    "2.0.0", "2.1.0", "2.1.1", "10.0.0"
+]
+
+
+class TestSemVer(unittest.TestCase):
+    def test_parse(self):
+        version: SemVer = SemVer.parse("1.4.0-rc.1+build.7")
+
+        assert (version.major, version.minor, version.patch, version.prerelease, version.build) == (1, 4, 0, "rc.1", "build.7")
+        assert str(version) == "1.4.0-rc.1+build.7"
+
+    def test_parse_invalid(self):
+        for version in ["1.0", "01.0.0", "1.0.0-01", "1.0.0-", "1.0.0+", "v1.0.0", "1.0.0-rc..1"]:
+            with self.assertRaises(ValueError):
+                SemVer.parse(version)
+
+    def test_precedence(self):
+        versions: List[SemVer] = [SemVer.parse(version) for version in PRECEDENCE_ORDER]
+        shuffled_versions: List[SemVer] = versions[:]
+        random.Random(0).shuffle(shuffled_versions)
+
+        assert sorted(shuffled_versions) == versions
+        assert all(lower < higher and higher > lower for lower, higher in zip(versions, versions[1:]))
+
+    def test_build_metadata_is_ignored(self):
+        assert SemVer.parse("1.0.0+build.1") == SemVer.parse("1.0.0+build.2")
+        assert hash(SemVer.parse("1.0.0+build.1")) == hash(SemVer.parse("1.0.0"))
+        assert len({SemVer.parse("1.0.0+a"), SemVer.parse("1.0.0+b"), SemVer.parse("1.0.1")}) == 2
+
+    def test_immutable(self):
+        version: SemVer = SemVer.parse("1.0.0")
+        with self.assertRaises(AttributeError):
+            version.major = 2
+        assert pickle.loads(pickle.dumps(version)) == version
+
+    def test_increment(self):
+        assert str(SemVer.parse("1.2.3+build.1").increment(CommitType.PATCH)) == "1.2.4"
+        assert str(SemVer.parse("1.2.3").increment(CommitType.MINOR)) == "1.3.0"
+        assert str(SemVer.parse("1.2.3").increment(CommitType.MAJOR)) == "2.0.0"
+        assert str(SemVer.parse("2.0.0-rc.1").increment(CommitType.MAJOR)) == "2.0.0"
+        assert str(SemVer.parse("2.1.0-rc.1").increment(CommitType.MAJOR)) == "3.0.0"
+        assert str(SemVer.parse("2.1.0-rc.1").increment(CommitType.MINOR)) == "2.1.0"
+        assert str(SemVer.parse("2.1.1-rc.1").increment(CommitType.MINOR)) == "2.2.0"
+        assert str(SemVer.parse("2.1.0-rc.1").increment(CommitType.OTHER)) == "2.1.0-rc.1"
+
+    def test_bulk_helpers(self):
+        tags: List[str] = ["v1.0.0", "latest", "1.2.0-rc.1", "v1.10.0-beta", "v1.9.2", "release-1", "v1.10.0-alpha+build"]
+
+        assert [str(version) for version in parse_versions(tags)] == ["1.0.0", "1.2.0-rc.1", "1.10.0-beta", "1.9.2", "1.10.0-alpha+build"]
+        assert [str(version) for version in sort_versions(tags, reverse=True)] == ["1.10.0-beta", "1.10.0-alpha+build", "1.9.2", "1.2.0-rc.1", "1.0.0"]
+        assert str(max_version(tags)) == "1.10.0-beta"
+        assert str(max_version(tags, include_prereleases=False)) == "1.9.2"
+        assert max_version(["latest"]) is None
+
+    def test_max_version_matches_sort(self):
+        rng: random.Random = random.Random(1)
+        tags: List[str] = [f"v{rng.randrange(3)}.{rng.randrange(30)}.{rng.randrange(30)}" + rng.choice(["", "-rc.1", "-rc.2", "-alpha", "+build.1"]) for _ in range(5000)]
+
+        assert max_version(tags) == sort_versions(tags)[-1]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+import unittest
+WORKSPACE_ROOT: str = os.path.abspath(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+sys.path.append(WORKSPACE_ROOT)
+sys.path.append(os.path.join(WORKSPACE_ROOT, "test"))
+from stubs.github_api_stub import GitHubApiStub
+
+MAIN_PATH: str = os.path.join(WORKSPACE_ROOT, "src", "release_version_updater", "main.py")
+# Seconds from starting the interpreter until the first commit is read. Raise it with STARTUP_BUDGET_SECONDS on slow machines
+STARTUP_BUDGET_SECONDS: float = float(os.environ.get("STARTUP_BUDGET_SECONDS", "1.0"))
+# Modules that must not be imported before the first git call of a default run
+LAZY_MODULES: Tuple[str, ...] = ("requests", "urllib3", "yaml", "src.clients.git.push_event_backend")
+MOCK_REPO_OWNER: str = "test-user"
+MOCK_REPO_NAME: str = "test-repo"
+MOCK_REPO_VARIABLE: str = "VERSION_NUMBER"
+# Lines of `python -X importtime` output: "import time: self [us] | cumulative | imported package"
+IMPORT_TIME_PATTERN: re.Pattern = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+class TestStartupTime(unittest.TestCase):
+    def setUp(self):
+        self.repo_dir: str = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.repo_dir, ignore_errors=True)
+        subprocess.run(["git", "init", "-q", "-b", "main", self.repo_dir], check=True)
+        subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-q", "--allow-empty", "-m", "fix: Fixed bug"], cwd=self.repo_dir, check=True)
+
+        self.github_api_stub: GitHubApiStub = GitHubApiStub().start()
+        self.addCleanup(self.github_api_stub.stop)
+        self.github_api_stub.set_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE, "1.0.0")
+        # Variables of the GitHub Actions run the tests may be running in must not leak into the action
+        self.env: Dict[str, str] = {key: value for key, value in os.environ.items() if not key.startswith("GITHUB_")}
+        self.env.update({
+            "REPO_OWNER": MOCK_REPO_OWNER,
+            "REPO_NAME": MOCK_REPO_NAME,
+            "REPO_VARIABLE": MOCK_REPO_VARIABLE,
+            "GITHUB_TOKEN": "test-token",
+            "GITHUB_OUTPUT": os.path.join(self.repo_dir, "github-output.txt"),
+            "GITHUB_API_URL": self.github_api_stub.base_uri,
+            "TRACE_FILE": os.path.join(self.repo_dir, "trace.jsonl")
+        })
+
+    def _get_slowest_imports(self, import_times: str, count: int = 10) -> List[str]:
+        """
+        Returns the top-level imports with the highest cumulative import times, slowest first.
+        """
+        imports: List[Tuple[int, str]] = []
+        for line in import_times.splitlines():
+            match = IMPORT_TIME_PATTERN.match(line)
+            if match and not match.group(2):
+                imports.append((int(match.group(1)), match.group(3)))
+
+        return [f"{name}: {cumulative_us / 1000:.1f} ms" for cumulative_us, name in sorted(imports, reverse=True)[:count]]
+
+    def test_lazy_imports(self):
+        list_modules: str = f"import json, runpy, sys; runpy.run_path({MAIN_PATH!r}); print(json.dumps(sorted(sys.modules)))"
+        modules: List[str] = json.loads(subprocess.run([sys.executable, "-c", list_modules], cwd=self.repo_dir, env=self.env, check=True, capture_output=True).stdout)
+
+        assert "src.release_version_updater.release_version_updater" in modules
+        assert [module for module in LAZY_MODULES if module in modules] == []
+
+    def test_time_to_first_git_call(self):
+        startup_seconds: List[float] = []
+        # The first run also writes the bytecode caches, like building the image does
+        for _ in range(2):
+            open(self.env["TRACE_FILE"], "w").close()
+            start_time: float = time.time()
+            process: subprocess.CompletedProcess = subprocess.run([sys.executable, "-X", "importtime", MAIN_PATH], cwd=self.repo_dir, env=self.env, capture_output=True)
+            assert process.returncode == 0, process.stderr.decode("utf-8")
+            with open(file=self.env["TRACE_FILE"], mode="r") as trace_file:
+                spans: List[dict] = [json.loads(line) for line in trace_file]
+            startup_seconds.append(next(span["start_time"] for span in spans if span["name"] == "read_commits") - start_time)
+
+        assert self.github_api_stub.get_variable(MOCK_REPO_OWNER, MOCK_REPO_NAME, MOCK_REPO_VARIABLE) == "1.0.2"
+        slowest_imports: List[str] = self._get_slowest_imports(process.stderr.decode("utf-8"))
+        assert min(startup_seconds) <= STARTUP_BUDGET_SECONDS, f"The first commit was read {min(startup_seconds):.3f}s after start, over the budget of {STARTUP_BUDGET_SECONDS}s. Slowest imports: {slowest_imports}"
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+from typing import Dict, List
+import unittest
+WORKSPACE_ROOT: str = os.path.abspath(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+sys.path.append(WORKSPACE_ROOT)
+from src.tracing.tracer import NULL_TRACER, Tracer
+
+
+class TestTracer(unittest.TestCase):
+    def setUp(self):
+        self.stream: io.StringIO = io.StringIO()
+        self.tracer: Tracer = Tracer(stream=self.stream)
+
+    def test_span_json_lines(self):
+        with self.tracer.span("github.request", operation="get_repository_variable") as attributes:
+            attributes["retries"] = 2
+        with self.assertRaises(ValueError):
+            with self.tracer.span("read_commits"):
+                raise ValueError("Bad revision")
+
+        records: List[Dict] = [json.loads(line) for line in self.stream.getvalue().splitlines()]
+        assert [record["name"] for record in records] == ["github.request", "read_commits"]
+        assert records[0]["operation"] == "get_repository_variable"
+        assert records[0]["retries"] == 2
+        assert records[0]["duration_ms"] >= 0
+        assert records[1]["error"] == "ValueError"
+
+    def test_summary(self):
+        for retries in [0, 3]:
+            with self.tracer.span("github.request") as attributes:
+                attributes["retries"] = retries
+        with self.tracer.span("write_github_output"):
+            pass
+        summary_dir: str = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, summary_dir, ignore_errors=True)
+        summary_path: str = os.path.join(summary_dir, "summary.md")
+        self.tracer.write_summary(summary_path, "Timings")
+
+        with open(file=summary_path, mode="r") as summary:
+            lines: List[str] = summary.read().splitlines()
+        assert lines[0] == "### Timings"
+        assert lines[4].startswith("| github.request | 2 |") and lines[4].endswith("| 3 |")
+        assert lines[5].startswith("| write_github_output | 1 |")
+
+    def test_null_tracer(self):
+        with NULL_TRACER.span("read_commits") as attributes:
+            attributes["ignored"] = True
+
+        assert NULL_TRACER.spans == []
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+import hashlib
+import hmac
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, List
+import unittest
+from unittest.mock import patch
+import requests
+WORKSPACE_ROOT: str = os.path.abspath(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+sys.path.append(WORKSPACE_ROOT)
+sys.path.append(os.path.join(WORKSPACE_ROOT, "test"))
+from src.clients.github.github_client import GitHubClient
+from src.release_version_updater._types import ManifestEntry
+from src.release_version_updater.batch import BatchReleaseVersionUpdater
+from src.release_version_updater.logger import create_logger
+from src.release_version_updater.webhook_server import NULL_SHA, WebhookServer, WebhookService, is_loopback_host
+from stubs.github_api_stub import GitHubApiStub
+
+LOGGER = create_logger("test_webhook_server", io.StringIO())
+MOCK_GITHUB_TOKEN: str = "test-token"
+MOCK_REPO_OWNER: str = "test-user"
+MOCK_REPO_VARIABLE: str = "VERSION_NUMBER"
+MOCK_WEBHOOK_SECRET: str = "test-secret"
+MOCK_API_LATENCY: float = 0.2
+
+
+class TestWebhookServer(unittest.TestCase):
+    def setUp(self):
+        self.repo_dir: str = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.repo_dir, ignore_errors=True)
+        git_cmd: List[str] = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+        subprocess.run(["git", "init", "-q", "-b", "main", self.repo_dir], check=True)
+        self.shas: List[str] = []
+        for commit_msg in ["chore: Initial commit", "fix: Fixed bug", "feat: Added option", "fix: Fixed another bug"]:
+            subprocess.run(git_cmd + ["commit", "-q", "--allow-empty", "-m", commit_msg], cwd=self.repo_dir, check=True)
+            self.shas.append(subprocess.run(["git", "rev-parse", "HEAD"], cwd=self.repo_dir, check=True, capture_output=True).stdout.decode("utf-8").strip())
+
+        self.github_api_stub: GitHubApiStub = GitHubApiStub(latency=MOCK_API_LATENCY).start()
+        self.addCleanup(self.github_api_stub.stop)
+        for repo_name in ["repo-a", "repo-b"]:
+            self.github_api_stub.set_variable(MOCK_REPO_OWNER, repo_name, MOCK_REPO_VARIABLE, "1.0.0")
+        github_client: GitHubClient = GitHubClient(github_token=MOCK_GITHUB_TOKEN, base_uri=self.github_api_stub.base_uri)
+        self.addCleanup(github_client.close)
+
+        self.service: WebhookService = WebhookService(
+            logger=LOGGER,
+            batch_updater=BatchReleaseVersionUpdater(logger=LOGGER, github_client=github_client, max_workers=2),
+            entries=[ManifestEntry(MOCK_REPO_OWNER, repo_name, MOCK_REPO_VARIABLE, path=self.repo_dir) for repo_name in ["repo-a", "repo-b"]]
+        )
+        self.addCleanup(self.service.close)
+        self.webhook_server: WebhookServer = WebhookServer(self.service, port=0, secret=MOCK_WEBHOOK_SECRET).start()
+        self.addCleanup(self.webhook_server.stop)
+
+    def _post(self, event: str, payload: Dict[str, Any], secret: str = MOCK_WEBHOOK_SECRET) -> requests.Response:
+        body: bytes = json.dumps(payload).encode("utf-8")
+        signature: str = "sha256=" + hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+        return requests.post(f"{self.webhook_server.base_uri}/webhook", data=body, headers={"X-GitHub-Event": event, "X-Hub-Signature-256": signature})
+
+    def _push(self, repo_name: str, before: str, after: str, ref: str = "refs/heads/main") -> requests.Response:
+        return self._post("push", {
+            "ref": ref,
+            "before": before,
+            "after": after,
+            "repository": {"full_name": f"{MOCK_REPO_OWNER}/{repo_name}", "default_branch": "main"}
+        })
+
+    def test_bursts_are_coalesced(self):
+        statuses: List[str] = [self._push("repo-a", before, after).json()["status"] for before, after in zip(self.shas, self.shas[1:])]
+        assert self.service.wait_until_idle(timeout=10)
+
+        # However the pushes were split between evaluations, every pushed commit was analyzed
+        assert self.github_api_stub.get_variable(MOCK_REPO_OWNER, "repo-a", MOCK_REPO_VARIABLE) == "1.1.0"
+        assert statuses[0] == "queued"
+        assert "coalesced" in statuses
+        assert self.service.evaluation_counts == {"ok": statuses.count("queued"), "error": 0}
+        assert self.service.evaluation_counts["ok"] < len(statuses)
+
+    def test_repositories_are_evaluated_in_parallel(self):
+        assert self._push("repo-a", NULL_SHA, self.shas[-1]).status_code == 202
+        assert self._push("repo-b", self.shas[0], self.shas[1]).status_code == 202
+        assert self.service.wait_until_idle(timeout=10)
+
+        # A push creating the branch only analyzes its head commit
+        assert self.github_api_stub.get_variable(MOCK_REPO_OWNER, "repo-a", MOCK_REPO_VARIABLE) == "1.0.1"
+        assert self.github_api_stub.get_variable(MOCK_REPO_OWNER, "repo-b", MOCK_REPO_VARIABLE) == "1.0.1"
+        assert self.github_api_stub.max_concurrent_requests == 2
+
+    def test_ignored_events(self):
+        assert self._post("ping", {"zen": "Keep it logically awesome."}).json()["status"] == "pong"
+        assert self._push("repo-a", self.shas[0], self.shas[1], ref="refs/heads/topic").json()["status"] == "ignored"
+        assert self._push("repo-c", self.shas[0], self.shas[1]).json()["status"] == "ignored"
+        assert self._push("repo-a", self.shas[1], NULL_SHA).json()["status"] == "ignored"
+        assert self._post("push", {}, secret="wrong-secret").status_code == 401
+        assert self.service.wait_until_idle(timeout=10)
+
+        assert self.github_api_stub.request_counts["GET"] == 0
+        assert self.service.event_counts == {"queued": 0, "coalesced": 0, "ignored": 3}
+
+    def test_failed_evaluation_does_not_block_repository(self):
+        update_release_version = self.service.batch_updater.update_release_version
+        failures: List[Any] = [RuntimeError("Checkout is corrupt"), {"repo_name": "repo-a"}]
+
+        def failing_update(entry: ManifestEntry) -> Dict[str, Any]:
+            if failures:
+                failure: Any = failures.pop(0)
+                if isinstance(failure, Exception):
+                    raise failure
+                return failure
+            return update_release_version(entry)
+
+        with patch.object(self.service.batch_updater, "update_release_version", side_effect=failing_update):
+            # The second failure escapes the handled path, the report has no status
+            for before, after in zip(self.shas, self.shas[1:]):
+                assert self._push("repo-a", before, after).json()["status"] == "queued"
+                assert self.service.wait_until_idle(timeout=10)
+
+        assert self.service.evaluation_counts == {"ok": 1, "error": 2}
+        assert self.github_api_stub.get_variable(MOCK_REPO_OWNER, "repo-a", MOCK_REPO_VARIABLE) == "1.0.1"
+
+    def test_metrics(self):
+        self._push("repo-a", self.shas[0], self.shas[1])
+        assert self.service.wait_until_idle(timeout=10)
+
+        response: requests.Response = requests.get(f"{self.webhook_server.base_uri}/metrics")
+        metrics: List[str] = response.text.splitlines()
+
+        assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        assert "release_version_webhook_queue_depth 0" in metrics
+        assert "release_version_webhook_evaluations_in_progress 0" in metrics
+        assert 'release_version_webhook_events_total{result="queued"} 1' in metrics
+        assert 'release_version_webhook_evaluations_total{status="ok"} 1' in metrics
+        assert "release_version_webhook_evaluation_seconds_count 1" in metrics
+        # Updating the variable takes at least two API round trips
+        assert 'release_version_webhook_evaluation_seconds_bucket{le="0.25"} 0' in metrics
+        assert 'release_version_webhook_queue_wait_seconds_bucket{le="+Inf"} 1' in metrics
+
+    def test_is_loopback_host(self):
+        assert all(is_loopback_host(host) for host in ["127.0.0.1", "127.1.2.3", "::1", "localhost"])
+        assert not any(is_loopback_host(host) for host in ["0.0.0.0", "::", "192.168.1.10", "example.com"])
+
+
+if __name__ == "__main__":
+    unittest.main()